@@ -0,0 +1,143 @@
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from spend_tracker.src.data_mgr.csv_reader import intern_strings
+from spend_tracker.src.data_mgr.restructure_data_for_graphing import add_transactions
+from spend_tracker.src.util.classes import (
+    GraphableData,
+    TransactionFrame,
+    TransactionStore,
+)
+
+BENCH_START = datetime(2015, 1, 5)  # A Monday
+BENCH_DAYS = 3650  # Ten years of history
+BENCH_CATEGORIES = 20
+BENCH_MERCHANTS = 5000
+
+
+@dataclass
+class _DictTransaction:
+    """The transaction record as it was before slots, for comparison"""
+
+    date: datetime
+    description: str
+    category: str
+    amount: float
+    source: str
+    outlier: bool | None = None
+
+
+def _random_frame(rows: int, rng: np.random.Generator) -> TransactionFrame:
+    merchants = rng.integers(0, BENCH_MERCHANTS, size=rows)
+    return TransactionFrame(
+        dates=np.datetime64(BENCH_START, "D") + rng.integers(0, BENCH_DAYS, size=rows),
+        amounts_cents=rng.integers(100, 50_000, size=rows),
+        category_codes=rng.integers(0, BENCH_CATEGORIES, size=rows).astype(np.int32),
+        descriptions=intern_strings(
+            np.array([f"Merchant {code}" for code in merchants.tolist()], dtype=object)
+        ),
+        source_codes=rng.integers(0, 2, size=rows).astype(np.int32),
+        categories=[f"Category {code}" for code in range(BENCH_CATEGORIES)],
+        sources=["Visa", "Amex"],
+    )
+
+
+def bench_categorize():
+    """Time month/week period assignment as the number of rows grows.
+
+    Constant ns/row means linear scaling.
+    """
+    rng = np.random.default_rng(0)
+
+    print(f"{'rows':>12} {'store ns/row':>13} {'periods ns/row':>15}")
+    for rows in [10_000, 100_000, 1_000_000, 10_000_000]:
+        frame = _random_frame(rows, rng)
+
+        start = time.perf_counter()
+        graphable_data = GraphableData(TransactionStore.from_frame(frame))
+        store_ns = (time.perf_counter() - start) / rows * 1e9
+
+        start = time.perf_counter()
+        graphable_data.periods("month")
+        graphable_data.periods("week")
+        periods_ns = (time.perf_counter() - start) / rows * 1e9
+
+        print(f"{rows:>12} {store_ns:>13.1f} {periods_ns:>15.1f}")
+
+
+def bench_append(batch_rows: int = 50, batches: int = 200):
+    """Time folding small appends into built periods as the history grows.
+
+    Constant ms/append means the cost depends on the delta, not the history.
+    """
+    rng = np.random.default_rng(0)
+
+    print(f"{'rows':>12} {'ms/append':>10}")
+    for rows in [20_000, 200_000, 1_000_000]:
+        graphable_data = GraphableData(
+            TransactionStore.from_frame(_random_frame(rows, rng))
+        )
+        graphable_data.periods("month")
+        graphable_data.periods("week")
+        appends = [_random_frame(batch_rows, rng) for _ in range(batches)]
+
+        start = time.perf_counter()
+        for frame in appends:
+            add_transactions(graphable_data, frame)
+        append_ms = (time.perf_counter() - start) / batches * 1000
+
+        print(f"{rows:>12} {append_ms:>10.2f}")
+
+
+def _traced_bytes(build) -> tuple[int, object]:
+    """Bytes still allocated after build() returns, plus its result"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def bench_memory(rows: int = 1_000_000):
+    """Compare memory per transaction: object lists vs TransactionStore"""
+    rng = np.random.default_rng(0)
+    frame = _random_frame(rows, rng)
+    dates = frame.dates.astype("datetime64[s]").tolist()
+    amounts = frame.amounts.tolist()
+    descriptions = frame.descriptions.tolist()
+
+    def build_objects():
+        # Mirrors the old layout: one object per row with its own strings,
+        # referenced from both a month list and a week list
+        transactions = [
+            _DictTransaction(
+                date=dates[i],
+                description=descriptions[i].encode().decode(),
+                category=frame.categories[frame.category_codes[i]],
+                amount=amounts[i],
+                source=frame.sources[frame.source_codes[i]],
+            )
+            for i in range(rows)
+        ]
+        return transactions, list(transactions), list(transactions)
+
+    def build_store():
+        graphable_data = GraphableData(TransactionStore.from_frame(frame))
+        graphable_data.periods("month")
+        graphable_data.periods("week")
+        return graphable_data
+
+    object_bytes, objects = _traced_bytes(build_objects)
+    del objects
+    store_bytes, _ = _traced_bytes(build_store)
+
+    print(f"Rows: {rows}")
+    print(f"Object lists:     {object_bytes / rows:8.1f} bytes/transaction")
+    print(f"TransactionStore: {store_bytes / rows:8.1f} bytes/transaction")
+    print(f"Reduction:        {object_bytes / store_bytes:8.1f}x")
@@ -1,25 +1,76 @@
 import os
 
-from spend_tracker.src.data_mgr.csv_reader import prepare_data, read_csv
-from spend_tracker.src.data_mgr.outlier_filter import filter_outliers
-from spend_tracker.src.data_mgr.restructure_data_for_graphing import (
-    restructure_for_graphing,
-)
+from spend_tracker.src.util.startup_timer import StartupTimer
+
+# Libraries are imported inside each entry point so that a script only loads
+# what it uses; headless scripts never import matplotlib or customtkinter.
 
 # Convert to graphable format
 test_category = "Drugs"
 
 
-def test_csv_reader():
-    # Automatically manage the file path
+def get_data_source() -> str:
+    """CSV file, directory or glob to load (override with SPEND_TRACKER_DATA)"""
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(base_dir, "data", "jk_full_cc_history.csv")
+    default_path = os.path.join(base_dir, "data", "jk_full_cc_history.csv")
+    return os.environ.get("SPEND_TRACKER_DATA", default_path)
+
+
+def get_graphing_options() -> dict:
+    """
+    Period and cube settings from the environment:
+    SPEND_TRACKER_WEEK_START (0 = Monday ... 6 = Sunday, default 0),
+    SPEND_TRACKER_FISCAL_YEAR_START (first month, 1-12, default 1) and
+    SPEND_TRACKER_SKETCH_COMPRESSION (quantile sketch per period cell
+    instead of the exact amounts; unset keeps the exact amounts)
+    """
+    compression = os.environ.get("SPEND_TRACKER_SKETCH_COMPRESSION")
+    return {
+        "week_start": int(os.environ.get("SPEND_TRACKER_WEEK_START", 0)),
+        "fiscal_year_start_month": int(
+            os.environ.get("SPEND_TRACKER_FISCAL_YEAR_START", 1)
+        ),
+        "sketch_compression": int(compression) if compression else None,
+    }
+
+
+def load_transactions():
+    """Load and merge all statement exports from the data source"""
+    from spend_tracker.src.data_mgr.ingest import ingest_paths
+
+    result = ingest_paths(get_data_source())
+    print(result.format_report())
+    return result.frame
+
+
+def load_watched_transactions():
+    """
+    Load transactions for a GUI. When SPEND_TRACKER_WATCH is set and the data
+    source is a single file, it is read through an IncrementalLoader that the
+    GUI later polls for appended rows; otherwise the loader is None.
+    """
+    source = get_data_source()
+    if not (os.environ.get("SPEND_TRACKER_WATCH") and os.path.isfile(source)):
+        return load_transactions(), None
+
+    from spend_tracker.src.data_mgr.incremental import IncrementalLoader
+
+    loader = IncrementalLoader(source)
+    transactions = loader.read_new()
+    print(f"Watching {source} ({loader.rows_read} rows read)")
+    return transactions, loader
 
-    # Read transactions from CSV
-    transactions = read_csv(file_path)
 
-    # Prepare data grouped by category
-    data_by_category = prepare_data(transactions)
+def test_csv_reader():
+    from spend_tracker.src.data_mgr.csv_reader import iter_csv, prepare_data
+    from spend_tracker.src.data_mgr.ingest import resolve_paths
+
+    # Stream every CSV in the data source one batch at a time, grouping each
+    # batch by category as it arrives
+    data_by_category = {}
+    for path in resolve_paths(get_data_source()):
+        for batch in iter_csv(path):
+            prepare_data(batch, data_by_category)
 
     # Example: Access transactions for a specific category
     print(f"Full csv for {test_category}:")
@@ -29,12 +80,22 @@ def test_csv_reader():
 
 
 def test_outlier():
+    from spend_tracker.src.data_mgr.csv_reader import prepare_data
+    from spend_tracker.src.data_mgr.outlier_filter import filter_outliers
+    from spend_tracker.src.util.classes import CategoryStats
+
+    transactions = load_transactions()
 
     # Prepare data grouped by category
-    data_by_category = test_csv_reader()
+    data_by_category = prepare_data(transactions).get(test_category, [])
+
+    # The running statistics already hold the category mean
+    average = None
+    if data_by_category:
+        average = CategoryStats.from_frame(transactions).summary(test_category)["mean"]
 
     # Filter outliers with a 50% threshold
-    filtered_data, outliers = filter_outliers(data_by_category, 1)
+    filtered_data, outliers = filter_outliers(data_by_category, 1, average)
 
     # Print filtered data and outliers for a specific category
     print("Filtered Data (Non-Outliers):")
@@ -46,12 +107,14 @@ def test_outlier():
 
 
 def test_graphable_data():
+    from spend_tracker.src.data_mgr.restructure_data_for_graphing import (
+        restructure_for_graphing,
+    )
+
     # Get transactions
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(base_dir, "data", "jk_full_cc_history.csv")
-    transactions = read_csv(file_path)
+    transactions = load_transactions()
 
-    graphable_data = restructure_for_graphing(transactions)
+    graphable_data = restructure_for_graphing(transactions, **get_graphing_options())
 
     # Example: Print monthly spending by category
     print("\nMonthly spending by category:")
@@ -59,7 +122,7 @@ def test_graphable_data():
         print(f"\nMonth {i+1}: {month.start_date.strftime('%b %Y')}")
         for category, data in month.categories.items():
             print(
-                f"  {category}: ${data.total_spend:.2f} ({len(data.transactions)} transactions)"
+                f"  {category}: ${data.total_spend:.2f} ({data.count} transactions)"
             )
 
     # Example: Print weekly spending for a specific category
@@ -77,29 +140,45 @@ def test_graphable_data():
 
 def test_gui_past():
     """Test the GUI visualization"""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(base_dir, "data", "jk_full_cc_history.csv")
-    transactions = read_csv(file_path)
-
-    # Convert to graphable format
-    graphable_data = restructure_for_graphing(transactions)
+    timer = StartupTimer()
 
-    # Launch GUI
+    # Import the data and GUI stacks first so their cost is its own phase
+    from spend_tracker.src.data_mgr.restructure_data_for_graphing import (
+        restructure_for_graphing,
+    )
     from spend_tracker.src.gui.main_window import run_visualizer
 
-    run_visualizer(graphable_data)
+    timer.mark("import")
+
+    transactions, loader = load_watched_transactions()
+    timer.mark("parse")
+
+    # Convert to graphable format
+    graphable_data = restructure_for_graphing(transactions, **get_graphing_options())
+    timer.mark("restructure")
+
+    # Launch GUI; it marks the first draw and prints the report
+    run_visualizer(graphable_data, startup_timer=timer, refresh_source=loader)
 
 
 def test_table_gui():
     """Test the table GUI visualization"""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(base_dir, "data", "jk_full_cc_history.csv")
-    transactions = read_csv(file_path)
+    timer = StartupTimer()
 
-    # Convert to graphable format
-    graphable_data = restructure_for_graphing(transactions)
-
-    # Launch GUI
+    # Import the data and GUI stacks first so their cost is its own phase
+    from spend_tracker.src.data_mgr.restructure_data_for_graphing import (
+        restructure_for_graphing,
+    )
     from spend_tracker.src.gui2.main_window import run_table_view
 
-    run_table_view(graphable_data)
+    timer.mark("import")
+
+    transactions, loader = load_watched_transactions()
+    timer.mark("parse")
+
+    # Convert to graphable format
+    graphable_data = restructure_for_graphing(transactions, **get_graphing_options())
+    timer.mark("restructure")
+
+    # Launch GUI; it marks the first draw and prints the report
+    run_table_view(graphable_data, startup_timer=timer, refresh_source=loader)
@@ -1,55 +1,160 @@
-import csv
-from datetime import datetime
+from typing import Iterable, Iterator
 
-from spend_tracker.src.util.classes import CC_Transaction
+import numpy as np
+import pandas as pd
 
+from spend_tracker.src.util.classes import CC_Transaction, TransactionFrame
 
-def read_csv(file_path: str) -> list[CC_Transaction]:
+CSV_COLUMNS = ["Date", "Description", "Category", "Amount", "Source"]
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def intern_strings(values: np.ndarray) -> np.ndarray:
     """
-    Reads a CSV file and parses it into a list of CC_Transaction objects.
+    Deduplicates a string column so equal values share one str object.
+
+    Args:
+        values (np.ndarray): Object array of strings.
+
+    Returns:
+        np.ndarray: Object array where repeated strings are the same object.
+    """
+    codes, uniques = pd.factorize(values)
+    return np.asarray(uniques, dtype=object)[codes]
+
+
+def frame_from_table(table: pd.DataFrame) -> TransactionFrame:
+    """
+    Converts a raw string table into a TransactionFrame, parsing each column
+    in bulk. Rows with an unparseable date or amount are reported and dropped.
+
+    Args:
+        table (pd.DataFrame): Table read from the CSV with every column as str.
+
+    Returns:
+        TransactionFrame: Parsed transactions.
+    """
+    missing = [column for column in CSV_COLUMNS if column not in table.columns]
+    if missing:
+        raise KeyError(f"Missing columns: {missing}")
+
+    dates = pd.to_datetime(table["Date"], format="%Y-%m-%d", errors="coerce")
+    amounts = pd.to_numeric(table["Amount"], errors="coerce")
+
+    valid = (dates.notna() & amounts.notna()).to_numpy()
+    if not valid.all():
+        for row in table.loc[~valid, CSV_COLUMNS].to_dict("records"):
+            print(f"Skipping invalid row: {row}. Error: unparseable date or amount")
+
+    category_codes, categories = pd.factorize(table["Category"].to_numpy()[valid])
+    source_codes, sources = pd.factorize(table["Source"].to_numpy()[valid])
+
+    return TransactionFrame(
+        dates=dates.to_numpy()[valid].astype("datetime64[D]"),
+        amounts_cents=np.rint(amounts.to_numpy()[valid] * 100).astype(np.int64),
+        category_codes=category_codes.astype(np.int32),
+        descriptions=intern_strings(
+            table["Description"].to_numpy(dtype=object)[valid]
+        ),
+        source_codes=source_codes.astype(np.int32),
+        categories=list(categories),
+        sources=list(sources),
+    )
+
+
+def read_csv_frame(file_path: str) -> TransactionFrame:
+    """
+    Reads a CSV file into a columnar TransactionFrame. Dates, amounts and
+    categories are parsed in bulk rather than one row at a time.
 
     Args:
         file_path (str): Path to the CSV file.
 
     Returns:
-        list[CC_Transaction]: List of parsed transactions.
+        TransactionFrame: Parsed transactions (empty if the file can't be read).
+    """
+    try:
+        table = pd.read_csv(
+            file_path, dtype=str, keep_default_na=False, encoding="utf-8"
+        )
+        return frame_from_table(table)
+    except FileNotFoundError:
+        print(f"File not found: {file_path}")
+    except Exception as e:
+        print(f"An error occurred while reading the file: {e}")
+
+    return TransactionFrame.empty()
+
+
+def iter_csv(
+    file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[TransactionFrame]:
+    """
+    Reads a CSV file in fixed-size batches so that only one batch is held in
+    memory at a time.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        chunk_size (int): Number of rows per batch.
+
+    Yields:
+        TransactionFrame: Parsed transactions for each batch.
+
+    Raises:
+        Exception: Any parse error after the file was opened, once it has been
+            reported, since earlier batches may already have been consumed.
     """
-    transactions: list[CC_Transaction] = []
     try:
-        with open(file_path, mode="r", encoding="utf-8") as csv_file:
-            reader = csv.DictReader(csv_file)
-            for row in reader:
-                try:
-                    transaction = CC_Transaction(
-                        date=datetime.strptime(row["Date"], "%Y-%m-%d"),
-                        description=row["Description"],
-                        category=row["Category"],
-                        amount=float(row["Amount"]),
-                        source=row["Source"],
-                    )
-                    transactions.append(transaction)
-                except (ValueError, KeyError) as e:
-                    print(f"Skipping invalid row: {row}. Error: {e}")
+        with pd.read_csv(
+            file_path,
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8",
+            chunksize=chunk_size,
+        ) as reader:
+            for table in reader:
+                yield frame_from_table(table)
     except FileNotFoundError:
         print(f"File not found: {file_path}")
     except Exception as e:
+        # Ending quietly would pass off the batches read so far as the file
         print(f"An error occurred while reading the file: {e}")
+        raise
 
-    return transactions
 
+def read_csv(file_path: str) -> list[CC_Transaction]:
+    """
+    Reads a CSV file and parses it into a list of CC_Transaction objects.
+
+    Args:
+        file_path (str): Path to the CSV file.
 
-def prepare_data(transactions: list[CC_Transaction]) -> dict[str, list[CC_Transaction]]:
+    Returns:
+        list[CC_Transaction]: List of parsed transactions.
+    """
+    return read_csv_frame(file_path).to_transactions()
+
+
+def prepare_data(
+    transactions: Iterable[CC_Transaction],
+    data_by_category: dict[str, list[CC_Transaction]] | None = None,
+) -> dict[str, list[CC_Transaction]]:
     """
     Prepares the data for future use cases by organizing it into a dictionary
     grouped by category.
 
+    Batches from iter_csv can be folded in one at a time by passing the
+    dictionary returned for the previous batch as `data_by_category`.
+
     Args:
-        transactions (list[CC_Transaction]): List of transactions.
+        transactions (Iterable[CC_Transaction]): Transactions or a TransactionFrame.
+        data_by_category (dict, optional): Existing grouping to add to.
 
     Returns:
         dict: Dictionary where keys are categories and values are lists of transactions.
     """
-    data_by_category: dict[str, list[CC_Transaction]] = {}
+    if data_by_category is None:
+        data_by_category = {}
     for transaction in transactions:
         if transaction.category not in data_by_category:
             data_by_category[transaction.category] = []
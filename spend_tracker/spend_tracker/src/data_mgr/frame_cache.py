@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+import pandas as pd
+
+from spend_tracker.src.data_mgr.csv_reader import read_csv_frame
+from spend_tracker.src.util.classes import TransactionFrame
+
+# 2: frames are stored in date order
+# 3: frames are stored in store order, descriptions as codes into a table
+CACHE_VERSION = 3
+MANIFEST_NAME = "manifest.json"
+# Distinct descriptions are stored as one UTF-8 blob joined by the ASCII unit
+# separator; each row holds a code into them
+DESCRIPTION_SEPARATOR = "\x1f"
+ARRAY_COLUMNS = ["dates", "amounts_cents", "category_codes", "source_codes"]
+
+
+def get_cache_dir() -> str:
+    """Root directory for cached data (override with SPEND_TRACKER_CACHE_DIR)"""
+    if "SPEND_TRACKER_CACHE_DIR" in os.environ:
+        return os.environ["SPEND_TRACKER_CACHE_DIR"]
+
+    base_dir = os.environ.get(
+        "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base_dir, "spend_tracker")
+
+
+def hash_file(file_path: str) -> str:
+    """Content hash of a file, read in 1 MiB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _entry_dir(file_path: str) -> str:
+    """Cache directory for one source file, keyed by its absolute path"""
+    key = hashlib.blake2b(
+        os.path.abspath(file_path).encode("utf-8"), digest_size=8
+    ).hexdigest()
+    return os.path.join(get_cache_dir(), "frames", key)
+
+
+def _read_manifest(entry_dir: str) -> dict | None:
+    try:
+        with open(os.path.join(entry_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("version") != CACHE_VERSION:
+        return None
+    return manifest
+
+
+def _write_manifest(entry_dir: str, manifest: dict) -> None:
+    # Write then rename so readers never see a half-written manifest
+    temp_path = os.path.join(entry_dir, MANIFEST_NAME + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, os.path.join(entry_dir, MANIFEST_NAME))
+
+
+def _save_array(entry_dir: str, name: str, array: np.ndarray) -> None:
+    # Replace rather than overwrite so live memory maps of the old file stay valid
+    temp_path = os.path.join(entry_dir, f"{name}.npy.tmp")
+    with open(temp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(temp_path, os.path.join(entry_dir, f"{name}.npy"))
+
+
+def save_cached_frame(
+    file_path: str,
+    frame: TransactionFrame,
+    stat: os.stat_result | None = None,
+    content_hash: str | None = None,
+) -> bool:
+    """
+    Stores the parsed columns of a source file as .npy files that can be
+    memory-mapped on the next load.
+
+    Args:
+        file_path (str): Source CSV the frame was parsed from.
+        frame (TransactionFrame): Parsed transactions.
+        stat (os.stat_result, optional): Source stat taken before parsing.
+        content_hash (str, optional): Hash of the source taken before parsing.
+
+    Returns:
+        bool: True if the frame was cached.
+    """
+    description_codes, descriptions = pd.factorize(frame.descriptions)
+    descriptions = descriptions.tolist()
+    if any(DESCRIPTION_SEPARATOR in description for description in descriptions):
+        return False
+
+    entry_dir = _entry_dir(file_path)
+    try:
+        stat = stat or os.stat(file_path)
+        os.makedirs(entry_dir, exist_ok=True)
+
+        # Invalidate first so a crash mid-write can't pair old metadata with new arrays
+        manifest_path = os.path.join(entry_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        for column in ARRAY_COLUMNS:
+            _save_array(entry_dir, column, getattr(frame, column))
+
+        _save_array(entry_dir, "description_codes", description_codes.astype(np.int32))
+        blob = DESCRIPTION_SEPARATOR.join(descriptions).encode("utf-8")
+        _save_array(entry_dir, "descriptions", np.frombuffer(blob, dtype=np.uint8))
+
+        _write_manifest(
+            entry_dir,
+            {
+                "version": CACHE_VERSION,
+                "source": os.path.abspath(file_path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "content_hash": content_hash or hash_file(file_path),
+                "rows": len(frame),
+                "categories": list(frame.categories),
+                "sources": list(frame.sources),
+            },
+        )
+    except OSError as e:
+        print(f"Could not write cache for {file_path}: {e}")
+        return False
+
+    return True
+
+
+def lookup_cached_frame(
+    file_path: str,
+) -> tuple[TransactionFrame | None, os.stat_result | None, str | None]:
+    """
+    Loads a previously cached frame if the source file is unchanged. Size and
+    mtime are checked first; if only the mtime differs the content hash
+    decides, so touching a file doesn't force a re-parse. Descriptions are
+    rebuilt from the table of distinct strings, so a warm load does no
+    per-row Python work.
+
+    On a miss the stat and content hash taken while checking are returned too
+    (None where they weren't needed), so a caller that goes on to parse the
+    file can cache it without stating or hashing it again.
+
+    Args:
+        file_path (str): Source CSV path.
+
+    Returns:
+        tuple: Memory-mapped frame (None on a miss), source stat, content hash.
+    """
+    entry_dir = _entry_dir(file_path)
+    manifest = _read_manifest(entry_dir)
+    if manifest is None:
+        return None, None, None
+
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None, None, None
+
+    if stat.st_size != manifest["size"]:
+        return None, stat, None
+
+    # The manifest is left as is: loads only ever read the cache
+    content_hash = None
+    if stat.st_mtime_ns != manifest["mtime_ns"]:
+        content_hash = hash_file(file_path)
+        if content_hash != manifest["content_hash"]:
+            return None, stat, content_hash
+
+    try:
+        columns = {
+            column: np.load(os.path.join(entry_dir, f"{column}.npy"), mmap_mode="r")
+            for column in ARRAY_COLUMNS + ["description_codes"]
+        }
+        blob = np.load(os.path.join(entry_dir, "descriptions.npy"), mmap_mode="r")
+    except (OSError, ValueError):
+        return None, stat, content_hash
+
+    # Only the distinct descriptions are decoded; rows share their str objects
+    descriptions = blob.tobytes().decode("utf-8").split(DESCRIPTION_SEPARATOR)
+    description_codes = columns.pop("description_codes")
+    frame = TransactionFrame(
+        descriptions=np.array(descriptions, dtype=object)[description_codes],
+        categories=manifest["categories"],
+        sources=manifest["sources"],
+        **columns,
+    )
+    return frame, stat, content_hash
+
+
+def read_csv_cached(
+    file_path: str,
+    stat: os.stat_result | None = None,
+    content_hash: str | None = None,
+) -> TransactionFrame:
+    """
+    Reads a CSV file through the on-disk cache, parsing and caching it on a
+    miss. Frames are cached in store order (see TransactionFrame.sort_by_category),
+    so a single cached file becomes a TransactionStore without sorting (and so
+    copying) its memory-mapped columns.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        stat (os.stat_result, optional): Stat from a cache lookup that already
+            missed; the lookup is then skipped.
+        content_hash (str, optional): Content hash from that lookup, if taken.
+
+    Returns:
+        TransactionFrame: Parsed transactions, ordered by category then date.
+    """
+    if stat is None:
+        frame, stat, content_hash = lookup_cached_frame(file_path)
+        if frame is not None:
+            return frame
+
+    # Fingerprint before parsing so a concurrent append can't be cached as parsed
+    try:
+        stat = stat or os.stat(file_path)
+        content_hash = content_hash or hash_file(file_path)
+    except OSError:
+        return read_csv_frame(file_path).sort_by_category()
+
+    frame = read_csv_frame(file_path).sort_by_category()
+    if len(frame):
+        save_cached_frame(file_path, frame, stat, content_hash)
+    return frame
@@ -0,0 +1,137 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from spend_tracker.src.data_mgr.csv_reader import frame_from_table
+from spend_tracker.src.data_mgr.restructure_data_for_graphing import add_transactions
+from spend_tracker.src.util.classes import GraphableData, TransactionFrame
+
+# How often a GUI checks a watched file for appended rows (milliseconds)
+REFRESH_INTERVAL_MS = 5000
+
+
+def record_ends(data: bytes) -> np.ndarray:
+    """
+    Offsets just past each newline that ends a CSV record. A newline inside a
+    quoted field is part of the field, so only newlines preceded by an even
+    number of quote characters count (an escaped quote is a pair, so it keeps
+    the parity). data must start at a record boundary.
+
+    Args:
+        data (bytes): Raw CSV bytes.
+
+    Returns:
+        np.ndarray: int64 end offsets, in order.
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buffer == ord("\n"))
+    quotes = np.flatnonzero(buffer == ord('"'))
+    outside = np.searchsorted(quotes, newlines) % 2 == 0
+    return newlines[outside] + 1
+
+
+class IncrementalLoader:
+    """Reads a growing CSV file, parsing only the rows appended since the last read.
+
+    The first read_new() returns the whole file; build GraphableData from it
+    and later calls to refresh() fold just the appended tail into that data.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.offset = 0  # Byte offset just past the last complete record read
+        self.rows_read = 0  # Records parsed, not physical lines
+        self.header: list[str] | None = None
+        self.last_row = b""  # Raw bytes of the last record read, to detect rewrites
+        self.last_size: int | None = None  # File size at the previous read
+
+    def _was_rewritten(self, csv_file, size: int) -> bool:
+        """Check the file still ends the way it did at the last read"""
+        if size < self.offset:
+            return True
+        if not self.last_row:
+            return False
+
+        csv_file.seek(self.offset - len(self.last_row))
+        return csv_file.read(len(self.last_row)) != self.last_row
+
+    def read_new(self) -> TransactionFrame:
+        """
+        Parses rows appended since the previous call. A trailing record without
+        its closing newline is left for the next call, since the bank may still be
+        writing it, unless this is the first read or the file hasn't grown since
+        the previous one; files that simply end without a newline are then read
+        in full.
+
+        Returns:
+            TransactionFrame: Newly appended transactions.
+
+        Raises:
+            ValueError: If the file was truncated or rewritten since the last read.
+        """
+        try:
+            with open(self.file_path, "rb") as csv_file:
+                size = os.fstat(csv_file.fileno()).st_size
+                if self._was_rewritten(csv_file, size):
+                    raise ValueError(
+                        f"{self.file_path} was rewritten; reload it from scratch"
+                    )
+
+                csv_file.seek(self.offset)
+                tail = csv_file.read(size - self.offset)
+        except FileNotFoundError:
+            print(f"File not found: {self.file_path}")
+            return TransactionFrame.empty()
+
+        # Only whole records are consumed; a quoted field may span lines
+        ends = record_ends(tail)
+        settled = self.header is None or size == self.last_size
+        self.last_size = size
+        remainder = tail[ends[-1] if len(ends) else 0 :]
+        if settled and remainder.strip() and remainder.count(b'"') % 2 == 0:
+            ends = np.append(ends, len(tail))
+        if not len(ends):
+            return TransactionFrame.empty()
+
+        if self.header is None:
+            header_end = int(ends[0])
+            self.header = list(
+                pd.read_csv(io.BytesIO(tail[:header_end]), nrows=0).columns
+            )
+            self.last_row = tail[:header_end]
+            self.offset += header_end
+            tail, ends = tail[header_end:], ends[1:] - header_end
+            if not len(ends):
+                return TransactionFrame.empty()
+
+        complete = tail[: ends[-1]]
+        self.offset += len(complete)
+        self.last_row = complete[ends[-2] if len(ends) > 1 else 0 :]
+
+        table = pd.read_csv(
+            io.BytesIO(complete),
+            header=None,
+            names=self.header,
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8",
+        )
+        self.rows_read += len(table)
+        return frame_from_table(table)
+
+    def refresh(self, graphable_data: GraphableData) -> TransactionFrame:
+        """
+        Folds newly appended transactions into existing graphable data. New
+        periods are created as needed and category totals are updated in place.
+
+        Args:
+            graphable_data (GraphableData): Data built from the earlier rows.
+
+        Returns:
+            TransactionFrame: The transactions that were added.
+        """
+        delta = self.read_new()
+        add_transactions(graphable_data, delta)
+        return delta
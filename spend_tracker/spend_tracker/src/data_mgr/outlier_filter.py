@@ -1,17 +1,281 @@
+import numpy as np
+
 from spend_tracker.src.util.classes import (
     CC_Transaction,  # Import the CC_Transaction class
 )
 
+# Outlier rules; each flags amounts above a per-group cutoff derived from `threshold`:
+#   mean:       mean * (1 + threshold / 100)
+#   percentile: the threshold-th percentile (linear interpolation, like np.percentile)
+#   iqr:        Q3 + threshold * (Q3 - Q1)
+#   mad:        median + threshold * MAD / 0.6745 (modified z-score above threshold)
+OUTLIER_METHODS = ("mean", "percentile", "iqr", "mad")
+
+
+def grouped_quantiles(
+    sorted_values: np.ndarray, group_starts: np.ndarray, quantile: float | np.ndarray
+) -> np.ndarray:
+    """
+    Linearly interpolated quantile of every group at once.
+
+    Args:
+        sorted_values (np.ndarray): Values sorted within each group, groups laid out back to back.
+        group_starts (np.ndarray): Offset of each group plus a final end offset.
+        quantile (float | np.ndarray): Quantile(s) between 0 and 1.
 
-def filter_outliers(transactions: list[CC_Transaction], threshold_percentage: float):
+    Returns:
+        np.ndarray: Quantile per group (NaN for empty groups), with a leading
+            axis per quantile when several are given.
+    """
+    quantile = np.asarray(quantile, dtype=np.float64)[..., None]
+    starts = group_starts[:-1]
+    sizes = np.diff(group_starts)
+    occupied = sizes > 0
+
+    position = quantile * (sizes[occupied] - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    low_values = sorted_values[starts[occupied] + lower]
+    high_values = sorted_values[starts[occupied] + upper]
+
+    result = np.full(quantile.shape[:-1] + (len(sizes),), np.nan)
+    result[..., occupied] = low_values + (high_values - low_values) * (position - lower)
+    return result
+
+
+class AmountIndex:
+    """Amounts sorted within each group, with prefix sums.
+
+    Any outlier cutoff splits a group's sorted amounts into a kept prefix and
+    an outlier suffix, so changing the threshold costs one binary search and
+    two prefix-sum lookups per group instead of a pass over every amount.
+    """
+
+    def __init__(
+        self,
+        amounts: np.ndarray,
+        groups: np.ndarray,
+        group_count: int | None = None,
+        presorted: bool = False,
+    ):
+        groups = np.asarray(groups, dtype=np.int64)
+        if group_count is None:
+            group_count = int(groups.max()) + 1 if len(groups) else 0
+        self.group_count = group_count
+
+        # Position of each sorted amount in the input (None if already sorted)
+        self.order = None if presorted else np.lexsort((amounts, groups))
+        amounts = np.asarray(amounts, dtype=np.float64)
+        self.sorted_amounts = amounts if presorted else amounts[self.order]
+        self.sorted_groups = groups if presorted else groups[self.order]
+
+        self.sizes = np.bincount(groups, minlength=group_count)
+        self.group_starts = np.concatenate([[0], np.cumsum(self.sizes)])
+        self.cumulative = np.concatenate([[0.0], np.cumsum(self.sorted_amounts)])
+        self._mad: tuple[np.ndarray, np.ndarray] | None = None
+
+    def quantiles(self, quantile: float | np.ndarray) -> np.ndarray:
+        """Linearly interpolated quantile(s) (0-1) of every group"""
+        return grouped_quantiles(self.sorted_amounts, self.group_starts, quantile)
+
+    def means(self) -> np.ndarray:
+        """Mean of every group (0 for empty groups)"""
+        totals = self.cumulative[self.group_starts[1:]] - self.cumulative[
+            self.group_starts[:-1]
+        ]
+        return np.divide(
+            totals, self.sizes, out=np.zeros(self.group_count), where=self.sizes > 0
+        )
+
+    def median_absolute_deviations(self) -> tuple[np.ndarray, np.ndarray]:
+        """Median and median absolute deviation of every group (computed once)"""
+        if self._mad is None:
+            medians = self.quantiles(0.5)
+            deviations = np.abs(self.sorted_amounts - medians[self.sorted_groups])
+            deviations = deviations[np.lexsort((deviations, self.sorted_groups))]
+            self._mad = medians, grouped_quantiles(deviations, self.group_starts, 0.5)
+        return self._mad
+
+    def cutoffs(self, method: str, threshold: float | np.ndarray) -> np.ndarray:
+        """
+        Outlier cutoff of every group; amounts above it are outliers.
+
+        Args:
+            method (str): One of OUTLIER_METHODS.
+            threshold (float | np.ndarray): Method parameter(s) (see OUTLIER_METHODS).
+
+        Returns:
+            np.ndarray: Cutoff per group, with a leading axis per threshold
+                when several are given.
+        """
+        if method == "percentile":
+            return self.quantiles(np.asarray(threshold) / 100)
+
+        threshold = np.asarray(threshold, dtype=np.float64)[..., None]
+        if method == "mean":
+            return self.means() * (1 + threshold / 100)
+        if method == "iqr":
+            q1 = self.quantiles(0.25)
+            q3 = self.quantiles(0.75)
+            return q3 + threshold * (q3 - q1)
+        if method == "mad":
+            medians, mad = self.median_absolute_deviations()
+            return medians + threshold * mad / 0.6745
+        raise ValueError(f"Unknown outlier method: {method}")
+
+    def split_points(self, cutoffs: np.ndarray) -> np.ndarray:
+        """
+        Binary search every group at once for the first amount above its cutoff.
+
+        Args:
+            cutoffs (np.ndarray): Cutoff per group, optionally with leading
+                axes (e.g. one row per threshold).
+
+        Returns:
+            np.ndarray: Absolute position in sorted_amounts where each group's
+                outliers begin (the group's end if it has none), shaped like cutoffs.
+        """
+        low = np.broadcast_to(self.group_starts[:-1], cutoffs.shape).copy()
+        high = np.broadcast_to(self.group_starts[1:], cutoffs.shape).copy()
+        for _ in range(int(self.sizes.max(initial=0)).bit_length()):
+            searching = low < high
+            middle = (low + high) // 2
+            below = np.zeros(cutoffs.shape, dtype=bool)
+            below[searching] = (
+                self.sorted_amounts[middle[searching]] <= cutoffs[searching]
+            )
+            low = np.where(searching & below, middle + 1, low)
+            high = np.where(searching & ~below, middle, high)
+        return low
+
+    def kept_totals(
+        self, method: str, threshold: float | np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sum and count of the non-outlier amounts in every group. Passing an
+        array of thresholds sweeps all of them in one vectorized pass.
+
+        Args:
+            method (str): One of OUTLIER_METHODS.
+            threshold (float | np.ndarray): Method parameter(s) (see OUTLIER_METHODS).
+
+        Returns:
+            tuple: (totals, counts) per group, with a leading axis per
+                threshold when several are given.
+        """
+        return self.totals_below(self.cutoffs(method, threshold))
+
+    def totals_below(self, cutoffs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sum and count of the amounts at or below each group's cutoff.
+
+        Args:
+            cutoffs (np.ndarray): Cutoff per group, optionally with leading axes.
+
+        Returns:
+            tuple: (totals, counts) shaped like cutoffs.
+        """
+        starts = self.group_starts[:-1]
+        splits = self.split_points(cutoffs)
+        return self.cumulative[splits] - self.cumulative[starts], splits - starts
+
+    def group_rows(
+        self, group: int, method: str, threshold: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Input positions of one group's kept and outlier amounts, each in
+        ascending input order.
+
+        Args:
+            group (int): Group id.
+            method (str): One of OUTLIER_METHODS.
+            threshold (float): Method parameter (see OUTLIER_METHODS).
+
+        Returns:
+            tuple: (kept_rows, outlier_rows).
+        """
+        start, stop = int(self.group_starts[group]), int(self.group_starts[group + 1])
+        split = int(self.split_points(self.cutoffs(method, threshold))[group])
+        rows = np.arange(start, stop) if self.order is None else self.order[start:stop]
+        return np.sort(rows[: split - start]), np.sort(rows[split - start :])
+
+
+def outlier_cutoffs(
+    amounts: np.ndarray,
+    groups: np.ndarray,
+    method: str,
+    threshold: float,
+    group_count: int | None = None,
+) -> np.ndarray:
+    """
+    Computes the outlier cutoff of every group in one grouped pass.
+
+    Args:
+        amounts (np.ndarray): Transaction amounts.
+        groups (np.ndarray): Non-negative group id of each amount (e.g. category code).
+        method (str): One of OUTLIER_METHODS.
+        threshold (float): Method parameter (see OUTLIER_METHODS).
+        group_count (int, optional): Number of groups (defaults to max id + 1).
+
+    Returns:
+        np.ndarray: Cutoff per group; amounts above it are outliers.
+    """
+    if method not in OUTLIER_METHODS:
+        raise ValueError(f"Unknown outlier method: {method}")
+
+    groups = np.asarray(groups, dtype=np.int64)
+    if group_count is None:
+        group_count = int(groups.max()) + 1 if len(groups) else 0
+
+    if method == "mean":
+        # No sorting needed for the mean rule
+        sizes = np.bincount(groups, minlength=group_count)
+        sums = np.bincount(groups, weights=amounts, minlength=group_count)
+        means = np.divide(sums, sizes, out=np.zeros(group_count), where=sizes > 0)
+        return means * (1 + threshold / 100)
+
+    return AmountIndex(amounts, groups, group_count).cutoffs(method, threshold)
+
+
+def outlier_mask(
+    amounts: np.ndarray,
+    groups: np.ndarray,
+    method: str,
+    threshold: float,
+    group_count: int | None = None,
+) -> np.ndarray:
+    """
+    Flags outliers within each group, evaluating every group in one pass.
+
+    Args:
+        amounts (np.ndarray): Transaction amounts.
+        groups (np.ndarray): Non-negative group id of each amount (e.g. category code).
+        method (str): One of OUTLIER_METHODS.
+        threshold (float): Method parameter (see OUTLIER_METHODS).
+        group_count (int, optional): Number of groups (defaults to max id + 1).
+
+    Returns:
+        np.ndarray: Boolean mask, True where the amount is an outlier.
+    """
+    cutoffs = outlier_cutoffs(amounts, groups, method, threshold, group_count)
+    return amounts > cutoffs[np.asarray(groups, dtype=np.int64)]
+
+
+def filter_outliers(
+    transactions: list[CC_Transaction],
+    threshold_percentage: float,
+    average: float | None = None,
+):
     """
     Filters out transactions that are considered outliers based on a percentage
-    threshold compared to the overall average. Adds an `outlier` field to each
-    transaction to indicate whether it is an outlier.
+    threshold compared to the overall average. The transactions themselves are
+    not modified; use outlier_mask for a per-row flag.
 
     Args:
         transactions (list): List of CC_Transaction objects.
         threshold_percentage (float): Percentage threshold to identify outliers (e.g., 50 for 50%).
+        average (float, optional): Mean amount of the transactions if already
+            known, e.g. from CategoryStats, so it isn't recomputed.
 
     Returns:
         tuple: A tuple containing two lists:
@@ -21,23 +285,20 @@ def filter_outliers(transactions: list[CC_Transaction], threshold_percentage: fl
     if not transactions:
         return [], []
 
-    # Calculate the average amount
-    amounts = [transaction.amount for transaction in transactions]
-    average = sum(amounts) / len(amounts)
-
-    # Calculate the threshold for outliers
-    threshold = average * (1 + threshold_percentage / 100)
+    amounts = np.array([transaction.amount for transaction in transactions])
+    if average is None:
+        average = float(amounts.mean())
+    is_outlier = amounts > average * (1 + threshold_percentage / 100)
 
     # Separate outliers and non-outliers
     filtered_transactions = []
     outlier_transactions = []
 
-    for transaction in transactions:
-        if transaction.amount > threshold:
-            transaction.outlier = True  # Mark as outlier
+    for transaction, flagged in zip(transactions, is_outlier.tolist()):
+        if flagged:
             outlier_transactions.append(transaction)
         else:
-            transaction.outlier = False  # Mark as non-outlier
             filtered_transactions.append(transaction)
 
     return filtered_transactions, outlier_transactions
+
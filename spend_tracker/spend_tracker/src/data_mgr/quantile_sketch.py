@@ -0,0 +1,169 @@
+from typing import Iterable
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 100
+
+
+def _compress(
+    means: np.ndarray, weights: np.ndarray, compression: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Merges centroids so each one covers at most one unit of the t-digest k1
+    scale function. Centroids near the tails stay small, which keeps extreme
+    quantiles (the ones outlier thresholds use) accurate.
+
+    Args:
+        means (np.ndarray): Centroid means.
+        weights (np.ndarray): Centroid weights.
+        compression (int): Larger values keep more centroids and more accuracy.
+
+    Returns:
+        tuple: (means, weights) of the compressed centroids, sorted by mean.
+    """
+    order = np.argsort(means, kind="stable")
+    means = means[order]
+    weights = weights[order]
+    total = weights.sum()
+
+    # Bucket every centroid by the k value where it starts
+    q_left = (np.cumsum(weights) - weights) / total
+    k = compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+    buckets = np.floor(k - k.min()).astype(np.int64)
+    _, buckets = np.unique(buckets, return_inverse=True)
+
+    merged_weights = np.bincount(buckets, weights=weights)
+    merged_means = np.bincount(buckets, weights=means * weights) / merged_weights
+    return merged_means, merged_weights
+
+
+class QuantileSketch:
+    """Mergeable t-digest style summary of a distribution of amounts.
+
+    Holds O(compression) centroids no matter how many values were added, and
+    two sketches merge into one describing the combined values, so sketches
+    of individual periods can be merged for any date range.
+    """
+
+    def __init__(
+        self,
+        compression: int = DEFAULT_COMPRESSION,
+        means: np.ndarray | None = None,
+        weights: np.ndarray | None = None,
+        minimum: float = np.inf,
+        maximum: float = -np.inf,
+    ):
+        self.compression = compression
+        self.means = means if means is not None else np.zeros(0)
+        self.weights = weights if weights is not None else np.zeros(0)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_values(
+        cls, values: np.ndarray, compression: int = DEFAULT_COMPRESSION
+    ) -> "QuantileSketch":
+        """Sketch of a batch of values"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return cls(compression)
+
+        means, weights = _compress(values, np.ones(len(values)), compression)
+        return cls(compression, means, weights, values.min(), values.max())
+
+    @property
+    def count(self) -> int:
+        return int(self.weights.sum())
+
+    @property
+    def total(self) -> float:
+        """Sum of all values added"""
+        return float((self.means * self.weights).sum())
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Sketch of the values of both sketches combined"""
+        return merge_sketches([self, other], self.compression)
+
+    def update(self, values: np.ndarray) -> None:
+        """Fold a batch of values into the sketch"""
+        merged = self.merge(QuantileSketch.from_values(values, self.compression))
+        self.means, self.weights = merged.means, merged.weights
+        self.minimum, self.maximum = merged.minimum, merged.maximum
+
+    def _knots(self) -> tuple[np.ndarray, np.ndarray]:
+        """Rank and value of each centroid centre, bracketed by the min and max"""
+        ranks = np.cumsum(self.weights) - self.weights / 2
+        return (
+            np.concatenate([[0.0], ranks, [self.weights.sum()]]),
+            np.concatenate([[self.minimum], self.means, [self.maximum]]),
+        )
+
+    def quantile(self, quantile: float | np.ndarray) -> float | np.ndarray:
+        """
+        Estimated quantile(s) of the sketched values.
+
+        Args:
+            quantile (float | np.ndarray): Quantile(s) between 0 and 1.
+
+        Returns:
+            float | np.ndarray: Estimated value at each quantile (NaN if empty).
+        """
+        if len(self.weights) == 0:
+            return np.full(np.shape(quantile), np.nan)[()]
+
+        ranks, values = self._knots()
+        return np.interp(np.asarray(quantile) * ranks[-1], ranks, values)
+
+    def below(self, cutoff: float) -> tuple[float, float]:
+        """
+        Estimated count and sum of the values at or below a cutoff.
+
+        Args:
+            cutoff (float): Upper bound on the values to include.
+
+        Returns:
+            tuple: (count, total) of the included values.
+        """
+        if len(self.weights) == 0 or cutoff < self.minimum:
+            return 0.0, 0.0
+        if cutoff >= self.maximum:
+            return float(self.weights.sum()), self.total
+
+        ranks, values = self._knots()
+        rank = np.interp(cutoff, values, ranks)
+
+        # Sums are exact at centroid edges; spread each centroid evenly between them
+        edges = np.concatenate([[0.0], np.cumsum(self.weights)])
+        sums = np.concatenate([[0.0], np.cumsum(self.means * self.weights)])
+        return float(rank), float(np.interp(rank, edges, sums))
+
+
+def merge_sketches(
+    sketches: Iterable[QuantileSketch], compression: int = DEFAULT_COMPRESSION
+) -> QuantileSketch:
+    """
+    Merges sketches into one describing all of their values.
+
+    Args:
+        sketches (Iterable[QuantileSketch]): Sketches to merge.
+        compression (int): Compression of the merged sketch.
+
+    Returns:
+        QuantileSketch: The merged sketch.
+    """
+    sketches = [sketch for sketch in sketches if len(sketch.weights)]
+    if not sketches:
+        return QuantileSketch(compression)
+
+    means, weights = _compress(
+        np.concatenate([sketch.means for sketch in sketches]),
+        np.concatenate([sketch.weights for sketch in sketches]),
+        compression,
+    )
+    return QuantileSketch(
+        compression,
+        means,
+        weights,
+        min(sketch.minimum for sketch in sketches),
+        max(sketch.maximum for sketch in sketches),
+    )
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from spend_tracker.src.util.classes import PeriodData, PeriodSpec
+
+# Supported granularities and their display names
+GRANULARITIES = {
+    "day": "Day",
+    "week": "Week",
+    "month": "Month",
+    "quarter": "Quarter",
+    "year": "Year",
+    "fiscal_quarter": "Fiscal Quarter",
+    "fiscal_year": "Fiscal Year",
+}
+
+# 1970-01-01 was a Thursday
+EPOCH_WEEKDAY = 3
+
+
+def get_period_spec(
+    granularity: str, week_start: int = 0, fiscal_year_start_month: int = 1
+) -> PeriodSpec:
+    """
+    Returns the bucketing rule for a granularity.
+
+    Args:
+        granularity (str): One of the keys in GRANULARITIES.
+        week_start (int): First day of the week (0 = Monday ... 6 = Sunday).
+        fiscal_year_start_month (int): First month of the fiscal year (1-12).
+
+    Returns:
+        PeriodSpec: Day- or month-based period rule.
+    """
+    fiscal_anchor = fiscal_year_start_month - 1
+    specs = {
+        "day": PeriodSpec("day", 1),
+        "week": PeriodSpec("day", 7, (week_start - EPOCH_WEEKDAY) % 7),
+        "month": PeriodSpec("month", 1),
+        "quarter": PeriodSpec("month", 3),
+        "year": PeriodSpec("month", 12),
+        "fiscal_quarter": PeriodSpec("month", 3, fiscal_anchor % 3),
+        "fiscal_year": PeriodSpec("month", 12, fiscal_anchor),
+    }
+    if granularity not in specs:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    return specs[granularity]
+
+
+def _unit_ordinals(dates: np.ndarray, unit: str) -> np.ndarray:
+    """Days or months since the epoch for each date"""
+    return dates.astype("datetime64[D]" if unit == "day" else "datetime64[M]").astype(
+        np.int64
+    )
+
+
+def period_codes(dates: np.ndarray, spec: PeriodSpec) -> np.ndarray:
+    """
+    Absolute period number of each date under a spec. Consecutive periods have
+    consecutive codes, so subtracting the first code gives a list index.
+
+    Args:
+        dates (np.ndarray): datetime64 dates.
+        spec (PeriodSpec): Bucketing rule.
+
+    Returns:
+        np.ndarray: int64 period codes.
+    """
+    return (_unit_ordinals(dates, spec.unit) - spec.anchor) // spec.length
+
+
+def period_start_dates(codes: np.ndarray, spec: PeriodSpec) -> np.ndarray:
+    """First day of each period code as datetime64[D]"""
+    ordinals = np.asarray(codes, dtype=np.int64) * spec.length + spec.anchor
+    if spec.unit == "day":
+        return ordinals.astype("datetime64[D]")
+    return ordinals.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def create_periods(
+    start_date: datetime, end_date: datetime, spec: PeriodSpec
+) -> list[PeriodData]:
+    """Create contiguous periods from the one containing start_date to the one containing end_date"""
+    first_code, last_code = period_codes(
+        np.array([start_date, end_date], dtype="datetime64[D]"), spec
+    ).tolist()
+    starts = period_start_dates(np.arange(first_code, last_code + 2), spec).tolist()
+
+    return [
+        PeriodData(
+            datetime(start.year, start.month, start.day),
+            datetime(end.year, end.month, end.day) - timedelta(seconds=1),
+        )
+        for start, end in zip(starts[:-1], starts[1:])
+    ]
+
@@ -1,11 +1,20 @@
-import calendar
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from spend_tracker.src.data_mgr.resample import (
+    create_periods,
+    get_period_spec,
+    period_codes,
+)
 from spend_tracker.src.util.classes import (
     CategoryPeriodData,
     CC_Transaction,
     GraphableData,
     PeriodData,
+    PeriodSpec,
+    TransactionFrame,
+    TransactionStore,
 )
 
 
@@ -20,82 +29,234 @@ def get_date_range(transactions: list[CC_Transaction]):
 
 def create_month_periods(start_date: datetime, end_date: datetime) -> list[PeriodData]:
     """Create standardized month periods from start date to end date"""
-    periods = []
+    return create_periods(start_date, end_date, get_period_spec("month"))
+
+
+def create_week_periods(
+    start_date: datetime, end_date: datetime, week_start: int = 0
+) -> list[PeriodData]:
+    """Create standardized week periods from start date to end date"""
+    return create_periods(start_date, end_date, get_period_spec("week", week_start))
+
+
+def period_indices(
+    dates: np.ndarray, first_start: datetime, spec: PeriodSpec
+) -> np.ndarray:
+    """Index of each date's period in a contiguous period list starting at first_start"""
+    first_code = period_codes(np.array([first_start], dtype="datetime64[D]"), spec)
+    return period_codes(dates, spec) - first_code[0]
+
+
+def categorize_transactions(
+    periods: list[PeriodData], store: TransactionStore, spec: PeriodSpec
+) -> None:
+    """
+    Point every period's categories at their rows in the store. The sorted
+    part of the store is ordered by (category, date), so each (category,
+    period) cell is one contiguous run of it; rows in the store's tail are
+    added with categorize_rows. Existing CategoryPeriodData objects are
+    updated in place.
+    """
+    if not len(store):
+        return
 
-    # Normalize to the start of the month
-    current_start = datetime(start_date.year, start_date.month, 1)
+    # Cells left without sorted rows (e.g. holding only tail rows) start empty
+    for period in periods:
+        for cat_data in period.categories.values():
+            cat_data.total_spend = 0.0
+            cat_data.start = cat_data.stop = 0
+            cat_data.tail_rows = None
 
-    while current_start <= end_date:
-        # Get the last day of the current month
-        last_day = calendar.monthrange(current_start.year, current_start.month)[1]
-        current_end = datetime(
-            current_start.year, current_start.month, last_day, 23, 59, 59
+    sorted_rows = store.tail_start
+    if sorted_rows:
+        # Periods are contiguous, so each one is found by index arithmetic
+        indices = period_indices(
+            store.dates[:sorted_rows], periods[0].start_date, spec
         )
+        codes = store.category_codes[:sorted_rows]
+        cells = codes.astype(np.int64) * len(periods) + indices
 
-        periods.append(PeriodData(current_start, current_end))
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(cells)) + 1])
+        stops = np.append(starts[1:], len(cells))
+        totals = np.add.reduceat(store.amounts_cents[:sorted_rows], starts) / 100
 
-        # Move to first day of next month
-        if current_start.month == 12:
-            current_start = datetime(current_start.year + 1, 1, 1)
-        else:
-            current_start = datetime(current_start.year, current_start.month + 1, 1)
+        for cell, start, stop, total in zip(
+            cells[starts].tolist(), starts.tolist(), stops.tolist(), totals.tolist()
+        ):
+            cat_data = _cell(periods, store, cell)
+            cat_data.total_spend = total
+            cat_data.start = start
+            cat_data.stop = stop
 
-    return periods
+    categorize_rows(periods, store, spec, sorted_rows)
 
 
-def create_week_periods(start_date: datetime, end_date: datetime) -> list[PeriodData]:
-    """Create standardized week periods from start date to end date"""
-    periods = []
+def categorize_rows(
+    periods: list[PeriodData], store: TransactionStore, spec: PeriodSpec, start: int
+) -> None:
+    """
+    Add the store's tail rows from `start` on to their (category, period)
+    cells. Only the cells those rows fall in are touched, so folding in an
+    append costs time proportional to the appended rows.
+    """
+    if start >= len(store):
+        return
+
+    indices = period_indices(store.dates[start:], periods[0].start_date, spec)
+    codes = store.category_codes[start:]
+    cells = codes.astype(np.int64) * len(periods) + indices
+
+    order = np.argsort(cells, kind="stable")
+    cells = cells[order]
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(cells)) + 1])
+    stops = np.append(starts[1:], len(cells))
+    totals = np.add.reduceat(store.amounts_cents[start:][order], starts)
+    rows = order + start
+
+    for cell, first, last, total in zip(
+        cells[starts].tolist(), starts.tolist(), stops.tolist(), totals.tolist()
+    ):
+        cat_data = _cell(periods, store, cell)
+        new_rows = rows[first:last]
+        if cat_data.tail_rows is not None:
+            new_rows = np.concatenate([cat_data.tail_rows, new_rows])
+        cat_data.tail_rows = new_rows
+        # Totals are kept exact by adding in cents
+        cat_data.total_spend = (round(cat_data.total_spend * 100) + total) / 100
+
 
-    # Normalize to the start of the week (Monday)
-    days_since_monday = start_date.weekday()
-    current_start = start_date - timedelta(days=days_since_monday)
-    current_start = datetime(current_start.year, current_start.month, current_start.day)
+def _cell(
+    periods: list[PeriodData], store: TransactionStore, cell: int
+) -> CategoryPeriodData:
+    """The CategoryPeriodData of a cell, created empty if it doesn't exist"""
+    category_code, period_index = divmod(cell, len(periods))
+    category = store.categories[category_code]
+    period = periods[period_index]
 
-    while current_start <= end_date:
-        current_end = current_start + timedelta(
-            days=6, hours=23, minutes=59, seconds=59
+    # Ensure the category exists in this period
+    cat_data = period.categories.get(category)
+    if cat_data is None:
+        cat_data = CategoryPeriodData(store=store)
+        period.categories[category] = cat_data
+    return cat_data
+
+
+def extend_periods(
+    periods: list[PeriodData],
+    start_date: datetime,
+    end_date: datetime,
+    spec: PeriodSpec,
+) -> None:
+    """Grow a contiguous period list in place so it covers start_date..end_date"""
+    if not periods:
+        periods.extend(create_periods(start_date, end_date, spec))
+        return
+
+    if start_date < periods[0].start_date:
+        periods[:0] = create_periods(
+            start_date, periods[0].start_date - timedelta(seconds=1), spec
         )
-        periods.append(PeriodData(current_start, current_end))
 
-        # Move to next Monday
-        current_start = current_start + timedelta(days=7)
+    if end_date > periods[-1].end_date:
+        periods.extend(
+            create_periods(periods[-1].end_date + timedelta(seconds=1), end_date, spec)
+        )
+
+
+def _fold_into_periods(
+    periods: list[PeriodData],
+    store: TransactionStore,
+    spec: PeriodSpec,
+    start: int = 0,
+) -> None:
+    """
+    Extend a period list to cover the store rows from `start` on and
+    categorize them into it. With start=0 every row is categorized again;
+    otherwise the rows must be in the store's tail.
+    """
+    if start >= len(store):
+        return
+
+    dates = store.dates[start:]
+    start_date, end_date = (
+        date.astype("datetime64[s]").item() for date in (dates.min(), dates.max())
+    )
+    extend_periods(periods, start_date, end_date, spec)
+    if start:
+        categorize_rows(periods, store, spec, start)
+    else:
+        categorize_transactions(periods, store, spec)
+
+
+def _period_spec(graphable_data: GraphableData, granularity: str) -> PeriodSpec:
+    return get_period_spec(
+        granularity,
+        graphable_data.week_start,
+        graphable_data.fiscal_year_start_month,
+    )
+
+
+def build_periods(graphable_data: GraphableData, granularity: str) -> list[PeriodData]:
+    """Bucket all transactions held by graphable data into a new granularity"""
+    periods: list[PeriodData] = []
+    _fold_into_periods(
+        periods, graphable_data.store, _period_spec(graphable_data, granularity)
+    )
 
     return periods
 
 
-def categorize_transactions(
-    periods: list[PeriodData], transactions: list[CC_Transaction]
+def add_transactions(
+    graphable_data: GraphableData,
+    transactions: list[CC_Transaction] | TransactionFrame,
 ) -> None:
-    """Categorize transactions into the appropriate periods and categories"""
-    for transaction in transactions:
-        # Find the period this transaction belongs to
-        for period in periods:
-            if period.start_date <= transaction.date <= period.end_date:
-                # Ensure the category exists in this period
-                if transaction.category not in period.categories:
-                    period.categories[transaction.category] = CategoryPeriodData()
-
-                # Add transaction to the appropriate category
-                period.categories[transaction.category].add_transaction(transaction)
-                break
-
-
-def restructure_for_graphing(transactions: list[CC_Transaction]) -> GraphableData:
-    """Convert raw transactions into a format suitable for graphing"""
+    """Fold a batch of transactions into existing graphable data, adding periods as needed"""
     if not transactions:
-        return GraphableData()
+        return
 
-    # Get the full date range of the transactions
-    start_date, end_date = get_date_range(transactions)
+    if not isinstance(transactions, TransactionFrame):
+        transactions = TransactionFrame.from_transactions(transactions)
 
-    # Create standardized time periods
-    graphable_data = GraphableData()
-    graphable_data.months = create_month_periods(start_date, end_date)
-    graphable_data.weeks = create_week_periods(start_date, end_date)
+    # One atomic update, so readers holding the lock never see a partial append
+    with graphable_data.lock:
+        appended_at = len(graphable_data.store)
+        merged = graphable_data.store.extend(transactions)
+        graphable_data.category_stats.update(transactions)
+        graphable_data.generation += 1
+        graphable_data.cubes.clear()
+        graphable_data.content_fingerprint = None
 
-    # Categorize transactions into periods
-    categorize_transactions(graphable_data.months, transactions)
-    categorize_transactions(graphable_data.weeks, transactions)
+        # Views that haven't been built yet will pick the new transactions up
+        # when they are. Built ones only need the new rows unless the store
+        # reordered.
+        for granularity, periods in graphable_data.built_periods.items():
+            _fold_into_periods(
+                periods,
+                graphable_data.store,
+                _period_spec(graphable_data, granularity),
+                0 if merged else appended_at,
+            )
+
+
+def restructure_for_graphing(
+    transactions: list[CC_Transaction] | TransactionFrame,
+    week_start: int = 0,
+    fiscal_year_start_month: int = 1,
+    sketch_compression: int | None = None,
+) -> GraphableData:
+    """Convert raw transactions into a format suitable for graphing.
+
+    Period views are not built here; each one is built on first access.
+    Weeks begin on week_start (0 = Monday ... 6 = Sunday) and fiscal periods
+    on fiscal_year_start_month. With a sketch_compression, cubes keep a
+    quantile sketch per cell instead of the exact amounts.
+    """
+    graphable_data = GraphableData(
+        week_start=week_start,
+        fiscal_year_start_month=fiscal_year_start_month,
+        sketch_compression=sketch_compression,
+    )
+    add_transactions(graphable_data, transactions)
 
     return graphable_data
+
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from spend_tracker.src.data_mgr.frame_cache import ARRAY_COLUMNS, get_cache_dir
+from spend_tracker.src.util.classes import TransactionFrame
+
+RESULT_CACHE_VERSION = 2  # 2: mean cutoffs always come from the amount index
+DEFAULT_MAX_BYTES = 64 << 20  # 64 MiB
+# Eviction frees space down to this fraction of max_bytes, so the directory
+# is scanned once per quarter of the limit written rather than on every write
+EVICT_TO = 0.75
+
+
+def dataset_fingerprint(frame: TransactionFrame) -> str:
+    """
+    Content hash of the columns query results depend on. Descriptions are
+    left out since no cached result uses them.
+
+    Args:
+        frame (TransactionFrame): Transactions the results are computed from.
+
+    Returns:
+        str: Hex digest identifying the dataset.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in ARRAY_COLUMNS:
+        digest.update(np.ascontiguousarray(getattr(frame, column)).tobytes())
+    digest.update(json.dumps([frame.categories, frame.sources]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of query results that persists across sessions.
+
+    Each entry is an .npz file of named arrays keyed by a dataset fingerprint
+    plus the query parameters. Reading an entry marks it as recently used, and
+    the least recently used entries are evicted once the directory grows past
+    max_bytes. The directory is only scanned when a running estimate of its
+    size crosses the limit, not on every write.
+    """
+
+    def __init__(
+        self, directory: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.directory = directory or os.path.join(get_cache_dir(), "results")
+        self.max_bytes = max_bytes
+        self._size_estimate: int | None = None  # Bytes, scanned on first write
+
+    def _path(self, fingerprint: str, params: dict) -> str:
+        key = json.dumps(
+            [RESULT_CACHE_VERSION, fingerprint, params], sort_keys=True, default=str
+        )
+        name = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.directory, f"{name}.npz")
+
+    def get(self, fingerprint: str, params: dict) -> dict[str, np.ndarray] | None:
+        """
+        Looks up a cached result.
+
+        Args:
+            fingerprint (str): Dataset fingerprint.
+            params (dict): Query parameters (JSON serializable, dates allowed).
+
+        Returns:
+            dict[str, np.ndarray] | None: The stored arrays, or None on a miss.
+        """
+        path = self._path(fingerprint, params)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+            os.utime(path)  # Mark as recently used for eviction
+        except (OSError, ValueError):
+            return None
+
+        return arrays
+
+    def put(
+        self, fingerprint: str, params: dict, arrays: dict[str, np.ndarray]
+    ) -> None:
+        """
+        Stores a result, evicting the least recently used entries if the
+        cache grows past its size limit.
+
+        Args:
+            fingerprint (str): Dataset fingerprint.
+            params (dict): Query parameters (JSON serializable, dates allowed).
+            arrays (dict[str, np.ndarray]): Result arrays (no object arrays).
+        """
+        path = self._path(fingerprint, params)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            # Write then rename so readers never see a half-written entry
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                np.savez(f, **arrays)
+            written = os.path.getsize(temp_path)
+            os.replace(temp_path, path)
+
+            if self._size_estimate is None:
+                self._size_estimate = self._directory_size()
+            else:
+                self._size_estimate += written
+            if self._size_estimate > self.max_bytes:
+                self._evict()
+        except (OSError, ValueError) as e:
+            print(f"Could not write result cache entry: {e}")
+
+    def _entries(self) -> list[tuple[int, int, str]]:
+        """(last used, size, path) of every entry"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _directory_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until well under max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            self._size_estimate = total
+            return
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+        # Exact again; overwrites and other processes' writes made it drift
+        self._size_estimate = total
+
+    def clear(self) -> None:
+        """Remove every cached result"""
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                os.remove(entry.path)
+        self._size_estimate = 0
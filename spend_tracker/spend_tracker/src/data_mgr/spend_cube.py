@@ -0,0 +1,317 @@
+from datetime import datetime
+
+import numpy as np
+
+from spend_tracker.src.data_mgr.outlier_filter import AmountIndex
+from spend_tracker.src.data_mgr.quantile_sketch import QuantileSketch
+from spend_tracker.src.util.classes import PeriodData
+
+# Outlier methods a sketched cube can apply; the MAD needs the exact amounts
+SKETCH_OUTLIER_METHODS = ("mean", "percentile", "iqr")
+
+
+class SpendCube:
+    """Dense period x category spend totals with cumulative sums along time.
+
+    Totals over a contiguous run of periods come from two rows of the
+    cumulative arrays, so date-range totals and averages cost O(categories)
+    no matter how many transactions or periods they cover.
+
+    Outlier filtering uses either the exact per-cell sorted amounts or, for
+    constant memory per cell, a quantile sketch of each cell.
+    """
+
+    def __init__(
+        self,
+        period_starts: np.ndarray,
+        categories: list[str],
+        totals: np.ndarray,
+        counts: np.ndarray,
+        sorted_amounts: np.ndarray | None = None,
+        group_starts: np.ndarray | None = None,
+        sketches: dict[int, QuantileSketch] | None = None,
+    ):
+        self.period_starts = period_starts  # datetime64[D], one per period
+        self.categories = categories
+        self.category_index = {name: i for i, name in enumerate(categories)}
+        self.totals = totals  # shape (periods, categories), dollars
+        self.counts = counts  # shape (periods, categories)
+
+        # Prefix sums along time, with a leading row of zeros
+        zeros = np.zeros((1, len(categories)))
+        self.cumulative_totals = np.vstack([zeros, np.cumsum(totals, axis=0)])
+        self.cumulative_active = np.vstack(
+            [zeros, np.cumsum(counts > 0, axis=0)]
+        ).astype(np.int64)
+
+        # Amounts sorted within each (period, category) cell, for outlier filtering
+        self._sorted_amounts = sorted_amounts
+        self._group_starts = group_starts
+        self._amount_index: AmountIndex | None = None
+
+        # Quantile sketch per non-empty cell, keyed by period * categories + category
+        self.sketches = sketches
+        self._sketch_knots: dict[str, np.ndarray] | None = None
+
+    @property
+    def period_dates(self) -> list[datetime]:
+        """Period start dates as datetime objects (for plotting)"""
+        return self.period_starts.astype("datetime64[s]").tolist()
+
+    def period_mask(
+        self, year: int | None = None, month: int | None = None
+    ) -> np.ndarray:
+        """Boolean mask of periods starting in the given year and/or month"""
+        mask = np.ones(len(self.period_starts), dtype=bool)
+        if year:
+            years = self.period_starts.astype("datetime64[Y]").astype(np.int64) + 1970
+            mask &= years == year
+        if month:
+            months = self.period_starts.astype("datetime64[M]").astype(np.int64) % 12
+            mask &= months + 1 == month
+        return mask
+
+    def date_range(self, start_date: datetime, end_date: datetime) -> slice:
+        """Slice of periods starting between start_date and end_date (inclusive)"""
+        start = np.searchsorted(
+            self.period_starts, np.datetime64(start_date, "D"), side="left"
+        )
+        stop = np.searchsorted(
+            self.period_starts, np.datetime64(end_date, "D"), side="right"
+        )
+        return slice(int(start), int(stop))
+
+    def range_totals(self, periods: slice = slice(None)) -> np.ndarray:
+        """Per-category totals over a contiguous range of periods"""
+        start, stop, _ = periods.indices(len(self.period_starts))
+        return self.cumulative_totals[stop] - self.cumulative_totals[start]
+
+    def range_averages(self, periods: slice = slice(None)) -> np.ndarray:
+        """Per-category average over the periods in a range that have spending"""
+        start, stop, _ = periods.indices(len(self.period_starts))
+        totals = self.cumulative_totals[stop] - self.cumulative_totals[start]
+        active = self.cumulative_active[stop] - self.cumulative_active[start]
+        return np.divide(totals, active, out=np.zeros_like(totals), where=active > 0)
+
+    def masked_averages(self, mask: np.ndarray) -> np.ndarray:
+        """Per-category average over the selected periods that have spending"""
+        totals = self.totals[mask].sum(axis=0)
+        active = (self.counts[mask] > 0).sum(axis=0)
+        return np.divide(totals, active, out=np.zeros_like(totals), where=active > 0)
+
+    def series(
+        self, category: str, mask: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Period starts and totals for one category, skipping periods without spending"""
+        column = self.category_index[category]
+        if mask is None:
+            mask = np.ones(len(self.period_starts), dtype=bool)
+        keep = mask & (self.counts[:, column] > 0)
+        return self.period_starts[keep], self.totals[keep, column]
+
+    def without_outliers(self, method: str, threshold: float) -> "SpendCube":
+        """
+        Cube keeping only transactions that are not outliers within their own
+        (period, category) cell under the given method (see OUTLIER_METHODS).
+        Each call is a binary search per cell over the presorted amounts.
+        Sketched cubes support only SKETCH_OUTLIER_METHODS.
+        """
+        if self._sorted_amounts is None:
+            if self.sketches is None:
+                return self
+            if method not in SKETCH_OUTLIER_METHODS:
+                raise ValueError(
+                    f"Outlier method {method} needs exact amounts; cubes built "
+                    f"with a sketch_compression support {SKETCH_OUTLIER_METHODS}"
+                )
+            return self._sketch_without_outliers(method, threshold)
+        if self._amount_index is None:
+            sizes = np.diff(self._group_starts)
+            self._amount_index = AmountIndex(
+                self._sorted_amounts,
+                np.repeat(np.arange(len(sizes)), sizes),
+                len(sizes),
+                presorted=True,
+            )
+
+        totals, counts = self._amount_index.kept_totals(method, threshold)
+        shape = self.totals.shape
+        return SpendCube(
+            self.period_starts,
+            self.categories,
+            totals.reshape(shape),
+            counts.reshape(shape),
+        )
+
+    def _knot_layout(self) -> dict[str, np.ndarray]:
+        """
+        Knots of every cell's sketch laid out back to back, built once. Each
+        cell's keys are scaled into [0, 1] and shifted by twice its position,
+        so a single np.interp call interpolates within every cell at once.
+        """
+        if self._sketch_knots is None:
+            cells = sorted(
+                cell for cell, sketch in self.sketches.items() if len(sketch.weights)
+            )
+            sketches = [self.sketches[cell] for cell in cells]
+            sizes = np.array([len(sketch.weights) for sketch in sketches], dtype=int)
+            weights = np.array([sketch.weights.sum() for sketch in sketches])
+            minimums = np.array([sketch.minimum for sketch in sketches])
+            maximums = np.array([sketch.maximum for sketch in sketches])
+            spans = maximums - minimums
+
+            knots = [sketch._knots() for sketch in sketches]
+            ranks = np.concatenate([ranks for ranks, _ in knots] or [np.zeros(0)])
+            values = np.concatenate([values for _, values in knots] or [np.zeros(0)])
+            edges = np.concatenate(
+                [np.concatenate([[0.0], np.cumsum(s.weights)]) for s in sketches]
+                or [np.zeros(0)]
+            )
+            sums = np.concatenate(
+                [
+                    np.concatenate([[0.0], np.cumsum(s.means * s.weights)])
+                    for s in sketches
+                ]
+                or [np.zeros(0)]
+            )
+
+            # Cell position of every knot (sizes + 2 with the min and max) and
+            # every centroid edge (sizes + 1)
+            knot_cell = np.repeat(np.arange(len(cells)), sizes + 2)
+            edge_cell = np.repeat(np.arange(len(cells)), sizes + 1)
+            value_scale = np.where(spans > 0, spans, 1.0)
+
+            self._sketch_knots = {
+                "cells": np.array(cells, dtype=np.int64),
+                "weights": weights,
+                "minimums": minimums,
+                "spans": spans,
+                "ranks": ranks,
+                "values": values,
+                "sums": sums,
+                "rank_keys": 2 * knot_cell + ranks / weights[knot_cell],
+                "value_keys": 2 * knot_cell
+                + (values - minimums[knot_cell]) / value_scale[knot_cell],
+                "edge_keys": 2 * edge_cell + edges / weights[edge_cell],
+            }
+        return self._sketch_knots
+
+    def _sketch_without_outliers(self, method: str, threshold: float) -> "SpendCube":
+        """
+        Approximate without_outliers from the per-cell quantile sketches,
+        evaluating every cell's cutoff, rank and sum in vectorized passes
+        """
+        layout = self._knot_layout()
+        cells = layout["cells"]
+        offsets = 2.0 * np.arange(len(cells))
+
+        def quantile(fraction: float) -> np.ndarray:
+            return np.interp(offsets + fraction, layout["rank_keys"], layout["values"])
+
+        if method == "percentile":
+            cutoffs = quantile(threshold / 100)
+        elif method == "iqr":
+            q1, q3 = quantile(0.25), quantile(0.75)
+            cutoffs = q3 + threshold * (q3 - q1)
+        else:
+            means = self.totals.ravel()[cells] / self.counts.ravel()[cells]
+            cutoffs = means * (1 + threshold / 100)
+
+        # Rank of each cutoff within its cell; cells of one repeated value
+        # keep all of it or none
+        weights, spans = layout["weights"], layout["spans"]
+        position = np.clip(
+            (cutoffs - layout["minimums"]) / np.where(spans > 0, spans, 1.0), 0, 1
+        )
+        ranks = np.interp(offsets + position, layout["value_keys"], layout["ranks"])
+        ranks = np.where(
+            spans > 0, ranks, np.where(cutoffs >= layout["minimums"], weights, 0.0)
+        )
+
+        # Sums are exact at centroid edges; spread each centroid evenly between them
+        kept = np.interp(offsets + ranks / weights, layout["edge_keys"], layout["sums"])
+
+        totals = np.zeros(self.totals.size)
+        counts = np.zeros(self.totals.size)
+        totals[cells] = kept
+        counts[cells] = ranks
+
+        shape = self.totals.shape
+        return SpendCube(
+            self.period_starts,
+            self.categories,
+            totals.reshape(shape),
+            np.rint(counts).astype(np.int64).reshape(shape),
+        )
+
+
+def build_spend_cube(
+    periods: list[PeriodData],
+    categories: list[str],
+    sketch_compression: int | None = None,
+) -> SpendCube:
+    """
+    Builds a SpendCube from a period list. This is the only pass over the
+    individual amounts; every later query works on the cube.
+
+    Args:
+        periods (list[PeriodData]): Contiguous periods for one granularity.
+        categories (list[str]): Category order for the cube columns.
+        sketch_compression (int, optional): When given, keep a quantile sketch
+            of this compression per cell instead of the sorted amounts.
+
+    Returns:
+        SpendCube: Totals, counts and per-cell sorted amounts or sketches.
+    """
+    category_count = len(categories)
+    category_index = {name: i for i, name in enumerate(categories)}
+    sizes = np.zeros(len(periods) * category_count, dtype=np.int64)
+    shape = (len(periods), category_count)
+    period_starts = np.array(
+        [period.start_date for period in periods], dtype="datetime64[D]"
+    )
+
+    if sketch_compression is not None:
+        totals = np.zeros(len(sizes))
+        sketches = {}
+        for period_index, period in enumerate(periods):
+            for category, cat_data in period.categories.items():
+                cell = period_index * category_count + category_index[category]
+                amounts = cat_data.amounts
+                sizes[cell] = len(amounts)
+                totals[cell] = amounts.sum()
+                sketches[cell] = QuantileSketch.from_values(amounts, sketch_compression)
+
+        return SpendCube(
+            period_starts=period_starts,
+            categories=categories,
+            totals=totals.reshape(shape),
+            counts=sizes.reshape(shape),
+            sketches=sketches,
+        )
+
+    cells = []
+    for period_index, period in enumerate(periods):
+        for category, cat_data in period.categories.items():
+            cell = period_index * category_count + category_index[category]
+            sizes[cell] = cat_data.count
+            cells.append((cell, np.sort(cat_data.amounts)))
+
+    # Lay the sorted amounts out cell by cell
+    cells.sort(key=lambda item: item[0])
+    sorted_amounts = (
+        np.concatenate([amounts for _, amounts in cells]) if cells else np.empty(0)
+    )
+    group_starts = np.concatenate([[0], np.cumsum(sizes)])
+    cell_of_amount = np.repeat(np.arange(len(sizes)), sizes)
+
+    return SpendCube(
+        period_starts=period_starts,
+        categories=categories,
+        totals=np.bincount(
+            cell_of_amount, weights=sorted_amounts, minlength=len(sizes)
+        ).reshape(shape),
+        counts=sizes.reshape(shape),
+        sorted_amounts=sorted_amounts,
+        group_starts=group_starts,
+    )
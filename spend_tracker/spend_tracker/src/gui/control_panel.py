@@ -16,6 +16,7 @@ class ControlsPanel(ctk.CTkFrame):
         on_year_change: Callable,
         on_month_change: Callable,
         years: List[int],
+        view_options: Dict[str, str],
     ):
         super().__init__(master, corner_radius=10)
 
@@ -26,6 +27,7 @@ class ControlsPanel(ctk.CTkFrame):
         self.on_year_change = on_year_change
         self.on_month_change = on_month_change
         self.years = years
+        self.view_options = view_options  # Granularity key -> display name
 
         # Setup UI
         self._setup_ui()
@@ -43,24 +45,14 @@ class ControlsPanel(ctk.CTkFrame):
 
         ctk.CTkLabel(period_frame, text="Time Period:").pack(side="left", padx=5)
 
-        self.view_var = ctk.StringVar(value="month")
-        month_radio = ctk.CTkRadioButton(
+        self.view_var = ctk.StringVar(value=self.view_options["month"])
+        view_dropdown = ctk.CTkOptionMenu(
             period_frame,
-            text="Monthly",
+            values=list(self.view_options.values()),
             variable=self.view_var,
-            value="month",
             command=self._handle_view_change,
         )
-        month_radio.pack(side="left", padx=10)
-
-        week_radio = ctk.CTkRadioButton(
-            period_frame,
-            text="Weekly",
-            variable=self.view_var,
-            value="week",
-            command=self._handle_view_change,
-        )
-        week_radio.pack(side="left", padx=10)
+        view_dropdown.pack(side="left", padx=5, fill="x", expand=True)
 
         # Overlay option
         overlay_frame = ctk.CTkFrame(self)
@@ -162,9 +154,12 @@ class ControlsPanel(ctk.CTkFrame):
         )
         month_dropdown.pack(side="left", padx=5, fill="x", expand=True)
 
-    def _handle_view_change(self):
+    def _handle_view_change(self, value):
         """Handle view mode change"""
-        self.on_view_change(self.view_var.get())
+        view_mode = next(
+            key for key, name in self.view_options.items() if name == value
+        )
+        self.on_view_change(view_mode)
 
     def _handle_total_toggle(self):
         """Handle total spending toggle"""
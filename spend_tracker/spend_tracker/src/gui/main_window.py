@@ -1,18 +1,35 @@
-from typing import List, Set
+from typing import List, Optional, Set
 
 import customtkinter as ctk
 
+from spend_tracker.src.data_mgr.incremental import (
+    REFRESH_INTERVAL_MS,
+    IncrementalLoader,
+)
+from spend_tracker.src.data_mgr.resample import GRANULARITIES
+from spend_tracker.src.data_mgr.result_cache import ResultCache
 from spend_tracker.src.util.classes import GraphableData
+from spend_tracker.src.util.startup_timer import StartupTimer
 from spend_tracker.src.gui.category_panel import CategoryPanel
 from spend_tracker.src.gui.control_panel import ControlsPanel, StatsPanel
-from spend_tracker.src.gui.plot_manager import PlotManager
+from spend_tracker.src.gui.plot_manager import PlotManager, PlotQuery
+from spend_tracker.src.widgets.compute_worker import ComputeWorker
+from spend_tracker.src.widgets.update_scheduler import UpdateScheduler
 
 
 class SpendingVisualizer(ctk.CTk):
     """Main window for the spending visualization application"""
 
-    def __init__(self, graphable_data: GraphableData):
+    def __init__(
+        self,
+        graphable_data: GraphableData,
+        startup_timer: Optional[StartupTimer] = None,
+        refresh_source: Optional[IncrementalLoader] = None,
+    ):
         super().__init__()
+        self.startup_timer = startup_timer  # Reported after the first draw
+        self.refresh_source = refresh_source  # Watched file for appended rows
+        self._refresh_id: Optional[str] = None
 
         # Initialize app appearance
         ctk.set_appearance_mode("system")  # Use system theme
@@ -24,7 +41,11 @@ class SpendingVisualizer(ctk.CTk):
 
         # Store data and initialize components
         self.graphable_data = graphable_data
+        self.scheduler = UpdateScheduler(self, self._update_display)
+        self.worker = ComputeWorker(self, on_busy=self._set_busy)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self._setup_ui()
+        self._schedule_refresh()
 
     def _setup_ui(self):
         """Setup the main UI layout"""
@@ -46,9 +67,15 @@ class SpendingVisualizer(ctk.CTk):
         plot_panel.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
 
         # Initialize the plot manager
-        self.plot_manager = PlotManager(plot_panel, self.graphable_data)
+        self.plot_manager = PlotManager(
+            plot_panel, self.graphable_data, result_cache=ResultCache()
+        )
         self.plot_manager.canvas_widget.pack(fill="both", expand=True, padx=5, pady=5)
 
+        # Shown while an update is computing in the background
+        self.busy_label = ctk.CTkLabel(plot_panel, text="")
+        self.busy_label.pack(side="bottom", anchor="e", padx=10)
+
         # Controls panel
         self.controls = ControlsPanel(
             left_panel,
@@ -59,6 +86,7 @@ class SpendingVisualizer(ctk.CTk):
             on_year_change=self._handle_year_change,
             on_month_change=self._handle_month_change,
             years=self.plot_manager.years,
+            view_options=GRANULARITIES,
         )
         self.controls.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
 
@@ -79,48 +107,125 @@ class SpendingVisualizer(ctk.CTk):
         self._update_display()
 
     def _handle_view_change(self, view_mode: str):
-        """Handle change between month/week view"""
+        """Handle change of period granularity"""
         self.plot_manager.view_mode = view_mode
-        self._update_display()
+        self.scheduler.request()
 
     def _handle_total_toggle(self, show_total: bool):
         """Handle toggling total spending view"""
         self.plot_manager.show_total = show_total
-        self._update_display()
+        self.scheduler.request()
 
     def _handle_outlier_change(self, threshold: int):
         """Handle outlier threshold change"""
         self.plot_manager.outlier_threshold = threshold
-        self._update_display()
+        self.scheduler.request()
 
     def _handle_overlay_toggle(self, overlay: bool):
         """Handle overlay toggle"""
         self.plot_manager.overlay_plots = overlay
-        self._update_display()
+        self.scheduler.request()
 
     def _handle_year_change(self, year: int):
         """Handle year selection change"""
         self.plot_manager.current_year_filter = year
-        self._update_display()
+        self.scheduler.request()
 
     def _handle_month_change(self, month: int):
         """Handle month selection change"""
         self.plot_manager.current_month_filter = month
-        self._update_display()
+        self.scheduler.request()
 
     def _handle_category_toggle(self, selected_categories: Set[str]):
         """Handle category visibility toggle"""
-        self.plot_manager.visible_categories = selected_categories
-        self._update_display()
+        # Copy, since the panel keeps mutating its set while a worker reads this
+        self.plot_manager.visible_categories = set(selected_categories)
+        self.scheduler.request()
 
     def _update_display(self):
+        """Recompute plot and statistics in the background, then display them"""
+        # Settings are captured here, on the Tk thread, so handlers changing
+        # them later can't affect a computation already under way
+        query = self.plot_manager.snapshot()
+        self.worker.submit(lambda: self._compute_display(query), self._show_display)
+
+    def _compute_display(self, query: PlotQuery):
+        """Aggregate everything the display needs (runs on the worker thread)"""
+        return (
+            self.plot_manager.prepare_plot(query),
+            self.plot_manager.calculate_averages(query),
+        )
+
+    def _show_display(self, result):
         """Update plot and statistics display"""
-        self.plot_manager.update_plot()
-        averages = self.plot_manager.calculate_averages()
+        plot_data, averages = result
+        self.plot_manager.draw_plot(plot_data)
         self.stats_panel.update_stats(averages)
 
+        # Queued behind the canvas's own idle redraw, so it runs after the paint
+        if self.startup_timer is not None:
+            self.after_idle(self._report_startup)
+
+    def _schedule_refresh(self):
+        """Check the watched file for appended rows again after an interval"""
+        if self.refresh_source is not None:
+            self._refresh_id = self.after(REFRESH_INTERVAL_MS, self._refresh)
+
+    def _refresh(self):
+        """Fold rows appended to the watched file into the data"""
+        self._schedule_refresh()
+
+        # Never supersede an update; the next interval tries again
+        if self.worker.busy:
+            return
+        source = self.refresh_source
+        self.worker.submit(
+            lambda: source.refresh(self.graphable_data),
+            self._show_refresh,
+            self._stop_refresh,
+        )
 
-def run_visualizer(graphable_data: GraphableData):
+    def _show_refresh(self, delta):
+        """Redraw once new transactions have been added"""
+        if len(delta):
+            self.scheduler.request()
+
+    def _stop_refresh(self, error: BaseException):
+        """Stop watching a file that can no longer be read incrementally"""
+        print(f"Stopped watching for new transactions: {error}")
+        self.refresh_source = None
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+            self._refresh_id = None
+
+    def _report_startup(self):
+        """Print the startup timing once the first display has been drawn"""
+        if self.startup_timer is None:
+            return  # Already reported by an earlier update
+
+        self.startup_timer.mark("first draw")
+        print(self.startup_timer.format_report())
+        self.startup_timer = None
+
+    def _set_busy(self, busy: bool):
+        """Show or hide the busy indicator"""
+        self.busy_label.configure(text="Updating..." if busy else "")
+        self.configure(cursor="watch" if busy else "")
+
+    def _on_close(self):
+        """Stop background work before closing the window"""
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+        self.scheduler.cancel()
+        self.worker.shutdown()
+        self.destroy()
+
+
+def run_visualizer(
+    graphable_data: GraphableData,
+    startup_timer: Optional[StartupTimer] = None,
+    refresh_source: Optional[IncrementalLoader] = None,
+):
     """Run the spending visualizer application"""
-    app = SpendingVisualizer(graphable_data)
+    app = SpendingVisualizer(graphable_data, startup_timer, refresh_source)
     app.mainloop()
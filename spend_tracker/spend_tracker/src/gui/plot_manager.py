@@ -1,25 +1,76 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib import colormaps
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 
-from spend_tracker.src.util.classes import CC_Transaction, GraphableData
+from spend_tracker.src.data_mgr.resample import GRANULARITIES
+from spend_tracker.src.data_mgr.result_cache import ResultCache
+from spend_tracker.src.data_mgr.spend_cube import SpendCube
+from spend_tracker.src.util.classes import GraphableData
+
+
+@dataclass(frozen=True)
+class PlotQuery:
+    """Plot settings captured once on the Tk thread
+
+    Computations on the worker thread read only the query, never the
+    manager's mutable settings, so cache keys and results always agree.
+    """
+
+    view_mode: str
+    method: str
+    threshold: float
+    show_total: bool
+    visible_categories: FrozenSet[str]
+    year_filter: Optional[int]
+    month_filter: Optional[int]
+
+    @property
+    def filtered(self) -> bool:
+        return self.threshold < 100
+
+
+@dataclass
+class PlotData:
+    """Series ready to draw: category lines in legend order, or a total line"""
+
+    lines: Dict[str, Tuple[np.ndarray, np.ndarray]]
+    view_mode: str
+    total: Optional[Tuple[np.ndarray, np.ndarray]] = None
 
 
 class PlotManager:
     """Manages the matplotlib plots and data processing for visualization"""
 
-    def __init__(self, master_frame, graphable_data: GraphableData):
+    def __init__(
+        self,
+        master_frame,
+        graphable_data: GraphableData,
+        result_cache: Optional[ResultCache] = None,
+    ):
         self.graphable_data = graphable_data
         self.master_frame = master_frame
+        self.result_cache = result_cache  # Persists cubes across sessions
+        self._cube_key: Optional[Tuple] = None
+        self._cube: Optional[SpendCube] = None
+
+        # Artists reused across redraws
+        self._lines: Dict[str, Line2D] = {}
+        self._total_line: Optional[Line2D] = None
+        self._legend_members: Optional[Tuple[str, ...]] = None
+        self._labelled_mode: Optional[str] = None
 
         # Create figure and canvas
         self.fig = Figure(figsize=(10, 6), dpi=100)
         self.ax = self.fig.add_subplot(111)
+        self.ax.xaxis_date()
+        self.ax.grid(True, linestyle="--", alpha=0.7)
         self.canvas = FigureCanvasTkAgg(self.fig, master=master_frame)
         self.canvas_widget = self.canvas.get_tk_widget()
 
@@ -28,7 +79,8 @@ class PlotManager:
 
         # Initialize plot settings
         self.outlier_threshold = 100  # Default: include all transactions
-        self.view_mode = "month"  # "month" or "week"
+        self.outlier_method = "percentile"  # Any of OUTLIER_METHODS
+        self.view_mode = "month"  # Any key of GRANULARITIES
         self.show_total = False
         self.overlay_plots = False
         self.visible_categories = set(self.all_categories)
@@ -45,189 +97,271 @@ class PlotManager:
 
     def _get_all_categories(self) -> List[str]:
         """Extract all unique categories from the data"""
-        categories = set()
-
-        for period in self.graphable_data.months:
-            categories.update(period.categories.keys())
-
-        return sorted(list(categories))
+        return sorted(self.graphable_data.store.categories)
 
     def _get_unique_years(self) -> List[int]:
-        """Get the unique years in the data"""
-        years = set()
-        for period in self.graphable_data.months:
-            years.add(period.start_date.year)
-        return sorted(list(years))
+        """Get the years spanned by the data"""
+        dates = self.graphable_data.store.dates
+        if not len(dates):
+            return []
+        first, last = (
+            np.array([dates.min(), dates.max()]).astype("datetime64[Y]").astype(int)
+            + 1970
+        ).tolist()
+        return list(range(first, last + 1))
 
     def _assign_category_colors(self) -> None:
         """Assign consistent colors to categories"""
         # Generate color map using a colormap
-        cmap = plt.cm.get_cmap("tab20", len(self.all_categories))
+        # (the colormap registry avoids importing pyplot and its backend setup)
+        cmap = colormaps["tab20"].resampled(max(len(self.all_categories), 1))
 
         for i, category in enumerate(self.all_categories):
             self.category_colors[category] = cmap(i)
 
-    def update_plot(self) -> None:
-        """Update the plot based on current settings"""
-        self.ax.clear()
+    def snapshot(self) -> PlotQuery:
+        """Capture the current settings for a computation on another thread"""
+        return PlotQuery(
+            view_mode=self.view_mode,
+            method=self.outlier_method,
+            threshold=self.outlier_threshold,
+            show_total=self.show_total,
+            visible_categories=frozenset(self.visible_categories),
+            year_filter=self.current_year_filter,
+            month_filter=self.current_month_filter,
+        )
+
+    def _get_cube(self, query: PlotQuery) -> SpendCube:
+        """Spend cube for a query's view with outlier filtering applied
+
+        The data lock is held only to snapshot the rows and to fetch the
+        unfiltered cube; hashing, filtering and cache I/O run without it
+        """
+        graphable_data = self.graphable_data
+        while True:
+            key = (
+                query.view_mode,
+                query.method if query.filtered else None,
+                query.threshold if query.filtered else 100,
+                graphable_data.generation,  # Appends invalidate the cube
+            )
+            if key == self._cube_key:
+                return self._cube
+
+            data = graphable_data.snapshot()
+            if data[0] != key[3]:
+                continue  # Appended since the key was taken
+
+            params = {
+                "view": "plot",
+                "granularity": key[0],
+                "method": key[1],
+                "threshold": key[2],
+                **graphable_data.cache_settings(),
+            }
+            stored = None
+            if self.result_cache is not None:
+                stored = self.result_cache.get(graphable_data.fingerprint(data), params)
+
+            if stored is not None:
+                # Year/month and category filters are applied to the cube when
+                # plotting
+                cube = SpendCube(
+                    stored["period_starts"],
+                    stored["categories"].tolist(),
+                    stored["totals"],
+                    stored["counts"],
+                )
+            else:
+                # The cube is built from period views that appends update in
+                # place, so it must come from the snapshot's generation
+                with graphable_data.lock:
+                    if graphable_data.generation != data[0]:
+                        continue  # Appended meanwhile; start over on the new rows
+                    cube = graphable_data.cube(query.view_mode)
+
+                if query.filtered:
+                    cube = cube.without_outliers(query.method, query.threshold)
+                if self.result_cache is not None:
+                    self.result_cache.put(
+                        graphable_data.fingerprint(data),
+                        params,
+                        {
+                            "period_starts": cube.period_starts,
+                            "categories": np.array(cube.categories, dtype=str),
+                            "totals": cube.totals,
+                            "counts": cube.counts,
+                        },
+                    )
+
+            self._cube_key, self._cube = key, cube
+            return cube
+
+    def prepare_plot(self, query: Optional[PlotQuery] = None) -> PlotData:
+        """Compute the series to plot for a snapshot of the settings
+
+        Touches no artists, so it can run on a worker thread
+        """
+        query = query or self.snapshot()
 
         # Get data based on current view mode
-        periods = (
-            self.graphable_data.months
-            if self.view_mode == "month"
-            else self.graphable_data.weeks
-        )
+        cube = self._get_cube(query)
 
         # Filter periods by year/month if specified
-        filtered_periods = self._filter_periods(periods)
+        period_mask = self._filter_periods(cube, query)
 
-        if self.show_total:
-            self._plot_total_spending(filtered_periods)
-        else:
-            self._plot_categories(filtered_periods)
+        if query.show_total:
+            return PlotData(
+                lines={},
+                view_mode=query.view_mode,
+                total=self._total_series(cube, period_mask, query),
+            )
+        return PlotData(
+            lines=self._category_series(cube, period_mask, query),
+            view_mode=query.view_mode,
+        )
+
+    def draw_plot(self, data: PlotData) -> None:
+        """Draw prepared series, on the Tk thread
+
+        Lines are created once per category and then updated in place, so a
+        redraw only touches data that changed instead of rebuilding the axes.
+        """
+        self._draw_categories(data.lines)
+        self._draw_total(data.total)
+
+        self._update_labels(data.view_mode)
+        self._update_legend(list(data.lines))
+
+        # Rescale to the visible lines and redraw when Tk is next idle
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
+    def _update_labels(self, view_mode: str) -> None:
+        """Set labels and date format, only when the view mode changed"""
+        if self._labelled_mode == view_mode:
+            return
+        self._labelled_mode = view_mode
 
-        # Set labels and format
         self.ax.set_ylabel("Spending ($)")
-        time_unit = "Month" if self.view_mode == "month" else "Week"
+        time_unit = GRANULARITIES[view_mode]
         self.ax.set_xlabel(f"{time_unit}")
         self.ax.set_title(f"Spending by {time_unit}")
 
         # Format x-axis dates
-        if self.view_mode == "month":
+        if view_mode not in ("day", "week"):
             self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %Y"))
         else:
             self.ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
 
         self.fig.autofmt_xdate()  # Rotate date labels
-        self.ax.grid(True, linestyle="--", alpha=0.7)
-
-        if not self.show_total and len(self.visible_categories) > 0:
-            self.ax.legend()
-
-        self.canvas.draw()
-
-    def _filter_periods(self, periods):
-        """Filter periods based on year and month filters"""
-        if not self.current_year_filter and not self.current_month_filter:
-            return periods
-
-        filtered = []
-        for period in periods:
-            include = True
-
-            if (
-                self.current_year_filter
-                and period.start_date.year != self.current_year_filter
-            ):
-                include = False
 
+    def _update_legend(self, shown: List[str]) -> None:
+        """Rebuild the legend, only when the plotted categories changed"""
+        members = tuple(shown)
+        if members == self._legend_members:
+            return
+        self._legend_members = members
+
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if members:
+            self.ax.legend(handles=[self._lines[category] for category in members])
+
+    def _line(self, category: str) -> Line2D:
+        """Persistent line for a category, created on first use"""
+        line = self._lines.get(category)
+        if line is None:
+            (line,) = self.ax.plot(
+                [], [], "o-", label=category, color=self.category_colors.get(category)
+            )
+            self._lines[category] = line
+        return line
+
+    def _filter_periods(self, cube: SpendCube, query: PlotQuery) -> np.ndarray:
+        """Mask of periods matching the year and month filters"""
+        return cube.period_mask(query.year_filter, query.month_filter)
+
+    def _category_series(
+        self, cube: SpendCube, period_mask: np.ndarray, query: PlotQuery
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Series of each visible category with data, in legend order"""
+        series = {}
+        for category in self.all_categories:
             if (
-                self.current_month_filter
-                and period.start_date.month != self.current_month_filter
+                category not in query.visible_categories
+                or category not in cube.category_index
             ):
-                include = False
-
-            if include:
-                filtered.append(period)
-
-        return filtered
-
-    def _plot_categories(self, periods):
-        """Plot each category as a separate line"""
-        # For each visible category
-        for category in self.visible_categories:
-            dates = []
-            values = []
-
-            # Collect data points
-            for period in periods:
-                if category in period.categories:
-                    cat_data = period.categories[category]
-
-                    # Apply outlier filtering if needed
-                    included_transactions = self._filter_outliers(cat_data.transactions)
-
-                    # Only include if we have transactions after filtering
-                    if included_transactions:
-                        period_total = sum(tx.amount for tx in included_transactions)
-                        dates.append(period.start_date)
-                        values.append(period_total)
-
-            # Plot if we have data points
-            if dates and values:
-                self.ax.plot(
-                    dates,
-                    values,
-                    "o-",
-                    label=category,
-                    color=self.category_colors.get(category),
-                )
-
-    def _plot_total_spending(self, periods):
-        """Plot the total spending across all visible categories"""
-        dates = []
-        totals = []
-
-        for period in periods:
-            period_total = 0
-            for category, cat_data in period.categories.items():
-                if category in self.visible_categories:
-                    # Apply outlier filtering
-                    included_transactions = self._filter_outliers(cat_data.transactions)
-                    period_total += sum(tx.amount for tx in included_transactions)
-
-            if period_total > 0:
-                dates.append(period.start_date)
-                totals.append(period_total)
-
-        if dates and totals:
-            self.ax.plot(dates, totals, "o-", color="blue", linewidth=2, label="Total")
-
-    def _filter_outliers(
-        self, transactions: List[CC_Transaction]
-    ) -> List[CC_Transaction]:
-        """Filter transactions based on outlier threshold"""
-        if self.outlier_threshold >= 100:
-            return transactions
-
-        # Calculate threshold values for this set of transactions
-        if not transactions:
-            return []
-
-        amounts = [tx.amount for tx in transactions]
-        threshold_value = np.percentile(amounts, self.outlier_threshold)
-
-        # Return transactions below the threshold
-        return [tx for tx in transactions if tx.amount <= threshold_value]
+                continue
+
+            # Periods with spending after outlier filtering
+            dates, values = cube.series(category, period_mask)
+            if len(dates):
+                series[category] = (mdates.date2num(dates), values)
+
+        return series
+
+    def _total_series(
+        self, cube: SpendCube, period_mask: np.ndarray, query: PlotQuery
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Series of the total spending across all visible categories"""
+        columns = [
+            cube.category_index[category]
+            for category in query.visible_categories
+            if category in cube.category_index
+        ]
+        totals = cube.totals[:, columns].sum(axis=1)
+        keep = period_mask & (totals > 0)
+        return mdates.date2num(cube.period_starts[keep]), totals[keep]
+
+    def _draw_categories(self, lines: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        """Show a line for each category series and hide the rest"""
+        for category, line in self._lines.items():
+            if category not in lines:
+                line.set_visible(False)
+
+        for category, (dates, values) in lines.items():
+            line = self._line(category)
+            line.set_data(dates, values)
+            line.set_visible(True)
+
+    def _draw_total(self, total: Optional[Tuple[np.ndarray, np.ndarray]]):
+        """Show the total spending line, or hide it if there is no total"""
+        if total is None or not len(total[0]):
+            if self._total_line is not None:
+                self._total_line.set_visible(False)
+            return
+
+        if self._total_line is None:
+            (self._total_line,) = self.ax.plot(
+                [], [], "o-", color="blue", linewidth=2, label="Total"
+            )
+        self._total_line.set_data(*total)
+        self._total_line.set_visible(True)
 
-    def calculate_averages(self) -> Dict[str, float]:
+    def calculate_averages(self, query: Optional[PlotQuery] = None) -> Dict[str, float]:
         """Calculate average spending for each visible category"""
-        averages = {}
-
-        for category in self.visible_categories:
-            periods = (
-                self.graphable_data.months
-                if self.view_mode == "month"
-                else self.graphable_data.weeks
+        query = query or self.snapshot()
+        cube = self._get_cube(query)
+
+        # Year-only filters are a contiguous run of periods, so prefix sums apply
+        if query.month_filter:
+            averages = cube.masked_averages(self._filter_periods(cube, query))
+        elif query.year_filter:
+            year = query.year_filter
+            averages = cube.range_averages(
+                cube.date_range(datetime(year, 1, 1), datetime(year, 12, 31))
             )
-            filtered_periods = self._filter_periods(periods)
-
-            total = 0
-            count = 0
-
-            for period in filtered_periods:
-                if category in period.categories:
-                    cat_data = period.categories[category]
-                    included_transactions = self._filter_outliers(cat_data.transactions)
-
-                    if included_transactions:
-                        period_total = sum(tx.amount for tx in included_transactions)
-                        total += period_total
-                        count += 1
-
-            if count > 0:
-                averages[category] = total / count
-            else:
-                averages[category] = 0
+        else:
+            averages = cube.range_averages()
 
-        return averages
+        return {
+            category: (
+                float(averages[cube.category_index[category]])
+                if category in cube.category_index
+                else 0
+            )
+            for category in query.visible_categories
+        }
@@ -1,97 +1,403 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 import numpy as np
 
-from spend_tracker.src.util.classes import CC_Transaction, GraphableData
+from spend_tracker.src.data_mgr.outlier_filter import AmountIndex
+from spend_tracker.src.data_mgr.result_cache import ResultCache
+from spend_tracker.src.util.classes import GraphableData, TransactionFrame
+
+# Maximum number of per-category results kept in the LRU cache
+CACHE_SIZE = 1024
+
+DateRange = Tuple[Optional[datetime], Optional[datetime]]
+# Generation and rows of GraphableData.snapshot()
+Snapshot = Tuple[int, TransactionFrame]
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    """Settings a table computation reads, captured once on the Tk thread
+
+    Computations on the worker thread read only the query, never the
+    manager's mutable settings, so cache keys and results always agree.
+    """
+
+    method: str
+    threshold: float
+    date_range: DateRange
+    categories: FrozenSet[str]
+
+    @property
+    def outlier_rule(self) -> Tuple[str, float]:
+        """Outlier method and threshold (a threshold of 100 keeps everything)"""
+        if self.threshold < 100:
+            return self.method, self.threshold
+        return "percentile", 100  # Cutoff at the maximum, nothing is an outlier
 
 
 class TableDataManager:
     """Manages data processing for tabular spending view"""
 
-    def __init__(self, graphable_data: GraphableData):
+    def __init__(
+        self,
+        graphable_data: GraphableData,
+        result_cache: Optional[ResultCache] = None,
+    ):
         self.graphable_data = graphable_data
+        self.result_cache = result_cache  # Persists results across sessions
         self.outlier_threshold = 100  # Default percentage (no filtering)
+        self.outlier_method = "mean"  # Any of OUTLIER_METHODS
+        self.date_range: DateRange = (None, None)
         self.visible_categories = self._get_all_categories()
 
+        # Per-category results keyed by (category, method, threshold, date range)
+        self._cache: "OrderedDict[Tuple, Optional[Dict]]" = OrderedDict()
+        self._cached_counts: Dict[str, int] = {}
+        self._cached_span: Optional[Tuple[int, int]] = None
+        # Amount index of the last date range queried, with its key
+        self._range_index_entry: Optional[Tuple[Tuple, Tuple]] = None
+
     def _get_all_categories(self) -> Set[str]:
         """Extract all unique categories from the data"""
-        categories = set()
+        return set(self.graphable_data.store.categories)
 
-        for period in self.graphable_data.months:
-            categories.update(period.categories.keys())
+    def snapshot(self) -> TableQuery:
+        """Capture the current settings for a computation on another thread"""
+        return TableQuery(
+            method=self.outlier_method,
+            threshold=self.outlier_threshold,
+            date_range=tuple(self.date_range),
+            categories=frozenset(self.visible_categories),
+        )
 
-        return categories
+    def _month_span(self, dates: np.ndarray) -> Optional[Tuple[int, int]]:
+        """First and last month ordinals covered by the dates"""
+        if not len(dates):
+            return None
+        months = np.array([dates.min(), dates.max()]).astype("datetime64[M]")
+        first, last = months.astype(np.int64).tolist()
+        return first, last
 
-    def _get_total_months_count(self) -> int:
-        """Get the total number of months in the dataset"""
-        if not self.graphable_data.months:
+    def _get_total_months_count(self, date_range: DateRange, dates: np.ndarray) -> int:
+        """Get the number of months in the dataset within the date range"""
+        span = self._month_span(dates)
+        if span is None:
             return 1  # Avoid division by zero
 
-        # Count unique months in the data
-        unique_months = set()
-        for month_period in self.graphable_data.months:
-            month_key = month_period.start_date.strftime("%Y-%m")
-            unique_months.add(month_key)
+        # Months of the data span that overlap the date range
+        first, last = span
+        start, end = date_range
+        if start is not None:
+            first = max(first, int(np.datetime64(start, "M").astype(np.int64)))
+        if end is not None:
+            last = min(last, int(np.datetime64(end, "M").astype(np.int64)))
+
+        return max(last - first + 1, 1)
+
+    def _cache_key(self, category: str, query: TableQuery) -> Tuple:
+        return (category, *query.outlier_rule, query.date_range)
+
+    def invalidate(self, categories: Optional[Iterable[str]] = None):
+        """Drop cached results for some categories, or for all of them"""
+        if categories is None:
+            self._cache.clear()
+            return
+
+        categories = set(categories)
+        for key in [key for key in self._cache if key[0] in categories]:
+            del self._cache[key]
+
+    def _sync_cache(self, counts: Dict[str, int], span: Optional[Tuple[int, int]]):
+        """Invalidate results made stale by transactions appended since caching"""
+        if span != self._cached_span:
+            # Every average is divided by a month count that depends on the span
+            self.invalidate()
+        else:
+            self.invalidate(
+                category
+                for category, count in counts.items()
+                if self._cached_counts.get(category) != count
+            )
+
+        self._cached_counts = counts
+        self._cached_span = span
+
+    def _range_index(
+        self, date_range: DateRange, data: Snapshot
+    ) -> Tuple[AmountIndex, Optional[np.ndarray]]:
+        """
+        Amount index of a data snapshot's rows in a date range, grouped by
+        category code
+        Returns (index, snapshot rows of the index's amounts, or None when the
+        index covers every row); the last range's index is reused
+        """
+        generation, frame = data
+        key = (date_range, generation)
+        entry = self._range_index_entry  # Read once, the worker may replace it
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        rows = None
+        amounts, codes = frame.amounts, frame.category_codes
+        if date_range != (None, None):
+            in_range = np.ones(len(frame), dtype=bool)
+            start, end = date_range
+            if start is not None:
+                in_range &= frame.dates >= np.datetime64(start, "D")
+            if end is not None:
+                in_range &= frame.dates <= np.datetime64(end, "D")
+            rows = np.flatnonzero(in_range)
+            amounts, codes = amounts[rows], codes[rows]
+
+        index = AmountIndex(amounts, codes, len(frame.categories))
+        self._range_index_entry = (key, (index, rows))
+        return index, rows
+
+    def _locate(
+        self, category: str, date_range: DateRange, data: Snapshot
+    ) -> Optional[Tuple[AmountIndex, int, Optional[np.ndarray]]]:
+        """
+        Amount index covering a category's rows in a date range
+        Returns (index, group, snapshot rows of the index's amounts or None),
+        or None if there are no rows
+        """
+        categories = data[1].categories
+        if category not in categories:
+            return None
+
+        code = categories.index(category)
+        index, rows = self._range_index(date_range, data)
+        if not index.sizes[code]:
+            return None
+        return index, code, rows
+
+    def _compute_categories(
+        self,
+        query: TableQuery,
+        categories: List[str],
+        total_months: int,
+        data: Snapshot,
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Monthly average and counts for several categories under a query,
+        from one kept-totals pass over every category
+        """
+        if not categories:
+            return {}
+
+        # Cutoffs come from the index, as in get_category_frames, so an amount
+        # at the cutoff lands on the same side in the table and the dialogs
+        index, _ = self._range_index(query.date_range, data)
+        totals, counts = index.kept_totals(*query.outlier_rule)
+        lookup = {name: code for code, name in enumerate(data[1].categories)}
+
+        results = {}
+        for category in categories:
+            code = lookup.get(category)
+            if code is None or not index.sizes[code]:
+                results[category] = None
+                continue
+
+            # Calculate monthly average by dividing by total months in the range
+            filtered_total = float(totals[code])
+            results[category] = {
+                "average": filtered_total / total_months,
+                "count": int(counts[code]),
+                "outlier_count": int(index.sizes[code] - counts[code]),
+                "total": filtered_total,
+            }
+        return results
+
+    def _query_params(self, query: TableQuery, categories: List[str]) -> Dict:
+        """Parameters identifying a table query in the persistent cache"""
+        method, threshold = query.outlier_rule
+        return {
+            "view": "table",
+            "method": method,
+            "threshold": threshold,
+            "date_range": list(query.date_range),
+            "categories": categories,
+            **self.graphable_data.cache_settings(),
+        }
+
+    def _load_persisted(
+        self, query: TableQuery, categories: List[str], data: Snapshot
+    ) -> bool:
+        """Fill the LRU from a result stored by an earlier session, if any"""
+        stored = self.result_cache.get(
+            self.graphable_data.fingerprint(data), self._query_params(query, categories)
+        )
+        if stored is None:
+            return False
 
-        return len(unique_months)
+        found = {}
+        for i, category in enumerate(stored["categories"].tolist()):
+            found[category] = {
+                "average": float(stored["average"][i]),
+                "count": int(stored["count"][i]),
+                "outlier_count": int(stored["outlier_count"][i]),
+                "total": float(stored["total"][i]),
+            }
+        for category in categories:
+            self._remember(self._cache_key(category, query), found.get(category))
+        return True
+
+    def _persist(
+        self,
+        query: TableQuery,
+        categories: List[str],
+        result: Dict[str, Dict],
+        data: Snapshot,
+    ):
+        """Store a table query result for later sessions"""
+        names = [category for category in categories if category in result]
+        self.result_cache.put(
+            self.graphable_data.fingerprint(data),
+            self._query_params(query, categories),
+            {
+                "categories": np.array(names, dtype=str),
+                **{
+                    field: np.array([result[name][field] for name in names])
+                    for field in ("average", "count", "outlier_count", "total")
+                },
+            },
+        )
 
-    def get_category_monthly_averages(self) -> Dict[str, Dict]:
+    def _remember(self, key: Tuple, value: Optional[Dict]):
+        self._cache[key] = value
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def get_category_monthly_averages(
+        self, query: Optional[TableQuery] = None
+    ) -> Dict[str, Dict]:
         """
         Calculate monthly averages for each category with outlier filtering
         Returns a dictionary with category stats including:
         - average: monthly average spending
-        - transactions: filtered transactions
-        - outliers: transactions removed as outliers
+        - count: number of transactions kept
+        - outlier_count: number of transactions removed as outliers
+        Results are cached per category; the categories missing from the cache
+        are computed together in one pass. Pass a snapshot() taken on the Tk
+        thread when calling from another thread; the LRU is meant for one
+        thread (the compute worker).
+        The data lock is only held to snapshot the rows and their counts;
+        computing and cache I/O run on the snapshot without it.
         """
-        result = {}
-        total_months = self._get_total_months_count()
+        query = query or self.snapshot()
+        with self.graphable_data.lock:
+            data = self.graphable_data.snapshot()
+            stats = self.graphable_data.category_stats
+            counts = dict(zip(stats.categories, stats.counts.tolist()))
 
-        # Process only visible categories
-        for category in self.visible_categories:
-            all_transactions = []
+        dates = data[1].dates
+        self._sync_cache(counts, self._month_span(dates))
+        total_months = self._get_total_months_count(query.date_range, dates)
+        categories = sorted(query.categories)
 
-            # Collect all transactions for this category
-            for month in self.graphable_data.months:
-                if category in month.categories:
-                    cat_data = month.categories[category]
-                    all_transactions.extend(cat_data.transactions)
+        # Try an earlier session's result before computing anything
+        missing = [
+            c for c in categories if self._cache_key(c, query) not in self._cache
+        ]
+        persisted = False
+        if missing and self.result_cache is not None:
+            persisted = self._load_persisted(query, categories, data)
 
-            # Skip if no transactions
-            if not all_transactions:
-                continue
+        # Compute everything the cache doesn't hold in one pass
+        computed = self._compute_categories(
+            query,
+            [c for c in missing if self._cache_key(c, query) not in self._cache],
+            total_months,
+            data,
+        )
 
-            # Calculate mean spending per transaction (for outlier detection)
-            amounts = [tx.amount for tx in all_transactions]
-            mean_amount = np.mean(amounts)
-
-            # Apply outlier threshold
-            if self.outlier_threshold < 100:
-                threshold_value = mean_amount * (1 + (self.outlier_threshold / 100))
-                filtered_transactions = [
-                    tx for tx in all_transactions if tx.amount <= threshold_value
-                ]
-                outliers = [
-                    tx for tx in all_transactions if tx.amount > threshold_value
-                ]
+        # Process only visible categories
+        result = {}
+        for category in categories:
+            key = self._cache_key(category, query)
+            if category in computed:
+                value = computed[category]
+                self._remember(key, value)
             else:
-                filtered_transactions = all_transactions
-                outliers = []
-
-            # Calculate monthly average by dividing by total months in dataset
-            filtered_total = sum(tx.amount for tx in filtered_transactions)
-            monthly_avg = filtered_total / total_months
-
-            # Store results
-            result[category] = {
-                "average": monthly_avg,
-                "transactions": filtered_transactions,
-                "outliers": outliers,
-                "total": filtered_total,
-            }
+                value = self._cache[key]
+                self._cache.move_to_end(key)
+
+            if value is not None:
+                result[category] = value
+
+        if missing and not persisted and self.result_cache is not None:
+            self._persist(query, categories, result, data)
 
         return result
 
+    def get_threshold_sweep(
+        self,
+        thresholds: Sequence[float] = range(101),
+        query: Optional[TableQuery] = None,
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Monthly average of each visible category at every threshold, computed in
+        one vectorized pass over the presorted amounts
+        Returns the thresholds and a curve per category, where curve[i] is what
+        get_category_monthly_averages would report at thresholds[i]
+        Computed on a snapshot of the data, so appends aren't held up
+        """
+        query = query or self.snapshot()
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        data = self.graphable_data.snapshot()
+        total_months = self._get_total_months_count(query.date_range, data[1].dates)
+
+        # Every category's curve comes from one sweep over the range's index
+        index, _ = self._range_index(query.date_range, data)
+        totals = None
+        curves = {}
+        for category in sorted(query.categories):
+            located = self._locate(category, query.date_range, data)
+            if located is None:
+                continue
+
+            if totals is None:
+                totals = self._sweep_totals(index, query, thresholds)
+            curves[category] = totals[:, located[1]] / total_months
+
+        return thresholds, curves
+
+    def _sweep_totals(
+        self, index: AmountIndex, query: TableQuery, thresholds: np.ndarray
+    ) -> np.ndarray:
+        """Kept totals of every group in an index at every threshold"""
+        totals, _ = index.kept_totals(query.method, thresholds)
+
+        # A threshold of 100 or more keeps everything
+        unfiltered, _ = index.kept_totals("percentile", 100)
+        totals[thresholds >= 100] = unfiltered
+        return totals
+
+    def get_category_frames(
+        self, category: str, query: Optional[TableQuery] = None
+    ) -> Tuple[TransactionFrame, TransactionFrame]:
+        """
+        Kept and outlier rows for one category at the current threshold
+        Only waits for the data lock while a snapshot of the rows is taken,
+        never for a computation, so dialogs stay responsive
+        """
+        query = query or self.snapshot()
+        data = self.graphable_data.snapshot()
+        located = self._locate(category, query.date_range, data)
+        if located is None:
+            return TransactionFrame.empty(), TransactionFrame.empty()
+
+        index, group, rows = located
+        kept, outliers = index.group_rows(group, *query.outlier_rule)
+        if rows is not None:
+            kept, outliers = rows[kept], rows[outliers]
+
+        frame = data[1]
+        return frame.take(kept), frame.take(outliers)
+
     def calculate_total_monthly_spend(self) -> float:
         """Calculate the total monthly spending across all visible categories"""
         category_data = self.get_category_monthly_averages()
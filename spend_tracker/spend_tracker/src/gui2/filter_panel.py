@@ -2,6 +2,8 @@ from typing import Callable, List, Set
 
 import customtkinter as ctk
 
+from spend_tracker.src.widgets.category_picker import CategoryPicker
+
 
 class FilterPanel(ctk.CTkFrame):
     """Panel for category selection and outlier filtering"""
@@ -18,8 +20,6 @@ class FilterPanel(ctk.CTkFrame):
         self.categories = sorted(categories)
         self.on_category_toggle = on_category_toggle
         self.on_outlier_change = on_outlier_change
-        self.selected_categories = set(categories)  # All selected by default
-        self.category_checkboxes = {}
 
         # Setup UI
         self._setup_ui()
@@ -60,45 +60,11 @@ class FilterPanel(ctk.CTkFrame):
             fill="x", padx=15, pady=(10, 0)
         )
 
-        # Scrollable frame for categories
-        categories_container = ctk.CTkScrollableFrame(self)
-        categories_container.pack(fill="both", expand=True, padx=10, pady=5)
-
-        # Create checkboxes for each category
-        for category in self.categories:
-            checkbox_var = ctk.BooleanVar(value=True)
-            checkbox = ctk.CTkCheckBox(
-                categories_container,
-                text=category,
-                variable=checkbox_var,
-                command=lambda cat=category, var=checkbox_var: self._toggle_category(
-                    cat, var.get()
-                ),
-            )
-            checkbox.pack(fill="x", padx=5, pady=2, anchor="w")
-            self.category_checkboxes[category] = (checkbox, checkbox_var)
-
-        # Select/Deselect all buttons
-        button_frame = ctk.CTkFrame(self)
-        button_frame.pack(fill="x", padx=10, pady=5)
-
-        ctk.CTkButton(button_frame, text="Select All", command=self.select_all).pack(
-            side="left", fill="x", expand=True, padx=2
+        # Searchable list that only creates widgets for visible categories
+        self.picker = CategoryPicker(
+            self, self.categories, on_change=self.on_category_toggle
         )
-
-        ctk.CTkButton(
-            button_frame, text="Deselect All", command=self.deselect_all
-        ).pack(side="right", fill="x", expand=True, padx=2)
-
-    def _toggle_category(self, category: str, is_selected: bool):
-        """Toggle a category's selection state"""
-        if is_selected:
-            self.selected_categories.add(category)
-        else:
-            self.selected_categories.discard(category)
-
-        # Notify parent
-        self.on_category_toggle(self.selected_categories)
+        self.picker.pack(fill="both", expand=True, padx=10, pady=5)
 
     def _handle_outlier_change(self):
         """Handle outlier threshold change"""
@@ -120,21 +86,14 @@ class FilterPanel(ctk.CTkFrame):
         self.outlier_var.set("100")
         self.on_outlier_change(100)
 
+    @property
+    def selected_categories(self) -> Set[str]:
+        return self.picker.selected_categories
+
     def select_all(self):
         """Select all categories"""
-        for category in self.categories:
-            checkbox, var = self.category_checkboxes[category]
-            var.set(True)
-            if category not in self.selected_categories:
-                self.selected_categories.add(category)
-
-        self.on_category_toggle(self.selected_categories)
+        self.picker.select_all()
 
     def deselect_all(self):
         """Deselect all categories"""
-        for category in self.categories:
-            checkbox, var = self.category_checkboxes[category]
-            var.set(False)
-
-        self.selected_categories.clear()
-        self.on_category_toggle(self.selected_categories)
+        self.picker.deselect_all()
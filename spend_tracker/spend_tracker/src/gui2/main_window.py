@@ -1,22 +1,39 @@
-from typing import Set
+from typing import Optional, Set
 
 import customtkinter as ctk
 
+from spend_tracker.src.data_mgr.incremental import (
+    REFRESH_INTERVAL_MS,
+    IncrementalLoader,
+)
+from spend_tracker.src.data_mgr.result_cache import ResultCache
 from spend_tracker.src.gui2.data_manager import TableDataManager
 from spend_tracker.src.gui2.filter_panel import FilterPanel
 from spend_tracker.src.gui2.table_view import (
     OutlierDialog,
+    SensitivityDialog,
     TableView,
     TransactionsDialog,
 )
 from spend_tracker.src.util.classes import CC_Transaction, GraphableData
+from spend_tracker.src.util.startup_timer import StartupTimer
+from spend_tracker.src.widgets.compute_worker import ComputeWorker
+from spend_tracker.src.widgets.update_scheduler import UpdateScheduler
 
 
 class SpendingTableView(ctk.CTk):
     """Main window for the spending table view application"""
 
-    def __init__(self, graphable_data: GraphableData):
+    def __init__(
+        self,
+        graphable_data: GraphableData,
+        startup_timer: Optional[StartupTimer] = None,
+        refresh_source: Optional[IncrementalLoader] = None,
+    ):
         super().__init__()
+        self.startup_timer = startup_timer  # Reported after the first draw
+        self.refresh_source = refresh_source  # Watched file for appended rows
+        self._refresh_id: Optional[str] = None
 
         # Initialize app appearance
         ctk.set_appearance_mode("system")  # Use system theme
@@ -28,7 +45,10 @@ class SpendingTableView(ctk.CTk):
 
         # Store data and initialize components
         self.graphable_data = graphable_data
-        self.data_manager = TableDataManager(graphable_data)
+        self.data_manager = TableDataManager(graphable_data, result_cache=ResultCache())
+        self.scheduler = UpdateScheduler(self, self._update_table)
+        self.worker = ComputeWorker(self, on_busy=self._set_busy)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Track open dialogs
         self.open_dialogs = []
@@ -38,6 +58,7 @@ class SpendingTableView(ctk.CTk):
 
         # Initial update
         self._update_table()
+        self._schedule_refresh()
 
     def _setup_ui(self):
         """Setup the main UI layout"""
@@ -85,6 +106,17 @@ class SpendingTableView(ctk.CTk):
         )
         self.yearly_total_label.pack(anchor="w", padx=10, pady=2)
 
+        # Shown while an update is computing in the background
+        self.busy_label = ctk.CTkLabel(self.summary_frame, text="")
+        self.busy_label.pack(anchor="w", padx=10, pady=2)
+
+        # Button to show how the averages respond to the outlier threshold
+        ctk.CTkButton(
+            self.summary_frame,
+            text="Threshold Sensitivity",
+            command=self._show_sensitivity_dialog,
+        ).pack(fill="x", padx=10, pady=(5, 10))
+
         # Table header
         ctk.CTkLabel(
             right_panel,
@@ -103,19 +135,29 @@ class SpendingTableView(ctk.CTk):
 
     def _handle_category_toggle(self, selected_categories: Set[str]):
         """Handle category selection changes"""
-        self.data_manager.visible_categories = selected_categories
-        self._update_table()
+        # Copy, since the panel keeps mutating its set while a worker reads this
+        self.data_manager.visible_categories = set(selected_categories)
+        self.scheduler.request()
 
     def _handle_outlier_change(self, threshold: int):
         """Handle outlier threshold changes"""
         self.data_manager.outlier_threshold = threshold
-        self._update_table()
+        self.scheduler.request()
 
     def _update_table(self):
-        """Update the table with current data and settings"""
+        """Recompute the table in the background, then display it"""
+        # Settings are captured here, on the Tk thread, so handlers changing
+        # them later can't affect a computation already under way
+        query = self.data_manager.snapshot()
+
         # Calculate current data with outlier filtering
-        categories_data = self.data_manager.get_category_monthly_averages()
+        self.worker.submit(
+            lambda: self.data_manager.get_category_monthly_averages(query),
+            self._show_table,
+        )
 
+    def _show_table(self, categories_data):
+        """Update the table with computed data"""
         # Update the table
         self.table_view.update_table(
             categories_data, self._show_outliers_dialog, self._show_transactions_dialog
@@ -131,60 +173,114 @@ class SpendingTableView(ctk.CTk):
             text=f"Yearly Projection: ${yearly_total:.2f}"
         )
 
+        # Runs once Tk has processed the pending geometry and redraws
+        if self.startup_timer is not None:
+            self.after_idle(self._report_startup)
+
+    def _schedule_refresh(self):
+        """Check the watched file for appended rows again after an interval"""
+        if self.refresh_source is not None:
+            self._refresh_id = self.after(REFRESH_INTERVAL_MS, self._refresh)
+
+    def _refresh(self):
+        """Fold rows appended to the watched file into the data"""
+        self._schedule_refresh()
+
+        # Never supersede an update; the next interval tries again
+        if self.worker.busy:
+            return
+        source = self.refresh_source
+        self.worker.submit(
+            lambda: source.refresh(self.graphable_data),
+            self._show_refresh,
+            self._stop_refresh,
+        )
+
+    def _show_refresh(self, delta):
+        """Redraw once new transactions have been added"""
+        if len(delta):
+            self.scheduler.request()
+
+    def _stop_refresh(self, error: BaseException):
+        """Stop watching a file that can no longer be read incrementally"""
+        print(f"Stopped watching for new transactions: {error}")
+        self.refresh_source = None
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+            self._refresh_id = None
+
+    def _report_startup(self):
+        """Print the startup timing once the first display has been drawn"""
+        if self.startup_timer is None:
+            return  # Already reported by an earlier update
+
+        self.startup_timer.mark("first draw")
+        print(self.startup_timer.format_report())
+        self.startup_timer = None
+
+    def _set_busy(self, busy: bool):
+        """Show or hide the busy indicator"""
+        self.busy_label.configure(text="Updating..." if busy else "")
+        self.configure(cursor="watch" if busy else "")
+
+    def _on_close(self):
+        """Stop background work before closing the window"""
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+        self.scheduler.cancel()
+        self.worker.shutdown()
+        self.destroy()
+
     def _show_outliers_dialog(self, category: str):
         """Show dialog with outlier transactions for a category"""
-        # Calculate current data to get outliers
-        categories_data = self.data_manager.get_category_monthly_averages()
-        total_months = self.data_manager._get_total_months_count()
-
-        if category in categories_data:
-            outliers = categories_data[category]["outliers"]
-
-            if outliers:
-                # Create and show dialog
-                from spend_tracker.src.gui2.table_view import TransactionsDialog
-
-                dialog = TransactionsDialog(
-                    self,
-                    category,
-                    outliers,
-                    is_outliers=True,
-                    total_months=total_months,
-                )
-                dialog.grab_set()  # Make dialog modal
-                self.open_dialogs.append(dialog)
-
-                # Clean up closed dialogs
-                self.open_dialogs = [d for d in self.open_dialogs if d.winfo_exists()]
-
-    def _show_transactions_dialog(self, category: str):
-        """Show dialog with regular transactions for a category"""
-        # Calculate current data to get transactions
-        categories_data = self.data_manager.get_category_monthly_averages()
-        total_months = self.data_manager._get_total_months_count()
+        # Rows stay columnar; the dialog only formats the ones on screen
+        _, outliers = self.data_manager.get_category_frames(category)
 
-        if category in categories_data:
-            transactions = categories_data[category]["transactions"]
+        if len(outliers):
+            # Create and show dialog
+            dialog = TransactionsDialog(self, category, outliers, is_outliers=True)
+            dialog.grab_set()  # Make dialog modal
+            self.open_dialogs.append(dialog)
 
-            if transactions:
-                # Create and show dialog
-                from spend_tracker.src.gui2.table_view import TransactionsDialog
+            # Clean up closed dialogs
+            self.open_dialogs = [d for d in self.open_dialogs if d.winfo_exists()]
 
-                dialog = TransactionsDialog(
-                    self,
-                    category,
-                    transactions,
-                    is_outliers=False,
-                    total_months=total_months,
-                )
-                dialog.grab_set()  # Make dialog modal
-                self.open_dialogs.append(dialog)
+    def _show_transactions_dialog(self, category: str):
+        """Show dialog with regular transactions for a category"""
+        # Rows stay columnar; the dialog only formats the ones on screen
+        transactions, _ = self.data_manager.get_category_frames(category)
+
+        if len(transactions):
+            # Create and show dialog
+            dialog = TransactionsDialog(self, category, transactions, is_outliers=False)
+            dialog.grab_set()  # Make dialog modal
+            self.open_dialogs.append(dialog)
+
+            # Clean up closed dialogs
+            self.open_dialogs = [d for d in self.open_dialogs if d.winfo_exists()]
+
+    def _show_sensitivity_dialog(self):
+        """Show how each category's average changes across the threshold range"""
+        thresholds, curves = self.data_manager.get_threshold_sweep()
+
+        dialog = SensitivityDialog(
+            self,
+            thresholds,
+            curves,
+            self.data_manager.outlier_threshold,
+            sorted(self.graphable_data.store.categories),
+        )
+        self.open_dialogs.append(dialog)
 
-                # Clean up closed dialogs
-                self.open_dialogs = [d for d in self.open_dialogs if d.winfo_exists()]
+        # Clean up closed dialogs
+        self.open_dialogs = [d for d in self.open_dialogs if d.winfo_exists()]
 
 
-def run_table_view(graphable_data: GraphableData):
+def run_table_view(
+    graphable_data: GraphableData,
+    startup_timer: Optional[StartupTimer] = None,
+    refresh_source: Optional[IncrementalLoader] = None,
+):
     """Run the spending table view application"""
-    app = SpendingTableView(graphable_data)
+    app = SpendingTableView(graphable_data, startup_timer, refresh_source)
     app.mainloop()
@@ -1,14 +1,16 @@
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Optional
 
 import customtkinter as ctk
+import numpy as np
 
-from spend_tracker.src.util.classes import CC_Transaction
+from spend_tracker.src.gui2.transaction_list import VirtualTransactionList
+from spend_tracker.src.util.classes import TransactionFrame
 
 
 class OutlierDialog(ctk.CTkToplevel):
     """Dialog to display outlier transactions"""
 
-    def __init__(self, parent, category: str, outliers: List[CC_Transaction]):
+    def __init__(self, parent, category: str, outliers: TransactionFrame):
         super().__init__(parent)
 
         # Configure dialog
@@ -19,7 +21,7 @@ class OutlierDialog(ctk.CTkToplevel):
         # Add components
         self._setup_ui(category, outliers)
 
-    def _setup_ui(self, category: str, outliers: List[CC_Transaction]):
+    def _setup_ui(self, category: str, outliers: TransactionFrame):
         """Setup the dialog UI"""
         # Title
         ctk.CTkLabel(
@@ -33,68 +35,31 @@ class OutlierDialog(ctk.CTkToplevel):
             self, text="These transactions were filtered out as outliers."
         ).pack(pady=(0, 10))
 
-        # Create table headers
-        table_frame = ctk.CTkFrame(self)
-        table_frame.pack(fill="both", expand=True, padx=10, pady=5)
-
-        # Scrollable frame for transactions
-        scrollable_frame = ctk.CTkScrollableFrame(table_frame)
-        scrollable_frame.pack(fill="both", expand=True)
-
-        # Create grid for table
-        scrollable_frame.columnconfigure(0, weight=2)  # Date
-        scrollable_frame.columnconfigure(1, weight=5)  # Description
-        scrollable_frame.columnconfigure(2, weight=1)  # Amount
-
-        # Headers
-        ctk.CTkLabel(
-            scrollable_frame, text="Date", font=ctk.CTkFont(weight="bold")
-        ).grid(row=0, column=0, sticky="w", padx=5, pady=2)
-
-        ctk.CTkLabel(
-            scrollable_frame, text="Description", font=ctk.CTkFont(weight="bold")
-        ).grid(row=0, column=1, sticky="w", padx=5, pady=2)
-
-        ctk.CTkLabel(
-            scrollable_frame, text="Amount", font=ctk.CTkFont(weight="bold")
-        ).grid(row=0, column=2, sticky="e", padx=5, pady=2)
-
-        # Separator
-        separator = ctk.CTkFrame(scrollable_frame, height=1, fg_color="gray")
-        separator.grid(row=1, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
-
-        # Add data rows
-        sorted_outliers = sorted(outliers, key=lambda tx: tx.amount, reverse=True)
-
-        for i, tx in enumerate(sorted_outliers):
-            row = i + 2  # +2 for header and separator
-
-            # Date
-            ctk.CTkLabel(scrollable_frame, text=tx.date.strftime("%Y-%m-%d")).grid(
-                row=row, column=0, sticky="w", padx=5, pady=2
-            )
-
-            # Description
-            ctk.CTkLabel(scrollable_frame, text=tx.description).grid(
-                row=row, column=1, sticky="w", padx=5, pady=2
-            )
-
-            # Amount
-            ctk.CTkLabel(scrollable_frame, text=f"${tx.amount:.2f}").grid(
-                row=row, column=2, sticky="e", padx=5, pady=2
-            )
+        # Largest outliers first; only visible rows get widgets
+        VirtualTransactionList(self, outliers, sort_key="amount", descending=True).pack(
+            fill="both", expand=True, padx=10, pady=5
+        )
 
         # Close button
         ctk.CTkButton(self, text="Close", command=self.destroy).pack(pady=10)
 
 
 class TableView(ctk.CTkFrame):
-    """Table view for category spending data"""
+    """Table view for category spending data
+
+    Row widgets are pooled by category and updated in place, so a filter
+    change only creates or destroys the rows of categories that appeared or
+    disappeared.
+    """
 
     def __init__(self, master):
         super().__init__(master)
 
         self.categories_data = {}
+        self.show_outliers_callback: Optional[Callable] = None
+        self.show_transactions_callback: Optional[Callable] = None
+        self._rows: Dict[str, TableRow] = {}
+        self._row_positions: Dict[str, int] = {}
         self._setup_ui()
 
     def _setup_ui(self):
@@ -110,6 +75,7 @@ class TableView(ctk.CTkFrame):
 
         # Table headers
         self._create_headers()
+        self._create_footer()
 
     def _create_headers(self):
         """Create table headers"""
@@ -134,6 +100,36 @@ class TableView(ctk.CTkFrame):
         separator = ctk.CTkFrame(self.table_container, height=1, fg_color="gray")
         separator.grid(row=1, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
 
+    def _create_footer(self):
+        """Create the empty message and total rows, gridded by update_table"""
+        self.empty_label = ctk.CTkLabel(
+            self.table_container, text="No data to display."
+        )
+
+        # Separator before total
+        self.total_separator = ctk.CTkFrame(
+            self.table_container, height=1, fg_color="gray"
+        )
+
+        # Total label and monthly amount
+        self.total_label = ctk.CTkLabel(
+            self.table_container, text="MONTHLY TOTAL", font=ctk.CTkFont(weight="bold")
+        )
+        self.total_value = ctk.CTkLabel(
+            self.table_container, text="", font=ctk.CTkFont(weight="bold")
+        )
+
+        # Yearly projection label and amount
+        self.yearly_label = ctk.CTkLabel(
+            self.table_container,
+            text="YEARLY PROJECTION",
+            font=ctk.CTkFont(weight="bold"),
+        )
+        self.yearly_value = ctk.CTkLabel(
+            self.table_container, text="", font=ctk.CTkFont(weight="bold")
+        )
+        self._footer_row: Optional[int] = None
+
     def update_table(
         self,
         categories_data: Dict[str, Dict],
@@ -141,105 +137,127 @@ class TableView(ctk.CTkFrame):
         show_transactions_callback: Callable,
     ):
         """Update the table with new data"""
+        previous = self.categories_data
         self.categories_data = categories_data
+        self.show_outliers_callback = show_outliers_callback
+        self.show_transactions_callback = show_transactions_callback
 
-        # Clear existing table rows (preserve headers)
-        for widget in self.table_container.winfo_children():
-            grid_info = widget.grid_info()
-            if grid_info and int(grid_info["row"]) >= 2:
-                widget.destroy()
+        # Destroy rows of categories that are no longer shown
+        for category in [c for c in self._rows if c not in categories_data]:
+            self._rows.pop(category).destroy()
+            del self._row_positions[category]
 
         # Handle empty data case
         if not categories_data:
-            ctk.CTkLabel(self.table_container, text="No data to display.").grid(
-                row=2, column=0, columnspan=3, pady=20
-            )
+            self._grid_footer(None)
             return
 
-        # Add data rows
         sorted_categories = sorted(
             categories_data.items(), key=lambda x: x[1]["average"], reverse=True
         )
 
-        # Add data rows
         for i, (category, data) in enumerate(sorted_categories):
-            row = i + 2  # +2 for header and separator
-
-            # Category name
-            ctk.CTkLabel(self.table_container, text=category).grid(
-                row=row, column=0, sticky="w", padx=5, pady=5
-            )
-
-            # Monthly average with transaction count
-            tx_count = len(data["transactions"])
-            avg_text = f"${data['average']:.2f} ({tx_count} transactions)"
-            ctk.CTkLabel(self.table_container, text=avg_text).grid(
-                row=row, column=1, sticky="w", padx=5, pady=5
-            )
-
-            # Actions frame for buttons
-            actions_frame = ctk.CTkFrame(self.table_container)
-            actions_frame.grid(row=row, column=2, padx=5, pady=2)
-
-            # Button to view regular transactions
-            transactions_button = ctk.CTkButton(
-                actions_frame,
-                text="Transactions",
-                width=95,
-                command=lambda cat=category: show_transactions_callback(cat),
-            )
-            transactions_button.pack(side="left", padx=2, pady=2)
-
-            # Button to view outlier transactions
-            has_outliers = len(data["outliers"]) > 0
-            outlier_button = ctk.CTkButton(
-                actions_frame,
-                text="Outliers",
-                width=80,
-                state="normal" if has_outliers else "disabled",
-                command=lambda cat=category: show_outliers_callback(cat),
-            )
-            outlier_button.pack(side="right", padx=2, pady=2)
-
-        # Add total row
-        total_row = len(sorted_categories) + 2
+            row = self._rows.get(category)
+            if row is None:
+                row = self._rows[category] = TableRow(self, category)
+                row.update(data)
+            elif previous.get(category) != data:
+                row.update(data)
+
+            # Move only the rows whose position changed
+            position = i + 2  # +2 for header and separator
+            if self._row_positions.get(category) != position:
+                row.grid(position)
+                self._row_positions[category] = position
+
+        # Totals follow the last row
+        self._grid_footer(len(sorted_categories) + 2)
+        total_avg = sum(data["average"] for _, data in sorted_categories)
+        self.total_value.configure(text=f"${total_avg:.2f}")
+        self.yearly_value.configure(text=f"${total_avg * 12:.2f}")
 
-        # Separator before total
-        separator = ctk.CTkFrame(self.table_container, height=1, fg_color="gray")
-        separator.grid(
+    def _grid_footer(self, total_row: Optional[int]):
+        """Place the total rows at total_row, or show the empty message if None"""
+        if total_row == self._footer_row:
+            return
+        self._footer_row = total_row
+
+        if total_row is None:
+            for widget in self._footer_widgets():
+                widget.grid_remove()
+            self.empty_label.grid(row=2, column=0, columnspan=3, pady=20)
+            return
+
+        self.empty_label.grid_remove()
+        self.total_separator.grid(
             row=total_row, column=0, columnspan=3, sticky="ew", padx=5, pady=5
         )
+        self.total_label.grid(row=total_row + 1, column=0, sticky="w", padx=5, pady=5)
+        self.total_value.grid(row=total_row + 1, column=1, sticky="w", padx=5, pady=5)
+        self.yearly_label.grid(row=total_row + 2, column=0, sticky="w", padx=5, pady=5)
+        self.yearly_value.grid(row=total_row + 2, column=1, sticky="w", padx=5, pady=5)
+
+    def _footer_widgets(self):
+        return (
+            self.total_separator,
+            self.total_label,
+            self.total_value,
+            self.yearly_label,
+            self.yearly_value,
+        )
 
-        # Calculate total monthly average
-        total_avg = sum(data["average"] for _, data in sorted_categories)
 
-        # Total label
-        ctk.CTkLabel(
-            self.table_container, text="MONTHLY TOTAL", font=ctk.CTkFont(weight="bold")
-        ).grid(row=total_row + 1, column=0, sticky="w", padx=5, pady=5)
+class TableRow:
+    """Widgets of one category's table row"""
 
-        # Total monthly amount
-        ctk.CTkLabel(
-            self.table_container,
-            text=f"${total_avg:.2f}",
-            font=ctk.CTkFont(weight="bold"),
-        ).grid(row=total_row + 1, column=1, sticky="w", padx=5, pady=5)
+    def __init__(self, table: TableView, category: str):
+        container = table.table_container
 
-        # Add yearly projection
-        yearly_projection = total_avg * 12
+        # Category name
+        self.name_label = ctk.CTkLabel(container, text=category)
 
-        ctk.CTkLabel(
-            self.table_container,
-            text="YEARLY PROJECTION",
-            font=ctk.CTkFont(weight="bold"),
-        ).grid(row=total_row + 2, column=0, sticky="w", padx=5, pady=5)
+        # Monthly average with transaction count
+        self.average_label = ctk.CTkLabel(container, text="")
 
-        # Yearly amount
-        ctk.CTkLabel(
-            self.table_container,
-            text=f"${yearly_projection:.2f}",
-            font=ctk.CTkFont(weight="bold"),
-        ).grid(row=total_row + 2, column=1, sticky="w", padx=5, pady=5)
+        # Actions frame for buttons
+        self.actions_frame = ctk.CTkFrame(container)
+
+        # Button to view regular transactions; callbacks are looked up on
+        # click since the table may be given new ones
+        ctk.CTkButton(
+            self.actions_frame,
+            text="Transactions",
+            width=95,
+            command=lambda: table.show_transactions_callback(category),
+        ).pack(side="left", padx=2, pady=2)
+
+        # Button to view outlier transactions
+        self.outlier_button = ctk.CTkButton(
+            self.actions_frame,
+            text="Outliers",
+            width=80,
+            command=lambda: table.show_outliers_callback(category),
+        )
+        self.outlier_button.pack(side="right", padx=2, pady=2)
+
+    def update(self, data: Dict):
+        """Show new figures for the category"""
+        tx_count = data["count"]
+        avg_text = f"${data['average']:.2f} ({tx_count} transactions)"
+        self.average_label.configure(text=avg_text)
+
+        has_outliers = data["outlier_count"] > 0
+        self.outlier_button.configure(state="normal" if has_outliers else "disabled")
+
+    def grid(self, row: int):
+        """Place the row's widgets on a grid row"""
+        self.name_label.grid(row=row, column=0, sticky="w", padx=5, pady=5)
+        self.average_label.grid(row=row, column=1, sticky="w", padx=5, pady=5)
+        self.actions_frame.grid(row=row, column=2, padx=5, pady=2)
+
+    def destroy(self):
+        for widget in (self.name_label, self.average_label, self.actions_frame):
+            widget.destroy()
 
 
 class TransactionsDialog(ctk.CTkToplevel):
@@ -249,7 +267,7 @@ class TransactionsDialog(ctk.CTkToplevel):
         self,
         parent,
         category: str,
-        transactions: List[CC_Transaction],
+        transactions: TransactionFrame,
         is_outliers: bool = False,
     ):
         super().__init__(parent)
@@ -263,7 +281,7 @@ class TransactionsDialog(ctk.CTkToplevel):
         self._setup_ui(category, transactions, is_outliers)
 
     def _setup_ui(
-        self, category: str, transactions: List[CC_Transaction], is_outliers: bool
+        self, category: str, transactions: TransactionFrame, is_outliers: bool
     ):
         """Setup the dialog UI"""
         # Title
@@ -282,60 +300,10 @@ class TransactionsDialog(ctk.CTkToplevel):
         )
         ctk.CTkLabel(self, text=description).pack(pady=(0, 10))
 
-        # Create table frame
-        table_frame = ctk.CTkFrame(self)
-        table_frame.pack(fill="both", expand=True, padx=10, pady=5)
-
-        # Scrollable frame for transactions
-        scrollable_frame = ctk.CTkScrollableFrame(table_frame)
-        scrollable_frame.pack(fill="both", expand=True)
-
-        # Create grid for table
-        scrollable_frame.columnconfigure(0, weight=2)  # Date
-        scrollable_frame.columnconfigure(1, weight=5)  # Description
-        scrollable_frame.columnconfigure(2, weight=1)  # Amount
-
-        # Headers
-        ctk.CTkLabel(
-            scrollable_frame, text="Date", font=ctk.CTkFont(weight="bold")
-        ).grid(row=0, column=0, sticky="w", padx=5, pady=2)
-
-        ctk.CTkLabel(
-            scrollable_frame, text="Description", font=ctk.CTkFont(weight="bold")
-        ).grid(row=0, column=1, sticky="w", padx=5, pady=2)
-
-        ctk.CTkLabel(
-            scrollable_frame, text="Amount", font=ctk.CTkFont(weight="bold")
-        ).grid(row=0, column=2, sticky="e", padx=5, pady=2)
-
-        # Separator
-        separator = ctk.CTkFrame(scrollable_frame, height=1, fg_color="gray")
-        separator.grid(row=1, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
-
         # Sort transactions by amount (descending for outliers, ascending for regular)
-        sort_reverse = is_outliers
-        sorted_transactions = sorted(
-            transactions, key=lambda tx: tx.amount, reverse=sort_reverse
-        )
-
-        # Add data rows
-        for i, tx in enumerate(sorted_transactions):
-            row = i + 2  # +2 for header and separator
-
-            # Date
-            ctk.CTkLabel(scrollable_frame, text=tx.date.strftime("%Y-%m-%d")).grid(
-                row=row, column=0, sticky="w", padx=5, pady=2
-            )
-
-            # Description
-            ctk.CTkLabel(scrollable_frame, text=tx.description).grid(
-                row=row, column=1, sticky="w", padx=5, pady=2
-            )
-
-            # Amount
-            ctk.CTkLabel(scrollable_frame, text=f"${tx.amount:.2f}").grid(
-                row=row, column=2, sticky="e", padx=5, pady=2
-            )
+        VirtualTransactionList(
+            self, transactions, sort_key="amount", descending=is_outliers
+        ).pack(fill="both", expand=True, padx=10, pady=5)
 
         # Summary section
         summary_frame = ctk.CTkFrame(self)
@@ -347,10 +315,100 @@ class TransactionsDialog(ctk.CTkToplevel):
         ).pack(side="left", padx=10)
 
         # Total amount
-        total_amount = sum(tx.amount for tx in transactions)
+        total_amount = transactions.amounts_cents.sum() / 100
         ctk.CTkLabel(summary_frame, text=f"Total amount: ${total_amount:.2f}").pack(
             side="left", padx=10
         )
 
         # Close button
         ctk.CTkButton(self, text="Close", command=self.destroy).pack(pady=10)
+
+
+class SensitivityDialog(ctk.CTkToplevel):
+    """Dialog plotting monthly averages against the outlier threshold"""
+
+    def __init__(
+        self,
+        parent,
+        thresholds: np.ndarray,
+        curves: Dict[str, np.ndarray],
+        current_threshold: float,
+        all_categories: List[str],
+    ):
+        super().__init__(parent)
+
+        # Configure dialog
+        self.title("Threshold Sensitivity")
+        self.geometry("820x560")
+        self.resizable(True, True)
+
+        # Add components
+        self.all_categories = all_categories
+        self._setup_ui(thresholds, curves, current_threshold)
+
+    def _setup_ui(
+        self,
+        thresholds: np.ndarray,
+        curves: Dict[str, np.ndarray],
+        current_threshold: float,
+    ):
+        """Setup the dialog UI"""
+        # matplotlib is only imported once the dialog is opened, so it stays off
+        # the table view's startup path
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        # Title
+        ctk.CTkLabel(
+            self,
+            text="Monthly Average vs Outlier Threshold",
+            font=ctk.CTkFont(size=16, weight="bold"),
+        ).pack(pady=(10, 5))
+
+        ctk.CTkLabel(
+            self, text="The dashed line marks the threshold currently applied."
+        ).pack(pady=(0, 10))
+
+        self.fig = Figure(figsize=(8, 4.5), dpi=100)
+        ax = self.fig.add_subplot(111)
+        if not curves:
+            ax.text(0.5, 0.5, "No data to display.", ha="center", va="center")
+            ax.set_axis_off()
+        else:
+            self._plot_curves(ax, thresholds, curves, current_threshold)
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
+        self.canvas.draw_idle()
+
+        # Close button
+        ctk.CTkButton(self, text="Close", command=self.destroy).pack(pady=10)
+
+    def _plot_curves(
+        self,
+        ax,
+        thresholds: np.ndarray,
+        curves: Dict[str, np.ndarray],
+        current_threshold: float,
+    ):
+        """Plot one line per category plus the current threshold marker"""
+        from matplotlib import colormaps
+
+        # Same colors as the plot window: assigned over every category in name
+        # order, so a category keeps its color whichever ones are visible
+        cmap = colormaps["tab20"].resampled(max(len(self.all_categories), 1))
+        colors = {
+            category: cmap(i) for i, category in enumerate(self.all_categories)
+        }
+
+        # Curves, largest first so the legend matches the table order
+        ordered = sorted(curves.items(), key=lambda item: item[1][-1], reverse=True)
+        for category, curve in ordered:
+            ax.plot(thresholds, curve, color=colors[category], label=category)
+
+        ax.axvline(current_threshold, color="gray", linestyle="--")
+        ax.set_xlabel("Outlier threshold (%)")
+        ax.set_ylabel("Monthly average ($)")
+        ax.grid(True, linestyle="--", alpha=0.7)
+        ax.legend(loc="upper left", bbox_to_anchor=(1.01, 1), fontsize="small")
+        self.fig.tight_layout()
@@ -0,0 +1,197 @@
+from typing import Dict, List, Tuple
+
+import customtkinter as ctk
+import numpy as np
+
+from spend_tracker.src.util.classes import TransactionFrame
+
+ROW_HEIGHT = 28  # Pixels per row, the default CTkLabel height
+SORT_KEYS = ("date", "description", "amount")
+
+
+class VirtualTransactionList(ctk.CTkFrame):
+    """Scrollable transaction table that only creates widgets for visible rows
+
+    A fixed pool of row labels, sized to the window rather than the data, is
+    refilled from the frame whenever the view scrolls or is re-sorted, so
+    opening the list costs the same for ten transactions or a hundred
+    thousand. Each sort key's order is computed once with numpy and reused;
+    descending order is a reversed view of the same indices.
+    """
+
+    def __init__(
+        self,
+        master,
+        frame: TransactionFrame,
+        sort_key: str = "amount",
+        descending: bool = False,
+    ):
+        super().__init__(master)
+
+        self.frame = frame
+        self.sort_key = sort_key
+        self.descending = descending
+        self.first = 0  # Index (in sorted order) of the top visible row
+        self._visible_slots = 0  # Pooled rows that fit in the window
+        self._sort_indices: Dict[str, np.ndarray] = {}
+        self._rows: List[Tuple[ctk.CTkLabel, ctk.CTkLabel, ctk.CTkLabel]] = []
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Setup the header, row area and scrollbar"""
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        # Headers double as sort buttons
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.grid(row=0, column=0, columnspan=2, sticky="ew")
+        self.header_buttons = {}
+        for column, key in enumerate(SORT_KEYS):
+            header.columnconfigure(column, weight=(2, 5, 1)[column])
+            button = ctk.CTkButton(
+                header,
+                text=key.title(),
+                font=ctk.CTkFont(weight="bold"),
+                fg_color="transparent",
+                text_color=("black", "white"),
+                anchor="e" if key == "amount" else "w",
+                command=lambda key=key: self.sort_by(key),
+            )
+            button.grid(row=0, column=column, sticky="ew", padx=5, pady=2)
+            self.header_buttons[key] = button
+
+        # Row area; its size comes from the window, never from the rows
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=1, column=0, sticky="nsew")
+        self.body.grid_propagate(False)
+        self.body.columnconfigure(0, weight=2)  # Date
+        self.body.columnconfigure(1, weight=5)  # Description
+        self.body.columnconfigure(2, weight=1)  # Amount
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.body.bind("<Configure>", lambda event: self._resize(event.height))
+        self._bind_wheel(self.body)
+
+        if not len(self.frame):
+            ctk.CTkLabel(self.body, text="No transactions to display.").grid(
+                row=0, column=0, columnspan=3, pady=20
+            )
+
+        self._update_headers()
+
+    def _bind_wheel(self, widget):
+        """Scroll on mouse wheel (Windows/macOS) and buttons 4/5 (X11)"""
+        widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self.scroll(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll(1))
+
+    @property
+    def visible_count(self) -> int:
+        return self._visible_slots
+
+    def _resize(self, height: int):
+        """Grow the row pool to fill the available height"""
+        if not len(self.frame):
+            return
+
+        needed = min(max(height // ROW_HEIGHT, 1), len(self.frame))
+        while len(self._rows) < needed:
+            row = len(self._rows)
+            labels = (
+                ctk.CTkLabel(self.body, text="", anchor="w"),
+                ctk.CTkLabel(self.body, text="", anchor="w"),
+                ctk.CTkLabel(self.body, text="", anchor="e"),
+            )
+            for column, label in enumerate(labels):
+                label.grid(
+                    row=row, column=column, sticky="e" if column == 2 else "w", padx=5
+                )
+                self._bind_wheel(label)
+            self._rows.append(labels)
+
+        # Rows beyond the window stay pooled but hidden
+        for row, labels in enumerate(self._rows):
+            for label in labels:
+                if row < needed:
+                    label.grid()
+                else:
+                    label.grid_remove()
+
+        self._visible_slots = needed
+        self._render()
+
+    def _order(self) -> np.ndarray:
+        """Row indices of the frame in the current sort order"""
+        order = self._sort_indices.get(self.sort_key)
+        if order is None:
+            if self.sort_key == "date":
+                values = self.frame.dates
+            elif self.sort_key == "amount":
+                values = self.frame.amounts_cents
+            else:
+                values = np.array(
+                    [str(text).lower() for text in self.frame.descriptions]
+                )
+            order = np.argsort(values, kind="stable")
+            self._sort_indices[self.sort_key] = order
+
+        return order[::-1] if self.descending else order
+
+    def _render(self):
+        """Fill the pooled rows with the transactions now in view"""
+        count = self._visible_slots
+        self.first = min(max(self.first, 0), max(len(self.frame) - count, 0))
+        indices = self._order()[self.first : self.first + count]
+
+        # Format only the rows on screen
+        dates = np.datetime_as_string(self.frame.dates[indices], unit="D").tolist()
+        amounts = (self.frame.amounts_cents[indices] / 100).tolist()
+        descriptions = self.frame.descriptions[indices].tolist()
+
+        for labels, date, description, amount in zip(
+            self._rows, dates, descriptions, amounts
+        ):
+            labels[0].configure(text=date)
+            labels[1].configure(text=description)
+            labels[2].configure(text=f"${amount:.2f}")
+
+        if len(self.frame):
+            self.scrollbar.set(
+                self.first / len(self.frame), (self.first + count) / len(self.frame)
+            )
+
+    def scroll(self, rows: int):
+        """Move the view by a number of rows"""
+        self.first += rows
+        self._render()
+
+    def _on_scrollbar(self, action: str, amount, unit: str = "units"):
+        """Handle scrollbar drags ('moveto') and steps ('scroll')"""
+        if action == "moveto":
+            self.first = int(float(amount) * len(self.frame))
+            self._render()
+        elif action == "scroll":
+            step = self.visible_count if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def sort_by(self, key: str):
+        """Sort by a column, toggling direction if it's already the sort column"""
+        if key == self.sort_key:
+            self.descending = not self.descending
+        else:
+            self.sort_key, self.descending = key, key == "amount"
+
+        self.first = 0
+        self._update_headers()
+        self._render()
+
+    def _update_headers(self):
+        """Mark the sort column and direction in the headers"""
+        for key, button in self.header_buttons.items():
+            arrow = ""
+            if key == self.sort_key:
+                arrow = " ▼" if self.descending else " ▲"
+            button.configure(text=key.title() + arrow)
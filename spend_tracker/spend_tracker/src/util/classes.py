@@ -1,28 +1,582 @@
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import TYPE_CHECKING, Iterator
 
+import numpy as np
 
-@dataclass
+if TYPE_CHECKING:
+    from spend_tracker.src.data_mgr.spend_cube import SpendCube
+
+
+@dataclass(slots=True)
 class CC_Transaction:
     date: datetime
     description: str
     category: str
     amount: float
     source: str
-    outlier: bool | None = None
+
+
+def _store_keys(dates: np.ndarray, category_codes: np.ndarray) -> np.ndarray:
+    """Single int64 key per row that orders rows by (category code, date)"""
+    days = dates.astype("datetime64[D]").astype(np.int64)
+    return (category_codes.astype(np.int64) << 32) + days
+
+
+@dataclass
+class TransactionFrame:
+    """Columnar block of transactions backed by NumPy arrays.
+
+    Dates are stored as ``datetime64[D]``, amounts as integer cents and
+    categories/sources as integer codes into the ``categories``/``sources``
+    lookup lists. Iterating a frame yields ``CC_Transaction`` objects so it
+    can be handed to code that still expects a list of transactions.
+    """
+
+    dates: np.ndarray
+    amounts_cents: np.ndarray
+    category_codes: np.ndarray
+    descriptions: np.ndarray
+    source_codes: np.ndarray
+    categories: list[str] = field(default_factory=list)
+    sources: list[str] = field(default_factory=list)
+
+    @classmethod
+    def empty(cls) -> "TransactionFrame":
+        """Create a frame with no rows"""
+        return cls(
+            dates=np.empty(0, dtype="datetime64[D]"),
+            amounts_cents=np.empty(0, dtype=np.int64),
+            category_codes=np.empty(0, dtype=np.int32),
+            descriptions=np.empty(0, dtype=object),
+            source_codes=np.empty(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_transactions(
+        cls, transactions: list[CC_Transaction]
+    ) -> "TransactionFrame":
+        """Build a frame from a list of CC_Transaction objects"""
+        if not transactions:
+            return cls.empty()
+
+        categories = sorted({tx.category for tx in transactions})
+        sources = sorted({tx.source for tx in transactions})
+        category_lookup = {name: code for code, name in enumerate(categories)}
+        source_lookup = {name: code for code, name in enumerate(sources)}
+
+        return cls(
+            dates=np.array([tx.date for tx in transactions], dtype="datetime64[D]"),
+            amounts_cents=np.rint(
+                np.array([tx.amount for tx in transactions], dtype=np.float64) * 100
+            ).astype(np.int64),
+            category_codes=np.array(
+                [category_lookup[tx.category] for tx in transactions], dtype=np.int32
+            ),
+            descriptions=np.array(
+                [tx.description for tx in transactions], dtype=object
+            ),
+            source_codes=np.array(
+                [source_lookup[tx.source] for tx in transactions], dtype=np.int32
+            ),
+            categories=categories,
+            sources=sources,
+        )
+
+    @staticmethod
+    def concat(frames: list["TransactionFrame"]) -> "TransactionFrame":
+        """Concatenate frames, remapping category and source codes"""
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return TransactionFrame.empty()
+        if len(frames) == 1:
+            return frames[0]
+
+        categories = sorted({name for frame in frames for name in frame.categories})
+        sources = sorted({name for frame in frames for name in frame.sources})
+        category_lookup = {name: code for code, name in enumerate(categories)}
+        source_lookup = {name: code for code, name in enumerate(sources)}
+
+        category_codes = []
+        source_codes = []
+        for frame in frames:
+            category_map = np.array(
+                [category_lookup[name] for name in frame.categories], dtype=np.int32
+            )
+            source_map = np.array(
+                [source_lookup[name] for name in frame.sources], dtype=np.int32
+            )
+            category_codes.append(category_map[frame.category_codes])
+            source_codes.append(source_map[frame.source_codes])
+
+        return TransactionFrame(
+            dates=np.concatenate([frame.dates for frame in frames]),
+            amounts_cents=np.concatenate([frame.amounts_cents for frame in frames]),
+            category_codes=np.concatenate(category_codes),
+            descriptions=np.concatenate([frame.descriptions for frame in frames]),
+            source_codes=np.concatenate(source_codes),
+            categories=categories,
+            sources=sources,
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __iter__(self) -> Iterator[CC_Transaction]:
+        return iter(self.to_transactions())
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """Amounts in dollars as floats"""
+        return self.amounts_cents / 100
+
+    def take(self, indices: np.ndarray) -> "TransactionFrame":
+        """Select rows by integer index or boolean mask"""
+        return TransactionFrame(
+            dates=self.dates[indices],
+            amounts_cents=self.amounts_cents[indices],
+            category_codes=self.category_codes[indices],
+            descriptions=self.descriptions[indices],
+            source_codes=self.source_codes[indices],
+            categories=self.categories,
+            sources=self.sources,
+        )
+
+    def sort_by_category(self) -> "TransactionFrame":
+        """Return the frame with categories coded in name order and rows
+        ordered by (category, date), stable
+
+        This is the order a TransactionStore keeps its rows in. A frame already
+        in that order is returned as is rather than copied.
+        """
+        categories = sorted(self.categories)
+        if categories == self.categories:
+            category_codes = self.category_codes
+        else:
+            category_lookup = {name: code for code, name in enumerate(categories)}
+            category_map = np.array(
+                [category_lookup[name] for name in self.categories], dtype=np.int32
+            )
+            category_codes = category_map[self.category_codes]
+
+        keys = _store_keys(self.dates, category_codes)
+        if np.all(keys[1:] >= keys[:-1]):
+            if category_codes is self.category_codes:
+                return self
+            order = slice(None)
+        else:
+            order = np.argsort(keys, kind="stable")
+
+        return TransactionFrame(
+            dates=self.dates[order],
+            amounts_cents=self.amounts_cents[order],
+            category_codes=category_codes[order],
+            descriptions=self.descriptions[order],
+            source_codes=self.source_codes[order],
+            categories=categories,
+            sources=self.sources,
+        )
+
+    def to_transactions(self) -> list[CC_Transaction]:
+        """Materialize the frame as a list of CC_Transaction objects"""
+        dates = self.dates.astype("datetime64[s]").tolist()
+        amounts = self.amounts.tolist()
+        categories = [self.categories[code] for code in self.category_codes.tolist()]
+        sources = [self.sources[code] for code in self.source_codes.tolist()]
+
+        return [
+            CC_Transaction(
+                date=date,
+                description=description,
+                category=category,
+                amount=amount,
+                source=source,
+            )
+            for date, description, category, amount, source in zip(
+                dates, self.descriptions.tolist(), categories, amounts, sources
+            )
+        ]
+
+
+# Columns of a TransactionFrame that hold one value per row
+FRAME_COLUMNS = (
+    "dates",
+    "amounts_cents",
+    "category_codes",
+    "descriptions",
+    "source_codes",
+)
+# Rows appended since the last merge are merged into the sorted rows once they
+# outnumber 1/COMPACT_RATIO of them (or MIN_TAIL_ROWS, whichever is larger)
+COMPACT_RATIO = 8
+MIN_TAIL_ROWS = 1024
+
+
+@dataclass
+class TransactionStore(TransactionFrame):
+    """Struct-of-arrays transaction storage ordered by (category, date).
+
+    Rows before ``tail_start`` are sorted by (category, date), so the
+    transactions of one category within any period form an index range.
+    Appended rows go to a tail after them in arrival order, which keeps an
+    append proportional to its own size; the tail is merged into the sorted
+    rows once it grows past a fraction of them. Category and source names are
+    stored once and referenced by code, and repeated descriptions share one
+    string object.
+    """
+
+    tail_start: int = 0
+    category_lookup: dict[str, int] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if not self.category_lookup:
+            self.category_lookup = {
+                name: code for code, name in enumerate(self.categories)
+            }
+        # Column buffers with spare capacity for appends (None until needed)
+        self._buffers: dict[str, np.ndarray] | None = None
+
+    @classmethod
+    def from_frame(cls, frame: TransactionFrame) -> "TransactionStore":
+        """Build a store from a frame, sorting it by category then date
+
+        A frame that is already in store order (such as one loaded from the
+        frame cache) is used without sorting or copying its columns; appends
+        never write into them, so read-only memory maps are fine.
+        """
+        frame = frame.sort_by_category()
+        return cls(
+            dates=frame.dates,
+            amounts_cents=frame.amounts_cents,
+            category_codes=frame.category_codes,
+            descriptions=frame.descriptions,
+            source_codes=frame.source_codes,
+            categories=list(frame.categories),
+            sources=list(frame.sources),
+            tail_start=len(frame),
+        )
+
+    @classmethod
+    def from_transactions(
+        cls, transactions: list[CC_Transaction]
+    ) -> "TransactionStore":
+        return cls.from_frame(TransactionFrame.from_transactions(transactions))
+
+    def _recode(self, frame: TransactionFrame) -> tuple[np.ndarray, np.ndarray]:
+        """Category and source codes of a frame's rows in this store's codes,
+        adding names the store hasn't seen at the end so existing codes hold"""
+        new = [name for name in frame.categories if name not in self.category_lookup]
+        if new:
+            self.category_lookup.update(
+                {name: len(self.categories) + i for i, name in enumerate(new)}
+            )
+            self.categories = self.categories + new
+
+        source_lookup = {name: code for code, name in enumerate(self.sources)}
+        new = [name for name in frame.sources if name not in source_lookup]
+        if new:
+            source_lookup.update(
+                {name: len(self.sources) + i for i, name in enumerate(new)}
+            )
+            self.sources = self.sources + new
+
+        category_map = np.array(
+            [self.category_lookup[name] for name in frame.categories], dtype=np.int32
+        )
+        source_map = np.array(
+            [source_lookup[name] for name in frame.sources], dtype=np.int32
+        )
+        return category_map[frame.category_codes], source_map[frame.source_codes]
+
+    def _write(self, columns: dict[str, np.ndarray], at: int, spare: int) -> None:
+        """
+        Write rows at position `at` and expose rows 0..at+len as the columns.
+        Rows are written past the end of the current arrays, so views handed
+        out earlier never change; the buffers are reallocated with `spare`
+        extra capacity when the rows don't fit.
+        """
+        stop = at + len(columns["dates"])
+        if self._buffers is None or len(self._buffers["dates"]) < stop:
+            buffers = {}
+            for name in FRAME_COLUMNS:
+                current = getattr(self, name)
+                buffer = np.empty(stop + spare, dtype=current.dtype)
+                buffer[:at] = current[:at]
+                buffers[name] = buffer
+            self._buffers = buffers
+
+        for name in FRAME_COLUMNS:
+            self._buffers[name][at:stop] = columns[name]
+            setattr(self, name, self._buffers[name][:stop])
+
+    def extend(self, frame: TransactionFrame) -> bool:
+        """
+        Append rows to the tail, merging the tail into the sorted rows when
+        it has grown too large. Returns True if rows were reordered (the
+        tail was merged), in which case earlier row indices are stale.
+        """
+        if not len(frame):
+            return False
+        if not len(self):
+            self.__dict__.update(TransactionStore.from_frame(frame).__dict__)
+            return True
+
+        category_codes, source_codes = self._recode(frame)
+        self._write(
+            {
+                "dates": frame.dates,
+                "amounts_cents": frame.amounts_cents,
+                "category_codes": category_codes,
+                "descriptions": frame.descriptions,
+                "source_codes": source_codes,
+            },
+            at=len(self),
+            spare=max(len(self), MIN_TAIL_ROWS),  # Doubling keeps appends O(rows)
+        )
+
+        if len(self) - self.tail_start <= max(
+            self.tail_start // COMPACT_RATIO, MIN_TAIL_ROWS
+        ):
+            return False
+        self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Merge the tail into the sorted rows"""
+        if self.tail_start == len(self):
+            return
+
+        keys = _store_keys(self.dates, self.category_codes)
+        sorted_rows = self.tail_start
+        tail_order = np.argsort(keys[sorted_rows:], kind="stable")
+        positions = np.searchsorted(
+            keys[:sorted_rows], keys[sorted_rows:][tail_order], side="right"
+        )
+        order = np.insert(np.arange(sorted_rows), positions, sorted_rows + tail_order)
+
+        # Fresh buffers: readers may still hold views of the old row order
+        self._buffers = None
+        self._write(
+            {name: getattr(self, name)[order] for name in FRAME_COLUMNS},
+            at=0,
+            spare=len(order) // COMPACT_RATIO + MIN_TAIL_ROWS,
+        )
+        self.tail_start = len(self)
+
+    def records(self, start: int = 0, stop: int | None = None) -> list[CC_Transaction]:
+        """Materialize a range of rows as CC_Transaction records"""
+        return self.take(slice(start, stop)).to_transactions()
+
+
+@dataclass
+class CategoryStats:
+    """Running count, mean, variance, min and max of amounts per category.
+
+    Batches are folded in with the parallel form of Welford's algorithm, so
+    appending transactions updates the statistics without rescanning the
+    ones already seen. Arrays are aligned with ``categories``.
+    """
+
+    categories: list[str] = field(default_factory=list)
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    means: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    # Sum of squared deviations from the mean
+    m2: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    minimums: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    maximums: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    @classmethod
+    def from_frame(cls, frame: TransactionFrame) -> "CategoryStats":
+        """Statistics over every transaction in a frame"""
+        stats = cls()
+        stats.update(frame)
+        return stats
+
+    def _category_positions(self, categories: list[str]) -> np.ndarray:
+        """Position of each category in the arrays, appending unseen ones"""
+        lookup = {name: i for i, name in enumerate(self.categories)}
+        new = [name for name in categories if name not in lookup]
+        if new:
+            grow = len(new)
+            self.categories = self.categories + new
+            self.counts = np.concatenate([self.counts, np.zeros(grow, dtype=np.int64)])
+            self.means = np.concatenate([self.means, np.zeros(grow)])
+            self.m2 = np.concatenate([self.m2, np.zeros(grow)])
+            self.minimums = np.concatenate([self.minimums, np.full(grow, np.inf)])
+            self.maximums = np.concatenate([self.maximums, np.full(grow, -np.inf)])
+            lookup.update({name: len(lookup) + i for i, name in enumerate(new)})
+        return np.array([lookup[name] for name in categories], dtype=np.int64)
+
+    def update(self, frame: TransactionFrame) -> None:
+        """Fold a batch of transactions into the running statistics"""
+        if len(frame) == 0:
+            return
+
+        positions = self._category_positions(frame.categories)
+        codes = frame.category_codes
+        amounts = frame.amounts
+        groups = len(frame.categories)
+
+        # Statistics of the batch on its own
+        batch_counts = np.bincount(codes, minlength=groups)
+        present = batch_counts > 0
+        batch_means = np.divide(
+            np.bincount(codes, weights=amounts, minlength=groups),
+            batch_counts,
+            out=np.zeros(groups),
+            where=present,
+        )
+        batch_m2 = np.bincount(
+            codes, weights=(amounts - batch_means[codes]) ** 2, minlength=groups
+        )
+        batch_minimums = np.full(groups, np.inf)
+        batch_maximums = np.full(groups, -np.inf)
+        np.minimum.at(batch_minimums, codes, amounts)
+        np.maximum.at(batch_maximums, codes, amounts)
+
+        # Merge into the running values
+        target = positions[present]
+        count_a = self.counts[target]
+        count_b = batch_counts[present]
+        total = count_a + count_b
+        delta = batch_means[present] - self.means[target]
+
+        self.means[target] += delta * count_b / total
+        self.m2[target] += batch_m2[present] + delta**2 * count_a * count_b / total
+        self.counts[target] = total
+        self.minimums[target] = np.minimum(
+            self.minimums[target], batch_minimums[present]
+        )
+        self.maximums[target] = np.maximum(
+            self.maximums[target], batch_maximums[present]
+        )
+
+    @property
+    def variances(self) -> np.ndarray:
+        """Population variance per category (0 for empty categories)"""
+        return np.divide(
+            self.m2, self.counts, out=np.zeros(len(self.m2)), where=self.counts > 0
+        )
+
+    def summary(self, category: str) -> dict[str, float]:
+        """Count, mean, standard deviation, min and max for one category"""
+        i = self.categories.index(category)
+        return {
+            "count": int(self.counts[i]),
+            "mean": float(self.means[i]),
+            "std": float(np.sqrt(self.variances[i])),
+            "min": float(self.minimums[i]),
+            "max": float(self.maximums[i]),
+        }
+
+    def overall(self) -> dict[str, float]:
+        """The same summary across all categories combined"""
+        count = int(self.counts.sum())
+        if count == 0:
+            return {"count": 0, "mean": 0.0, "std": 0.0, "min": 0.0, "max": 0.0}
+
+        mean = float((self.means * self.counts).sum() / count)
+        m2 = float((self.m2 + self.counts * (self.means - mean) ** 2).sum())
+        return {
+            "count": count,
+            "mean": mean,
+            "std": float(np.sqrt(m2 / count)),
+            "min": float(self.minimums.min()),
+            "max": float(self.maximums.max()),
+        }
+
+
+@dataclass
+class FileIngestStats:
+    """Parse statistics for a single source file"""
+
+    path: str
+    rows: int
+    seconds: float
+
+
+@dataclass
+class IngestResult:
+    """Transactions merged from several source files plus per-file timing"""
+
+    frame: TransactionFrame
+    file_stats: list[FileIngestStats] = field(default_factory=list)
+    total_seconds: float = 0.0
+
+    def format_report(self) -> str:
+        """Human readable per-file timing report"""
+        lines = [
+            f"{stats.path}: {stats.rows} rows in {stats.seconds * 1000:.1f} ms"
+            for stats in self.file_stats
+        ]
+        lines.append(
+            f"Loaded {len(self.frame)} transactions from {len(self.file_stats)} "
+            f"file(s) in {self.total_seconds * 1000:.1f} ms"
+        )
+        return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class PeriodSpec:
+    """Bucketing rule for one period granularity.
+
+    Periods are `length` consecutive days or months, aligned so that period
+    0 starts `anchor` units after the epoch (1970-01-01 / January 1970).
+    """
+
+    unit: str  # "day" or "month"
+    length: int
+    anchor: int = 0
 
 
 @dataclass
 class CategoryPeriodData:
-    """Data for a specific category within a time period"""
+    """Data for a specific category within a time period.
+
+    The transactions are the rows start..stop of the shared TransactionStore,
+    plus any rows appended to the store's tail since it was last merged.
+    """
 
     total_spend: float = 0.0
-    transactions: list[CC_Transaction] = field(default_factory=list)
+    store: TransactionStore | None = field(default=None, repr=False, compare=False)
+    start: int = 0
+    stop: int = 0
+    tail_rows: np.ndarray | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def count(self) -> int:
+        tail = 0 if self.tail_rows is None else len(self.tail_rows)
+        return self.stop - self.start + tail
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Store row indices of the transactions, in date order"""
+        rows = np.arange(self.start, self.stop)
+        if self.tail_rows is None:
+            return rows
+        rows = np.concatenate([rows, self.tail_rows])
+        return rows[np.argsort(self.store.dates[rows], kind="stable")]
 
-    def add_transaction(self, transaction: CC_Transaction) -> None:
-        """Add a transaction to this category period and update total spend"""
-        self.transactions.append(transaction)
-        self.total_spend += transaction.amount
+    @property
+    def amounts(self) -> np.ndarray:
+        """Transaction amounts in dollars"""
+        amounts = self.store.amounts_cents[self.start : self.stop]
+        if self.tail_rows is not None:
+            tail = self.store.amounts_cents[self.tail_rows]
+            amounts = np.concatenate([amounts, tail])
+        return amounts / 100
+
+    @property
+    def transactions(self) -> list[CC_Transaction]:
+        """Transactions in this category period, materialized from the store"""
+        if self.store is None:
+            return []
+        if self.tail_rows is None:
+            return self.store.records(self.start, self.stop)
+        return self.store.take(self.rows).to_transactions()
 
 
 @dataclass
@@ -34,9 +588,107 @@ class PeriodData:
     categories: dict[str, CategoryPeriodData] = field(default_factory=dict)
 
 
-@dataclass
 class GraphableData:
-    """Structure containing transaction data organized for graphing"""
+    """Structure containing transaction data organized for graphing.
+
+    Period views (months, weeks, quarters, ...) are built from the
+    transactions the first time they are accessed and cached afterwards.
+    """
+
+    def __init__(
+        self,
+        store: TransactionStore | None = None,
+        week_start: int = 0,
+        fiscal_year_start_month: int = 1,
+        sketch_compression: int | None = None,
+    ):
+        self.store = store if store is not None else TransactionStore.empty()
+        self.week_start = week_start  # 0 = Monday ... 6 = Sunday
+        self.fiscal_year_start_month = fiscal_year_start_month
+        # Quantile sketch accuracy for cubes (None keeps exact per-cell amounts)
+        self.sketch_compression = sketch_compression
+        self.built_periods: dict[str, list[PeriodData]] = {}
+        self.cubes: dict[str, "SpendCube"] = {}
+        # Guards the store and the caches; appends hold it for their whole
+        # update and bump the generation, so results computed from older rows
+        # can be recognized. Long computations work on a snapshot() instead of
+        # holding it.
+        self.lock = threading.RLock()
+        self.generation = 0
+        # Content hash with the generation it was taken at
+        self.content_fingerprint: tuple[int, str] | None = None
+        self.category_stats = CategoryStats.from_frame(self.store)
+
+    @property
+    def transactions(self) -> list[CC_Transaction]:
+        """All transactions, materialized from the store"""
+        return self.store.records()
+
+    @property
+    def months(self) -> list[PeriodData]:
+        return self.periods("month")
+
+    @property
+    def weeks(self) -> list[PeriodData]:
+        return self.periods("week")
+
+    def periods(self, granularity: str) -> list[PeriodData]:
+        """Periods for a granularity, built on first access"""
+        with self.lock:
+            if granularity not in self.built_periods:
+                from spend_tracker.src.data_mgr.restructure_data_for_graphing import (
+                    build_periods,
+                )
+
+                self.built_periods[granularity] = build_periods(self, granularity)
+            return self.built_periods[granularity]
+
+    def cube(self, granularity: str) -> "SpendCube":
+        """Period x category spend cube for a granularity, built on first access"""
+        with self.lock:
+            if granularity not in self.cubes:
+                from spend_tracker.src.data_mgr.spend_cube import build_spend_cube
+
+                self.cubes[granularity] = build_spend_cube(
+                    self.periods(granularity),
+                    self.store.categories,
+                    self.sketch_compression,
+                )
+            return self.cubes[granularity]
+
+    def cache_settings(self) -> dict:
+        """Settings that shape cached results besides the transactions"""
+        return {
+            "week_start": self.week_start,
+            "fiscal_year_start_month": self.fiscal_year_start_month,
+            "sketch_compression": self.sketch_compression,
+        }
+
+    def snapshot(self) -> tuple[int, TransactionFrame]:
+        """
+        Generation and a view of every stored row, taken under the lock.
+        Appends never write into arrays handed out earlier, so the view stays
+        consistent after the lock is released and can be computed on without
+        blocking other threads.
+        """
+        with self.lock:
+            return self.generation, self.store.take(slice(None))
+
+    def fingerprint(self, snapshot: tuple[int, TransactionFrame] | None = None) -> str:
+        """
+        Content hash of the store (or of a snapshot of it), used to key
+        persistent result caches. The rows are hashed outside the lock; the
+        hash is kept for reuse while no transactions have been appended.
+        """
+        generation, frame = snapshot or self.snapshot()
+        cached = self.content_fingerprint
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        from spend_tracker.src.data_mgr.result_cache import dataset_fingerprint
 
-    months: list[PeriodData] = field(default_factory=list)
-    weeks: list[PeriodData] = field(default_factory=list)
+        fingerprint = dataset_fingerprint(frame)
+        with self.lock:
+            if self.generation == generation:
+                self.content_fingerprint = (generation, fingerprint)
+        return fingerprint
@@ -0,0 +1,29 @@
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class StartupTimer:
+    """Time to first paint broken down into named phases
+
+    Each mark() ends a phase that began at the previous mark (or at start), so
+    the phases are contiguous and add up to the total. This module imports
+    nothing heavy, so a timer can be started before any library is loaded.
+    """
+
+    start: float = field(default_factory=time.perf_counter)
+    phases: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        return sum(seconds for _, seconds in self.phases)
+
+    def mark(self, phase: str) -> None:
+        """End a phase now"""
+        self.phases.append((phase, time.perf_counter() - self.start - self.total))
+
+    def format_report(self) -> str:
+        """Human readable per-phase timing report"""
+        lines = [f"{phase}: {seconds * 1000:.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"Time to first paint: {self.total * 1000:.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,199 @@
+from typing import Callable, Dict, List, Optional, Set
+
+import customtkinter as ctk
+
+from spend_tracker.src.widgets.category_search import CategorySearch
+
+ROW_HEIGHT = 28  # Pixels per checkbox row
+
+
+def to_hex(color: tuple) -> str:
+    """Convert a matplotlib RGBA tuple to a Tk hex color"""
+    return "#{:02x}{:02x}{:02x}".format(
+        int(color[0] * 255), int(color[1] * 255), int(color[2] * 255)
+    )
+
+
+class CategoryPicker(ctk.CTkFrame):
+    """Searchable category checklist that scales to thousands of categories
+
+    Only the checkboxes that fit in the window exist; scrolling or searching
+    relabels them from the filtered list. Select/Deselect All apply to the
+    categories matching the search and report one change.
+    """
+
+    def __init__(
+        self,
+        master,
+        categories: List[str],
+        on_change: Callable[[Set[str]], None],
+        category_colors: Optional[Dict[str, tuple]] = None,
+    ):
+        super().__init__(master, fg_color="transparent")
+
+        self.index = CategorySearch(categories)
+        self.on_change = on_change
+        self.category_colors = category_colors or {}
+        self._all = frozenset(self.index.categories)
+        self.selected_categories = set(self._all)  # All selected by default
+        self.matches = list(self.index.categories)
+        self._query = ""
+        self.first = 0  # Index in matches of the top visible row
+        self._visible_slots = 0  # Pooled checkboxes that fit in the window
+        self._rows: List[ctk.CTkCheckBox] = []
+        self._row_vars: List[ctk.BooleanVar] = []
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Setup the search box, list and bulk selection buttons"""
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+
+        # Search box, filtered on every keystroke (a textvariable would hide
+        # the placeholder)
+        self.search_entry = ctk.CTkEntry(self, placeholder_text="Search categories")
+        self.search_entry.grid(
+            row=0, column=0, columnspan=2, sticky="ew", padx=5, pady=(5, 2)
+        )
+        self.search_entry.bind("<KeyRelease>", lambda event: self._apply_search())
+
+        self.count_label = ctk.CTkLabel(self, text="", anchor="w")
+        self.count_label.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5)
+
+        # Row area; its size comes from the window, never from the categories
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=2, column=0, sticky="nsew")
+        self.body.grid_propagate(False)
+        self.body.columnconfigure(0, weight=1)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=2, column=1, sticky="ns")
+
+        self.body.bind("<Configure>", lambda event: self._resize(event.height))
+        self._bind_wheel(self.body)
+
+        # Select/Deselect all buttons
+        button_frame = ctk.CTkFrame(self)
+        button_frame.grid(row=3, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+
+        ctk.CTkButton(button_frame, text="Select All", command=self.select_all).pack(
+            side="left", fill="x", expand=True, padx=2
+        )
+
+        ctk.CTkButton(
+            button_frame, text="Deselect All", command=self.deselect_all
+        ).pack(side="right", fill="x", expand=True, padx=2)
+
+        self._update_count()
+
+    def _bind_wheel(self, widget):
+        """Scroll on mouse wheel (Windows/macOS) and buttons 4/5 (X11)"""
+        widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self.scroll(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def _resize(self, height: int):
+        """Grow the checkbox pool to fill the available height"""
+        needed = max(height // ROW_HEIGHT, 1)
+        while len(self._rows) < needed:
+            slot = len(self._rows)
+            var = ctk.BooleanVar(value=False)
+            checkbox = ctk.CTkCheckBox(
+                self.body,
+                text="",
+                variable=var,
+                command=lambda slot=slot: self._toggle_slot(slot),
+            )
+            checkbox.grid(row=slot, column=0, sticky="w", padx=5, pady=2)
+            self._bind_wheel(checkbox)
+            self._rows.append(checkbox)
+            self._row_vars.append(var)
+
+        self._visible_slots = needed
+        self._render()
+
+    def _render(self):
+        """Relabel the pooled checkboxes with the categories now in view"""
+        count = self._visible_slots
+        self.first = min(max(self.first, 0), max(len(self.matches) - count, 0))
+        shown = self.matches[self.first : self.first + count]
+
+        for slot, checkbox in enumerate(self._rows):
+            if slot >= len(shown):
+                checkbox.grid_remove()
+                continue
+
+            category = shown[slot]
+            checkbox.configure(text=category)
+            if category in self.category_colors:
+                checkbox.configure(fg_color=to_hex(self.category_colors[category]))
+            self._row_vars[slot].set(category in self.selected_categories)
+            checkbox.grid()
+
+        if self.matches:
+            self.scrollbar.set(
+                self.first / len(self.matches),
+                min(self.first + count, len(self.matches)) / len(self.matches),
+            )
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _toggle_slot(self, slot: int):
+        """Toggle the category shown in a pooled checkbox"""
+        category = self.matches[self.first + slot]
+        if self._row_vars[slot].get():
+            self.selected_categories.add(category)
+        else:
+            self.selected_categories.discard(category)
+
+        self._update_count()
+        self.on_change(self.selected_categories)
+
+    def scroll(self, rows: int):
+        """Move the view by a number of rows"""
+        self.first += rows
+        self._render()
+
+    def _on_scrollbar(self, action: str, amount, unit: str = "units"):
+        """Handle scrollbar drags ('moveto') and steps ('scroll')"""
+        if action == "moveto":
+            self.first = int(float(amount) * len(self.matches))
+            self._render()
+        elif action == "scroll":
+            step = self._visible_slots if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _apply_search(self):
+        """Filter the list to categories matching the search text"""
+        query = self.search_entry.get()
+        if query == self._query:
+            return  # Keys that don't edit the text
+        self._query = query
+
+        self.matches = self.index.search(query)
+        self.first = 0
+        self._update_count()
+        self._render()
+
+    def _update_count(self):
+        """Show how many categories are selected and how many match"""
+        text = f"{len(self.selected_categories)} of {len(self.index)} selected"
+        if len(self.matches) < len(self.index):
+            text += f", {len(self.matches)} shown"
+        self.count_label.configure(text=text)
+
+    def set_selected(self, categories: Set[str]):
+        """Replace the selection, reporting one change"""
+        self.selected_categories = set(categories) & self._all
+        self._update_count()
+        self._render()
+        self.on_change(self.selected_categories)
+
+    def select_all(self):
+        """Select every category matching the search, reporting one change"""
+        self.set_selected(self.selected_categories | set(self.matches))
+
+    def deselect_all(self):
+        """Deselect every category matching the search, reporting one change"""
+        self.set_selected(self.selected_categories - set(self.matches))
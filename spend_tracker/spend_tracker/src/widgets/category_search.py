@@ -0,0 +1,41 @@
+from bisect import bisect_left
+from typing import Iterable, List
+
+
+class CategorySearch:
+    """Case-insensitive prefix/substring index over category names
+
+    Names are kept sorted by their lowercase form, so prefix matches are one
+    contiguous run found by binary search. Substring matches are found by a
+    scan, but typing is incremental: when a query extends the previous one,
+    only the previous matches are rescanned.
+    """
+
+    def __init__(self, categories: Iterable[str]):
+        self.categories = sorted(set(categories), key=lambda name: (name.lower(), name))
+        self._lowered = [name.lower() for name in self.categories]
+        self._last_query = ""
+        self._last_matches = list(range(len(self.categories)))
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def search(self, query: str) -> List[str]:
+        """Categories containing the query, names starting with it first"""
+        query = query.strip().lower()
+        if not query:
+            return list(self.categories)
+
+        # Refine the previous matches when the user keeps typing
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self.categories))
+        matches = [i for i in candidates if query in self._lowered[i]]
+        self._last_query, self._last_matches = query, matches
+
+        # Prefix matches are the sorted run between query and its successor
+        start = bisect_left(self._lowered, query)
+        stop = bisect_left(self._lowered, query[:-1] + chr(ord(query[-1]) + 1))
+        prefixed = [self.categories[i] for i in range(start, stop)]
+        return prefixed + [self.categories[i] for i in matches if not start <= i < stop]
@@ -0,0 +1,97 @@
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# How often the Tk thread checks for finished work (milliseconds)
+POLL_INTERVAL_MS = 20
+
+
+class ComputeWorker:
+    """Runs aggregation on a background thread so the Tk main loop never blocks
+
+    Work is submitted as a compute function, which runs on the worker thread
+    and must not touch widgets, plus an apply callback that receives its
+    result back on the Tk thread. Results are handed over through a queue the
+    Tk thread polls with after(), since Tk calls are not safe from other
+    threads. Only the newest request matters: submitting cancels older
+    requests that haven't started, and the results of ones that had are
+    dropped. A single thread is used so computations never race each other
+    over shared caches, and numpy releases the GIL for the heavy lifting.
+    """
+
+    def __init__(self, widget, on_busy: Optional[Callable[[bool], None]] = None):
+        self.widget = widget
+        self.on_busy = on_busy
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._generation = 0
+        self._future: Optional[Future] = None
+        self._poll_id: Optional[str] = None
+
+    @property
+    def busy(self) -> bool:
+        return self._future is not None
+
+    def submit(
+        self,
+        compute: Callable[[], Any],
+        apply: Callable[[Any], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Future:
+        """Start a computation, superseding any request still in flight"""
+        if self._future is not None:
+            self._future.cancel()
+        else:
+            self._set_busy(True)
+
+        self._generation += 1
+        generation = self._generation
+        future = self._executor.submit(compute)
+        future.add_done_callback(
+            lambda done: self._results.put((generation, done, apply, on_error))
+        )
+        self._future = future
+
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(POLL_INTERVAL_MS, self._poll)
+        return future
+
+    def _poll(self) -> None:
+        """Deliver finished results on the Tk thread"""
+        self._poll_id = None
+        while True:
+            try:
+                generation, future, apply, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            # Stale results belong to state that has since changed
+            if generation != self._generation or future.cancelled():
+                continue
+
+            self._future = None
+            self._set_busy(False)
+            error = future.exception()
+            if error is None:
+                apply(future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                print(f"Error computing update: {error}")
+
+        if self._future is not None:
+            self._poll_id = self.widget.after(POLL_INTERVAL_MS, self._poll)
+
+    def _set_busy(self, busy: bool) -> None:
+        if self.on_busy is not None:
+            self.on_busy(busy)
+
+    def shutdown(self) -> None:
+        """Stop polling and drop pending work (running work finishes unseen)"""
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
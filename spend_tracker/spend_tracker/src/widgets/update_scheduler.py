@@ -0,0 +1,40 @@
+from typing import Callable, Optional
+
+
+class UpdateScheduler:
+    """Coalesces UI state changes into one update per Tk idle cycle
+
+    Handlers apply their (cheap) state change and call request(). However many
+    requests arrive before Tk goes idle, the expensive update runs once and
+    sees all of the merged changes.
+    """
+
+    def __init__(self, widget, update: Callable[[], None]):
+        self.widget = widget
+        self.update = update
+        self._pending: Optional[str] = None  # Tk after id of the queued update
+
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None
+
+    def request(self) -> None:
+        """Queue an update for the next idle cycle unless one is already queued"""
+        if self._pending is None:
+            self._pending = self.widget.after_idle(self._run)
+
+    def flush(self) -> None:
+        """Run a queued update now instead of waiting for idle"""
+        if self._pending is not None:
+            self.cancel()
+            self.update()
+
+    def cancel(self) -> None:
+        """Drop a queued update"""
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+
+    def _run(self) -> None:
+        self._pending = None
+        self.update()
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from spend_tracker.src.data_mgr.csv_reader import intern_strings
+from spend_tracker.src.util.classes import TransactionFrame
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.fixture
+def make_frame(rng):
+    """Factory for frames of random transactions"""
+
+    def make(
+        rows: int,
+        categories: list[str] | None = None,
+        start: str = "2022-01-01",
+        days: int = 3 * 365,
+    ) -> TransactionFrame:
+        categories = categories or [f"Category {i}" for i in range(6)]
+        merchants = rng.integers(0, 50, size=rows)
+        return TransactionFrame(
+            dates=np.datetime64(start, "D") + rng.integers(0, days, size=rows),
+            amounts_cents=rng.integers(100, 50_000, size=rows),
+            category_codes=rng.integers(0, len(categories), size=rows).astype(
+                np.int32
+            ),
+            descriptions=intern_strings(
+                np.array([f"Merchant {m}" for m in merchants.tolist()], dtype=object)
+            ),
+            source_codes=rng.integers(0, 2, size=rows).astype(np.int32),
+            categories=list(categories),
+            sources=["Visa", "Amex"],
+        )
+
+    return make
@@ -0,0 +1,42 @@
+from spend_tracker.src.widgets.category_search import CategorySearch
+
+CATEGORIES = ["Groceries", "gas", "Dining", "Shopping", "Gifts", "Big Gains", "Rent"]
+
+
+def test_empty_query_lists_every_category_case_insensitively():
+    search = CategorySearch(CATEGORIES + ["Rent"])
+
+    assert search.search("  ") == [
+        "Big Gains",
+        "Dining",
+        "gas",
+        "Gifts",
+        "Groceries",
+        "Rent",
+        "Shopping",
+    ]
+    assert len(search) == 7
+
+
+def test_prefix_matches_come_before_substring_matches():
+    search = CategorySearch(CATEGORIES)
+
+    assert search.search("G") == [
+        "gas",
+        "Gifts",
+        "Groceries",
+        "Big Gains",
+        "Dining",
+        "Shopping",
+    ]
+
+
+def test_refined_queries_match_fresh_searches():
+    search = CategorySearch(CATEGORIES)
+
+    for query in ["g", "gi", "gif", "gi", "", "in", "ing", "x", "r"]:
+        assert search.search(query) == CategorySearch(CATEGORIES).search(query)
+
+
+def test_no_matches():
+    assert CategorySearch(CATEGORIES).search("zzz") == []
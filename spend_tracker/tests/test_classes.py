@@ -0,0 +1,171 @@
+import threading
+
+import numpy as np
+
+from spend_tracker.src.data_mgr.restructure_data_for_graphing import add_transactions
+from spend_tracker.src.util.classes import (
+    CategoryStats,
+    GraphableData,
+    TransactionFrame,
+    TransactionStore,
+)
+
+
+def row_keys(frame: TransactionFrame) -> list[tuple]:
+    """Rows as comparable (category, date, amount, description) tuples"""
+    return list(
+        zip(
+            [frame.categories[c] for c in frame.category_codes.tolist()],
+            frame.dates.tolist(),
+            frame.amounts_cents.tolist(),
+            frame.descriptions.tolist(),
+        )
+    )
+
+
+def test_from_frame_orders_by_category_then_date(make_frame):
+    frame = make_frame(2000)
+
+    store = TransactionStore.from_frame(frame)
+
+    assert store.tail_start == len(store) == len(frame)
+    assert store.categories == sorted(frame.categories)
+    keys = row_keys(store)
+    assert [key[:2] for key in keys] == sorted(key[:2] for key in keys)
+    assert sorted(keys) == sorted(row_keys(frame))
+
+
+def test_extend_keeps_small_appends_in_arrival_order(make_frame):
+    store = TransactionStore.from_frame(make_frame(2000))
+    old_categories = list(store.categories)
+    sorted_rows = row_keys(store)
+    batch = make_frame(10, categories=["Category 3", "New category"])
+
+    merged = store.extend(batch)
+
+    assert not merged
+    assert store.tail_start == 2000
+    assert row_keys(store)[:2000] == sorted_rows
+    assert row_keys(store)[2000:] == row_keys(batch)
+    # New names are added at the end, so existing codes stay valid
+    assert store.categories == old_categories + ["New category"]
+
+
+def test_extend_merges_a_large_tail_in_order(make_frame):
+    store = TransactionStore.from_frame(make_frame(2000))
+    batches = [make_frame(300, categories=["Category 1", "Extra"]) for _ in range(5)]
+
+    # Same rows as a stable sort of everything in arrival order
+    arrival = row_keys(store) + [key for batch in batches for key in row_keys(batch)]
+    expected = sorted(
+        arrival,
+        key=lambda key: (
+            (store.categories + ["Extra"]).index(key[0]),
+            key[1],
+        ),
+    )
+
+    merged = [store.extend(batch) for batch in batches]
+
+    # The fourth batch takes the tail past MIN_TAIL_ROWS
+    assert merged == [False, False, False, True, False]
+    assert store.tail_start == 2000 + 300 * 4
+    store.compact()
+    assert store.tail_start == len(store)
+    assert row_keys(store) == expected
+
+
+def test_extend_of_empty_store_builds_it(make_frame):
+    store = TransactionStore.from_frame(TransactionFrame.empty())
+    frame = make_frame(50)
+
+    assert store.extend(frame)
+    assert row_keys(store) == row_keys(TransactionStore.from_frame(frame))
+
+def expected_stats(frame: TransactionFrame) -> dict[str, tuple]:
+    amounts = frame.amounts_cents / 100
+    stats = {}
+    for code, name in enumerate(frame.categories):
+        values = amounts[frame.category_codes == code]
+        if len(values):
+            stats[name] = (
+                len(values),
+                values.mean(),
+                values.var(),
+                values.min(),
+                values.max(),
+            )
+    return stats
+
+
+def test_category_stats_match_numpy(make_frame):
+    first = make_frame(3000)
+    second = make_frame(500, categories=["Category 2", "Late"])
+    stats = CategoryStats.from_frame(first)
+
+    stats.update(second)
+
+    combined = TransactionFrame.concat([first, second])
+    for name, (count, mean, variance, low, high) in expected_stats(combined).items():
+        i = stats.categories.index(name)
+        assert stats.counts[i] == count
+        assert np.isclose(stats.means[i], mean)
+        assert np.isclose(stats.variances[i], variance)
+        assert stats.minimums[i] == low
+        assert stats.maximums[i] == high
+        assert np.isclose(stats.summary(name)["std"], np.sqrt(variance))
+
+
+def test_category_stats_overall_matches_numpy(make_frame):
+    frame = make_frame(2000)
+    stats = CategoryStats.from_frame(frame)
+
+    overall = stats.overall()
+
+    amounts = frame.amounts_cents / 100
+    assert overall["count"] == len(amounts)
+    assert np.isclose(overall["mean"], amounts.mean())
+    assert np.isclose(overall["std"], amounts.std())
+    assert overall["min"] == amounts.min()
+    assert overall["max"] == amounts.max()
+
+
+def test_snapshots_stay_consistent_while_appending(make_frame):
+    first = make_frame(2000)
+    graphable_data = GraphableData(TransactionStore.from_frame(first))
+    batches = [make_frame(50, categories=["Category 1", "Late"]) for _ in range(30)]
+    totals = np.cumsum(
+        [first.amounts_cents.sum()] + [batch.amounts_cents.sum() for batch in batches]
+    )
+    snapshots = []
+
+    def read():
+        for _ in range(300):
+            snapshots.append(graphable_data.snapshot())
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for batch in batches:
+        add_transactions(graphable_data, batch)
+    for reader in readers:
+        reader.join()
+
+    # Each snapshot still holds exactly the rows of its generation, although
+    # later appends grew and merged the store after it was taken
+    assert graphable_data.generation == len(batches)
+    for generation, frame in snapshots:
+        assert len(frame) == len(first) + 50 * generation
+        assert frame.amounts_cents.sum() == totals[generation]
+        assert frame.category_codes.max() < len(frame.categories)
+
+
+def test_fingerprint_is_kept_only_for_its_generation(make_frame):
+    graphable_data = GraphableData(TransactionStore.from_frame(make_frame(500)))
+    old = graphable_data.snapshot()
+
+    add_transactions(graphable_data, make_frame(10))
+
+    # A result computed from the older rows is keyed by their own hash
+    assert graphable_data.fingerprint(old) != graphable_data.fingerprint()
+    assert graphable_data.content_fingerprint[0] == graphable_data.generation
@@ -0,0 +1,138 @@
+import threading
+
+from spend_tracker.src.widgets.compute_worker import ComputeWorker
+from spend_tracker.src.widgets.update_scheduler import UpdateScheduler
+
+
+class FakeWidget:
+    """Stands in for a Tk widget; scheduled callbacks run when the test says"""
+
+    def __init__(self):
+        self.timers = {}
+        self.idle = {}
+        self._next_id = 0
+
+    def _schedule(self, queue: dict, callback) -> str:
+        self._next_id += 1
+        after_id = f"after#{self._next_id}"
+        queue[after_id] = callback
+        return after_id
+
+    def after(self, ms: int, callback) -> str:
+        return self._schedule(self.timers, callback)
+
+    def after_idle(self, callback) -> str:
+        return self._schedule(self.idle, callback)
+
+    def after_cancel(self, after_id: str) -> None:
+        self.timers.pop(after_id, None)
+        self.idle.pop(after_id, None)
+
+    def run_timers(self) -> None:
+        timers, self.timers = self.timers, {}
+        for callback in timers.values():
+            callback()
+
+    def run_idle(self) -> None:
+        idle, self.idle = self.idle, {}
+        for callback in idle.values():
+            callback()
+
+
+def test_results_are_applied_on_the_tk_poll():
+    widget = FakeWidget()
+    busy = []
+    worker = ComputeWorker(widget, on_busy=busy.append)
+    applied = []
+
+    worker.submit(lambda: 42, applied.append).result()
+    assert applied == [] and worker.busy and busy == [True]
+
+    widget.run_timers()
+    assert applied == [42]
+    assert not worker.busy and busy == [True, False]
+    assert widget.timers == {}  # Polling stops once nothing is in flight
+    worker.shutdown()
+
+
+def test_superseded_results_are_dropped():
+    widget = FakeWidget()
+    worker = ComputeWorker(widget)
+    applied = []
+    release = threading.Event()
+
+    first = worker.submit(lambda: release.wait() and "old", applied.append)
+    second = worker.submit(lambda: "new", applied.append)
+    release.set()
+    second.result()  # One worker thread, so the first request is done too
+    assert first.done()
+
+    widget.run_timers()
+    assert applied == ["new"]
+    assert not worker.busy
+    worker.shutdown()
+
+
+def test_errors_go_to_on_error():
+    widget = FakeWidget()
+    worker = ComputeWorker(widget)
+    applied, errors = [], []
+
+    def fail():
+        raise ValueError("bad rows")
+
+    worker.submit(fail, applied.append, errors.append).exception()
+    widget.run_timers()
+    assert applied == []
+    assert [str(error) for error in errors] == ["bad rows"]
+    assert not worker.busy
+    worker.shutdown()
+
+
+def test_shutdown_stops_polling():
+    widget = FakeWidget()
+    worker = ComputeWorker(widget)
+    applied = []
+
+    worker.submit(lambda: 1, applied.append).result()
+    worker.shutdown()
+    assert widget.timers == {}
+    assert applied == []
+
+
+def test_scheduler_coalesces_requests():
+    widget = FakeWidget()
+    updates = []
+    scheduler = UpdateScheduler(widget, lambda: updates.append(1))
+
+    for _ in range(5):
+        scheduler.request()
+    assert scheduler.pending and len(widget.idle) == 1
+
+    widget.run_idle()
+    assert updates == [1]
+    assert not scheduler.pending
+
+    scheduler.request()
+    widget.run_idle()
+    assert updates == [1, 1]
+
+
+def test_scheduler_flush_and_cancel():
+    widget = FakeWidget()
+    updates = []
+    scheduler = UpdateScheduler(widget, lambda: updates.append(1))
+
+    scheduler.flush()  # Nothing queued
+    assert updates == []
+
+    scheduler.request()
+    scheduler.flush()
+    assert updates == [1]
+    assert not scheduler.pending and widget.idle == {}
+
+    scheduler.request()
+    scheduler.cancel()
+    widget.run_idle()
+    assert updates == [1]
+    assert not scheduler.pending
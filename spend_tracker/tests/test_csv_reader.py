@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from spend_tracker.src.data_mgr.csv_reader import (
+    frame_from_table,
+    iter_csv,
+    prepare_data,
+)
+
+CSV_HEADER = "Date,Description,Amount,Category,Source\n"
+
+
+def make_table(rows: list[list[str]]) -> pd.DataFrame:
+    return pd.DataFrame(
+        rows, columns=["Date", "Description", "Amount", "Category", "Source"]
+    )
+
+
+def test_frame_from_table_parses_columns():
+    table = make_table(
+        [
+            ["2024-01-05", "Coffee", "4.50", "Dining", "Visa"],
+            ["2024-02-10", "Market", "19.99", "Groceries", "Amex"],
+            ["2024-02-11", "Refund", "-5", "Dining", "Visa"],
+        ]
+    )
+
+    frame = frame_from_table(table)
+
+    assert frame.dates.tolist() == np.array(
+        ["2024-01-05", "2024-02-10", "2024-02-11"], dtype="datetime64[D]"
+    ).tolist()
+    assert frame.amounts_cents.tolist() == [450, 1999, -500]
+    assert [frame.categories[c] for c in frame.category_codes] == [
+        "Dining",
+        "Groceries",
+        "Dining",
+    ]
+    assert [frame.sources[c] for c in frame.source_codes] == ["Visa", "Amex", "Visa"]
+    assert frame.descriptions.tolist() == ["Coffee", "Market", "Refund"]
+
+
+def test_frame_from_table_drops_invalid_rows(capsys):
+    table = make_table(
+        [
+            ["2024-01-05", "Coffee", "4.50", "Dining", "Visa"],
+            ["not a date", "Bad date", "1.00", "Dining", "Visa"],
+            ["2024-01-06", "Bad amount", "abc", "Travel", "Visa"],
+        ]
+    )
+
+    frame = frame_from_table(table)
+
+    assert frame.descriptions.tolist() == ["Coffee"]
+    assert frame.categories == ["Dining"]
+    assert capsys.readouterr().out.count("Skipping invalid row") == 2
+
+
+def test_frame_from_table_requires_columns():
+    with pytest.raises(KeyError):
+        frame_from_table(pd.DataFrame({"Date": ["2024-01-01"]}))
+
+
+def test_iter_csv_yields_batches(tmp_path):
+    path = tmp_path / "statement.csv"
+    rows = [f"2024-01-{day:02d},Shop,{day},Misc,Visa\n" for day in range(1, 11)]
+    path.write_text(CSV_HEADER + "".join(rows))
+
+    batches = list(iter_csv(str(path), chunk_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    amounts = np.concatenate([batch.amounts_cents for batch in batches])
+    assert amounts.tolist() == [day * 100 for day in range(1, 11)]
+
+
+def test_iter_csv_reraises_mid_stream_errors(tmp_path, capsys):
+    path = tmp_path / "broken.csv"
+    path.write_text(CSV_HEADER + '2024-01-01,Shop,1,Misc,Visa\n2024-01-02,"Shop,2\n')
+
+    with pytest.raises(pd.errors.ParserError):
+        list(iter_csv(str(path), chunk_size=1))
+    assert "An error occurred" in capsys.readouterr().out
+
+
+def test_iter_csv_missing_file_yields_nothing(tmp_path, capsys):
+    assert list(iter_csv(str(tmp_path / "missing.csv"))) == []
+    assert "File not found" in capsys.readouterr().out
+
+
+def test_prepare_data_folds_batches(tmp_path):
+    path = tmp_path / "statement.csv"
+    categories = ["Food", "Misc", "Travel"]
+    rows = [
+        f"2024-01-{day:02d},Shop,{day},{categories[day % 3]},Visa\n"
+        for day in range(1, 11)
+    ]
+    path.write_text(CSV_HEADER + "".join(rows))
+
+    folded = {}
+    for batch in iter_csv(str(path), chunk_size=3):
+        prepare_data(batch, folded)
+    whole = prepare_data(next(iter_csv(str(path), chunk_size=100)))
+
+    assert folded.keys() == whole.keys()
+    for category, transactions in whole.items():
+        assert [t.amount for t in folded[category]] == [
+            t.amount for t in transactions
+        ]
@@ -0,0 +1,174 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from spend_tracker.src.data_mgr.outlier_filter import OUTLIER_METHODS
+from spend_tracker.src.data_mgr.restructure_data_for_graphing import (
+    add_transactions,
+    restructure_for_graphing,
+)
+from spend_tracker.src.data_mgr.result_cache import ResultCache
+from spend_tracker.src.gui2.data_manager import TableDataManager
+from spend_tracker.src.util.classes import TransactionFrame
+
+
+@pytest.fixture
+def frame(make_frame):
+    return make_frame(3000, start="2022-01-01", days=2 * 365)
+
+
+def month_count(dates: np.ndarray) -> int:
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    return int(months.max() - months.min() + 1)
+
+
+def expected_averages(frame: TransactionFrame, threshold: float) -> dict:
+    """Mean-rule table rows computed directly from the transactions"""
+    amounts = frame.amounts_cents / 100
+    months = month_count(frame.dates)
+    expected = {}
+    for code, name in enumerate(frame.categories):
+        values = amounts[frame.category_codes == code]
+        if not len(values):
+            continue
+        kept = values <= values.mean() * (1 + threshold / 100)
+        if threshold >= 100:
+            kept[:] = True
+        expected[name] = {
+            "average": values[kept].sum() / months,
+            "count": int(kept.sum()),
+            "outlier_count": int((~kept).sum()),
+        }
+    return expected
+
+
+def assert_rows_match(result: dict, expected: dict) -> None:
+    assert set(result) == set(expected)
+    for name, row in expected.items():
+        assert np.isclose(result[name]["average"], row["average"])
+        assert result[name]["count"] == row["count"]
+        assert result[name]["outlier_count"] == row["outlier_count"]
+
+
+@pytest.mark.parametrize("threshold", [0, 25, 100])
+def test_monthly_averages_match_brute_force(frame, threshold):
+    manager = TableDataManager(restructure_for_graphing(frame))
+    manager.outlier_threshold = threshold
+
+    result = manager.get_category_monthly_averages()
+
+    assert_rows_match(result, expected_averages(frame, threshold))
+
+
+def test_category_frames_split_kept_and_outliers(frame):
+    manager = TableDataManager(restructure_for_graphing(frame))
+    manager.outlier_threshold = 10
+
+    kept, outliers = manager.get_category_frames("Category 2")
+
+    expected = expected_averages(frame, 10)["Category 2"]
+    assert len(kept) == expected["count"]
+    assert len(outliers) == expected["outlier_count"]
+    assert kept.amounts_cents.max() < outliers.amounts_cents.min()
+
+
+def test_append_invalidates_only_changed_categories(frame, make_frame):
+    graphable_data = restructure_for_graphing(frame)
+    manager = TableDataManager(graphable_data)
+    before = manager.get_category_monthly_averages()
+
+    # Inside the existing month span, so other categories' rows stay valid
+    batch = make_frame(20, categories=["Category 1"], start="2022-06-01", days=30)
+    add_transactions(graphable_data, batch)
+    after = manager.get_category_monthly_averages()
+
+    assert after["Category 1"]["count"] == before["Category 1"]["count"] + 20
+    for name in before:
+        if name != "Category 1":
+            assert after[name] is before[name]
+    assert_rows_match(
+        after, expected_averages(TransactionFrame.concat([frame, batch]), 100)
+    )
+
+
+def test_append_extending_the_span_invalidates_everything(frame, make_frame):
+    graphable_data = restructure_for_graphing(frame)
+    manager = TableDataManager(graphable_data)
+    before = manager.get_category_monthly_averages()
+
+    # A later month changes the month count every average is divided by
+    batch = make_frame(5, categories=["Category 0"], start="2024-06-01", days=10)
+    add_transactions(graphable_data, batch)
+    after = manager.get_category_monthly_averages()
+
+    for name in before:
+        assert after[name] is not before[name]
+    assert_rows_match(
+        after, expected_averages(TransactionFrame.concat([frame, batch]), 100)
+    )
+
+
+def test_date_range_limits_rows_and_months(frame):
+    manager = TableDataManager(restructure_for_graphing(frame))
+    manager.date_range = (datetime(2022, 3, 1), datetime(2022, 8, 31))
+
+    result = manager.get_category_monthly_averages()
+
+    in_range = (frame.dates >= np.datetime64("2022-03-01")) & (
+        frame.dates <= np.datetime64("2022-08-31")
+    )
+    subset = frame.take(np.flatnonzero(in_range))
+    assert month_count(subset.dates) == 6
+    assert_rows_match(result, expected_averages(subset, 100))
+
+
+@pytest.mark.parametrize("method", OUTLIER_METHODS)
+@pytest.mark.parametrize(
+    "date_range", [(None, None), (datetime(2022, 3, 1), datetime(2022, 8, 31))]
+)
+@pytest.mark.parametrize("constant", [True, False])
+def test_table_rows_agree_with_dialog_rows(
+    make_frame, rng, method, date_range, constant
+):
+    frame = make_frame(3000, start="2022-01-01", days=365)
+    # Every row of a category on its mean, or a few distinct amounts, so many
+    # rows sit exactly on a cutoff; tenths of a dollar don't sum exactly in
+    # floating point, so both sides must derive the cutoff the same way
+    if constant:
+        frame.amounts_cents = (frame.category_codes.astype(np.int64) + 1) * 10
+    else:
+        frame.amounts_cents = rng.choice([10, 20, 30, 40, 60], size=len(frame))
+    manager = TableDataManager(restructure_for_graphing(frame))
+    manager.outlier_method = method
+    manager.date_range = date_range
+
+    for threshold in (0, 0.5, 1, 25, 50, 99):
+        manager.outlier_threshold = threshold
+        result = manager.get_category_monthly_averages()
+
+        for category, row in result.items():
+            kept, outliers = manager.get_category_frames(category)
+            assert row["count"] == len(kept)
+            assert row["outlier_count"] == len(outliers)
+            assert np.isclose(row["total"], kept.amounts_cents.sum() / 100)
+
+
+def test_results_persist_across_sessions(frame, tmp_path):
+    first = TableDataManager(
+        restructure_for_graphing(frame), result_cache=ResultCache(str(tmp_path))
+    )
+    first.outlier_threshold = 25
+    expected = first.get_category_monthly_averages()
+
+    second = TableDataManager(
+        restructure_for_graphing(frame), result_cache=ResultCache(str(tmp_path))
+    )
+    second.outlier_threshold = 25
+
+    def compute_nothing(query, categories, total_months, data):
+        assert not categories  # Everything comes from the first session
+        return {}
+
+    second._compute_categories = compute_nothing
+    assert second.get_category_monthly_averages() == expected
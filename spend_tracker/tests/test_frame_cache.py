@@ -0,0 +1,129 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from spend_tracker.src.data_mgr import frame_cache
+from spend_tracker.src.data_mgr.frame_cache import (
+    MANIFEST_NAME,
+    lookup_cached_frame,
+    read_csv_cached,
+)
+from spend_tracker.src.data_mgr.result_cache import dataset_fingerprint
+from spend_tracker.src.util.classes import TransactionStore
+
+CSV_HEADER = "Date,Description,Amount,Category,Source\n"
+
+
+@pytest.fixture
+def statement(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPEND_TRACKER_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "statement.csv"
+    path.write_text(
+        CSV_HEADER
+        + "2024-01-03,Cafe,4.5,Food,Visa\n"
+        + "2024-01-01,Rent,900,Home,Amex\n"
+        + "2024-01-02,Cafe,3.25,Food,Visa\n"
+        + "2024-01-04,Air,310,Travel,Amex\n"
+    )
+    return path
+
+
+def frame_rows(frame):
+    return [
+        (str(t.date.date()), t.description, t.amount, t.category, t.source)
+        for t in frame
+    ]
+
+
+def manifest_path(path):
+    return os.path.join(frame_cache._entry_dir(str(path)), MANIFEST_NAME)
+
+
+def test_warm_load_matches_parse(statement):
+    cold = read_csv_cached(str(statement))
+    warm, _, _ = lookup_cached_frame(str(statement))
+
+    assert frame_rows(warm) == frame_rows(cold)
+    assert [t.category for t in warm] == ["Food", "Food", "Home", "Travel"]
+    assert isinstance(warm.dates, np.memmap)
+    # Repeated descriptions share one string object
+    assert warm.descriptions[0] is warm.descriptions[1]
+
+
+def test_warm_load_fingerprints_like_the_parse(statement):
+    cold = read_csv_cached(str(statement))
+    warm, _, _ = lookup_cached_frame(str(statement))
+
+    assert dataset_fingerprint(warm) == dataset_fingerprint(cold)
+
+
+def test_store_uses_cached_columns_without_copying(statement):
+    read_csv_cached(str(statement))
+    warm, _, _ = lookup_cached_frame(str(statement))
+
+    store = TransactionStore.from_frame(warm)
+
+    assert store.dates is warm.dates
+    assert store.amounts_cents is warm.amounts_cents
+    assert store.tail_start == len(warm)
+
+    # Appends go to fresh buffers, never into the read-only maps
+    store.extend(warm.take(np.arange(1)))
+    assert len(store) == len(warm) + 1
+
+
+def test_touched_file_hits_without_rewriting_manifest(statement):
+    read_csv_cached(str(statement))
+    with open(manifest_path(statement), encoding="utf-8") as f:
+        manifest = f.read()
+    stat = os.stat(statement)
+    os.utime(statement, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    frame, _, content_hash = lookup_cached_frame(str(statement))
+
+    assert frame is not None
+    assert content_hash == json.loads(manifest)["content_hash"]
+    with open(manifest_path(statement), encoding="utf-8") as f:
+        assert f.read() == manifest
+
+
+def test_changed_file_misses_and_returns_fingerprint(statement):
+    read_csv_cached(str(statement))
+    with open(statement, "a") as f:
+        f.write("2024-01-05,Shop,12,Food,Visa\n")
+
+    frame, stat, _ = lookup_cached_frame(str(statement))
+
+    assert frame is None
+    assert stat.st_size == os.path.getsize(statement)
+    assert len(read_csv_cached(str(statement))) == 5
+    assert len(lookup_cached_frame(str(statement))[0]) == 5
+
+
+def test_stale_version_misses(statement):
+    read_csv_cached(str(statement))
+    with open(manifest_path(statement), encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["version"] -= 1
+    with open(manifest_path(statement), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    assert lookup_cached_frame(str(statement)) == (None, None, None)
+
+
+def test_descriptions_with_separator_are_not_cached(statement):
+    statement.write_text(CSV_HEADER + "2024-01-01,Odd\x1fname,1,Food,Visa\n")
+
+    frame = read_csv_cached(str(statement))
+
+    assert frame.descriptions.tolist() == ["Odd\x1fname"]
+    assert lookup_cached_frame(str(statement))[0] is None
+
+
+def test_sort_by_category_returns_sorted_frames_as_is(make_frame):
+    frame = make_frame(200).sort_by_category()
+
+    assert frame.categories == sorted(frame.categories)
+    assert frame.sort_by_category() is frame
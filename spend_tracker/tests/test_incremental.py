@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from spend_tracker.src.data_mgr.csv_reader import read_csv_frame
+from spend_tracker.src.data_mgr.incremental import IncrementalLoader, record_ends
+from spend_tracker.src.data_mgr.restructure_data_for_graphing import (
+    restructure_for_graphing,
+)
+
+HEADER = b"Date,Description,Amount,Category,Source\n"
+
+
+def row(day: int, description: str = "Shop", category: str = "Misc") -> bytes:
+    return f'2024-01-{day:02d},"{description}",{day},{category},Visa\n'.encode()
+
+
+@pytest.fixture
+def statement(tmp_path):
+    return tmp_path / "statement.csv"
+
+
+def append(path, data: bytes) -> None:
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_record_ends_skip_quoted_newlines():
+    records = [b'a,"b\nc"\n', b'"say ""hi""",d\n', b'e,"f']
+
+    ends = record_ends(b"".join(records))
+
+    assert ends.tolist() == [8, 8 + len(records[1])]
+
+
+def test_reads_only_appended_rows(statement):
+    statement.write_bytes(HEADER + row(1) + row(2))
+    loader = IncrementalLoader(str(statement))
+
+    first = loader.read_new()
+    assert first.amounts_cents.tolist() == [100, 200]
+    assert loader.read_new().amounts_cents.tolist() == []
+
+    append(statement, row(3) + row(4))
+    assert loader.read_new().amounts_cents.tolist() == [300, 400]
+    assert loader.rows_read == 4
+
+
+def test_header_only_file(statement):
+    statement.write_bytes(HEADER)
+    loader = IncrementalLoader(str(statement))
+
+    assert len(loader.read_new()) == 0
+
+    append(statement, row(1))
+    assert loader.read_new().amounts_cents.tolist() == [100]
+
+
+def test_partial_record_is_left_for_the_next_read(statement):
+    statement.write_bytes(HEADER + row(1))
+    loader = IncrementalLoader(str(statement))
+    loader.read_new()
+
+    append(statement, row(2) + row(3)[:10])
+    assert loader.read_new().amounts_cents.tolist() == [200]
+
+    append(statement, row(3)[10:])
+    assert loader.read_new().amounts_cents.tolist() == [300]
+
+
+def test_first_read_includes_a_final_row_without_newline(statement):
+    statement.write_bytes(HEADER + row(1) + row(2).rstrip(b"\n"))
+    loader = IncrementalLoader(str(statement))
+
+    assert loader.read_new().amounts_cents.tolist() == [100, 200]
+
+    append(statement, b"\n" + row(3))
+    assert loader.read_new().amounts_cents.tolist() == [300]
+    assert loader.rows_read == 3
+
+
+def test_trailing_row_is_read_once_the_file_stops_growing(statement):
+    statement.write_bytes(HEADER + row(1))
+    loader = IncrementalLoader(str(statement))
+    loader.read_new()
+
+    append(statement, row(2).rstrip(b"\n"))
+    assert len(loader.read_new()) == 0
+    # Same size on the next poll: the writer is done with it
+    assert loader.read_new().amounts_cents.tolist() == [200]
+    assert len(loader.read_new()) == 0
+
+
+def test_quoted_multiline_record_is_never_split(statement):
+    record = row(2, "Two\nline")
+    statement.write_bytes(HEADER + row(1, "One\nline") + record[:15])
+    loader = IncrementalLoader(str(statement))
+
+    first = loader.read_new()
+    assert first.descriptions.tolist() == ["One\nline"]
+
+    append(statement, record[15:])
+    second = loader.read_new()
+    assert second.descriptions.tolist() == ["Two\nline"]
+    # Records, not physical lines
+    assert loader.rows_read == 2
+
+
+@pytest.mark.parametrize(
+    "rewrite", [HEADER + row(1), HEADER + row(1) + row(9) + row(3)]
+)
+def test_rewritten_file_is_rejected(statement, rewrite):
+    statement.write_bytes(HEADER + row(1) + row(2))
+    loader = IncrementalLoader(str(statement))
+    loader.read_new()
+
+    statement.write_bytes(rewrite)
+
+    with pytest.raises(ValueError):
+        loader.read_new()
+
+
+def test_refresh_matches_a_full_rebuild(statement, rng):
+    rows = [
+        row(int(day), f"Shop {i}\nBranch", f"Category {code}")
+        for i, (day, code) in enumerate(
+            zip(rng.integers(1, 29, size=300), rng.integers(0, 5, size=300))
+        )
+    ]
+    statement.write_bytes(HEADER + b"".join(rows[:100]))
+    loader = IncrementalLoader(str(statement))
+    graphable_data = restructure_for_graphing(loader.read_new())
+
+    append(statement, b"".join(rows[100:]))
+    added = loader.refresh(graphable_data)
+
+    assert len(added) == 200
+    rebuilt = restructure_for_graphing(read_csv_frame(str(statement)))
+    cube, expected = graphable_data.cube("week"), rebuilt.cube("week")
+    columns = [expected.category_index[name] for name in cube.categories]
+    assert np.allclose(cube.totals, expected.totals[:, columns])
+    assert (cube.counts == expected.counts[:, columns]).all()
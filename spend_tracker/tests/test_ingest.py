@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from spend_tracker.src.data_mgr.csv_reader import read_csv_frame
+from spend_tracker.src.data_mgr.ingest import ingest_paths, resolve_paths
+
+CSV_HEADER = "Date,Description,Amount,Category,Source\n"
+
+
+@pytest.fixture
+def statements(tmp_path, monkeypatch):
+    """Three statement files in nested directories, dates interleaved"""
+    monkeypatch.setenv("SPEND_TRACKER_CACHE_DIR", str(tmp_path / "cache"))
+    data_dir = tmp_path / "data"
+    (data_dir / "2024").mkdir(parents=True)
+    rows = {
+        data_dir / "visa.csv": [("2024-01-05", "Shop", 12.5, "Food", "Visa")],
+        data_dir / "2024" / "amex.csv": [
+            ("2024-01-02", "Air", 300, "Travel", "Amex"),
+            ("2024-01-09", "Cafe", 4.25, "Food", "Amex"),
+        ],
+        data_dir / "2024" / "debit.csv": [("2024-01-01", "Rent", 900, "Home", "Debit")],
+    }
+    for path, records in rows.items():
+        lines = [",".join(str(value) for value in record) for record in records]
+        path.write_text(CSV_HEADER + "\n".join(lines) + "\n")
+    (data_dir / "notes.txt").write_text("not a statement")
+    return data_dir
+
+
+def frame_rows(frame):
+    return [
+        (str(t.date.date()), t.description, t.amount, t.category, t.source)
+        for t in frame
+    ]
+
+
+def test_resolve_paths_expands_directories_and_globs(statements):
+    paths = resolve_paths(str(statements))
+
+    assert [p.rsplit("data", 1)[1] for p in paths] == [
+        "/2024/amex.csv",
+        "/2024/debit.csv",
+        "/visa.csv",
+    ]
+    assert resolve_paths(str(statements / "*.csv")) == [str(statements / "visa.csv")]
+    assert resolve_paths(str(statements / "visa.csv")) == [
+        str(statements / "visa.csv")
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_ingest_paths_merges_files_in_store_order(statements, max_workers):
+    result = ingest_paths(str(statements), max_workers=max_workers, use_cache=False)
+
+    assert result.frame.categories == ["Food", "Home", "Travel"]
+    assert [row[:4] for row in frame_rows(result.frame)] == [
+        ("2024-01-05", "Shop", 12.5, "Food"),
+        ("2024-01-09", "Cafe", 4.25, "Food"),
+        ("2024-01-01", "Rent", 900.0, "Home"),
+        ("2024-01-02", "Air", 300.0, "Travel"),
+    ]
+    assert [stats.rows for stats in result.file_stats] == [2, 1, 1]
+    assert "Loaded 4 transactions from 3 file(s)" in result.format_report()
+
+
+def test_ingest_paths_warm_cache_matches_cold_parse(statements):
+    cold = ingest_paths(str(statements), max_workers=1)
+    warm = ingest_paths(str(statements), max_workers=1)
+    uncached = ingest_paths(str(statements), max_workers=1, use_cache=False)
+
+    assert frame_rows(warm.frame) == frame_rows(cold.frame)
+    assert frame_rows(warm.frame) == frame_rows(uncached.frame)
+
+
+def test_ingest_paths_single_file_matches_reader(statements):
+    path = str(statements / "2024" / "amex.csv")
+
+    result = ingest_paths(path, use_cache=False)
+
+    expected = read_csv_frame(path).sort_by_category()
+    assert frame_rows(result.frame) == frame_rows(expected)
+    np.testing.assert_array_equal(result.frame.dates, expected.dates)
+
+
+def test_ingest_paths_no_matches(tmp_path, capsys):
+    result = ingest_paths(str(tmp_path / "*.csv"))
+
+    assert len(result.frame) == 0
+    assert result.file_stats == []
+    assert "No CSV files found" in capsys.readouterr().out
@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+
+from spend_tracker.src.data_mgr.outlier_filter import (
+    OUTLIER_METHODS,
+    AmountIndex,
+    filter_outliers,
+    outlier_mask,
+)
+from spend_tracker.src.util.classes import CC_Transaction
+
+GROUPS = 7
+
+
+@pytest.fixture
+def amounts_and_groups(rng):
+    # Rounded to cents so groups hold ties, like real amounts
+    amounts = np.round(rng.lognormal(3, 1, size=4000), 2)
+    groups = rng.integers(0, GROUPS, size=len(amounts))
+    groups[groups == 5] = 4  # Leave group 5 empty
+    return amounts, groups
+
+
+def brute_force_cutoff(values: np.ndarray, method: str, threshold: float) -> float:
+    if method == "mean":
+        return values.mean() * (1 + threshold / 100)
+    if method == "percentile":
+        return np.percentile(values, threshold)
+    if method == "iqr":
+        q1, q3 = np.percentile(values, [25, 75])
+        return q3 + threshold * (q3 - q1)
+    median = np.median(values)
+    return median + threshold * np.median(np.abs(values - median)) / 0.6745
+
+
+@pytest.mark.parametrize("method", OUTLIER_METHODS)
+def test_outlier_mask_matches_brute_force(amounts_and_groups, method):
+    amounts, groups = amounts_and_groups
+
+    for threshold in (0, 1.5, 3.5, 50, 100):
+        mask = outlier_mask(amounts, groups, method, threshold)
+
+        for group in range(GROUPS):
+            values = amounts[groups == group]
+            if len(values):
+                cutoff = brute_force_cutoff(values, method, threshold)
+                assert (mask[groups == group] == (values > cutoff)).all()
+
+
+def test_unknown_method(amounts_and_groups):
+    with pytest.raises(ValueError):
+        outlier_mask(*amounts_and_groups, "zscore", 2)
+
+
+def test_filter_outliers_splits_on_the_mean():
+    transactions = [
+        CC_Transaction(
+            date=None, description="", category="A", amount=amount, source=""
+        )
+        for amount in (10, 20, 30, 100)
+    ]
+
+    kept, outliers = filter_outliers(transactions, 50)
+
+    # Mean 40, so the cutoff is 60
+    assert [t.amount for t in kept] == [10, 20, 30]
+    assert [t.amount for t in outliers] == [100]
+    assert filter_outliers(transactions, 50, average=10)[1] == transactions[1:]
+
+
+def test_quantiles_match_numpy(amounts_and_groups):
+    amounts, groups = amounts_and_groups
+    index = AmountIndex(amounts, groups)
+
+    quantiles = index.quantiles(np.array([0, 0.1, 0.5, 0.975, 1]))
+
+    for group in range(GROUPS):
+        values = amounts[groups == group]
+        if len(values):
+            expected = np.percentile(values, [0, 10, 50, 97.5, 100])
+            assert np.allclose(quantiles[:, group], expected)
+        else:
+            assert np.isnan(quantiles[:, group]).all()
+
+
+def test_split_points_match_brute_force(amounts_and_groups, rng):
+    amounts, groups = amounts_and_groups
+    index = AmountIndex(amounts, groups)
+    # Include cutoffs equal to existing amounts, where ties matter
+    cutoffs = np.where(
+        rng.random((5, GROUPS)) < 0.5,
+        rng.choice(amounts, size=(5, GROUPS)),
+        rng.uniform(0, 100, size=(5, GROUPS)),
+    )
+
+    splits = index.split_points(cutoffs)
+
+    kept = splits - index.group_starts[:-1]
+    for row in range(len(cutoffs)):
+        for group in range(GROUPS):
+            values = amounts[groups == group]
+            assert kept[row, group] == (values <= cutoffs[row, group]).sum()
+
+
+@pytest.mark.parametrize("method", OUTLIER_METHODS)
+def test_kept_totals_match_brute_force(amounts_and_groups, method):
+    amounts, groups = amounts_and_groups
+    index = AmountIndex(amounts, groups)
+    thresholds = np.array([0, 1, 1.5, 3.5, 25, 50, 99, 100])
+
+    totals, counts = index.kept_totals(method, thresholds)
+
+    for row, threshold in enumerate(thresholds):
+        for group in range(GROUPS):
+            values = amounts[groups == group]
+            if not len(values):
+                assert totals[row, group] == counts[row, group] == 0
+                continue
+            kept = values[values <= brute_force_cutoff(values, method, threshold)]
+            assert counts[row, group] == len(kept)
+            assert np.isclose(totals[row, group], kept.sum())
+
+
+def test_mean_cutoffs(amounts_and_groups):
+    amounts, groups = amounts_and_groups
+    index = AmountIndex(amounts, groups)
+
+    cutoffs = index.cutoffs("mean", 20)
+
+    for group in (0, 3, 6):
+        assert np.isclose(cutoffs[group], amounts[groups == group].mean() * 1.2)
+
+
+@pytest.mark.parametrize("method", OUTLIER_METHODS)
+def test_group_rows_split_the_group(amounts_and_groups, method):
+    amounts, groups = amounts_and_groups
+    index = AmountIndex(amounts, groups)
+    mask = outlier_mask(amounts, groups, method, 1.5)
+
+    for group in range(GROUPS):
+        kept, outliers = index.group_rows(group, method, 1.5)
+        assert (kept == np.flatnonzero((groups == group) & ~mask)).all()
+        assert (outliers == np.flatnonzero((groups == group) & mask)).all()
+
+
+def test_index_rejects_unknown_method(amounts_and_groups):
+    index = AmountIndex(*amounts_and_groups)
+    with pytest.raises(ValueError):
+        index.cutoffs("zscore", 2)
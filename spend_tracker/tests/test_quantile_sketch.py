@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from spend_tracker.src.data_mgr.quantile_sketch import QuantileSketch, merge_sketches
+
+QUANTILES = np.array([0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+
+
+@pytest.fixture
+def values(rng):
+    return rng.lognormal(3, 1, size=50_000)
+
+
+def rank_errors(values: np.ndarray, sketch: QuantileSketch) -> np.ndarray:
+    """How far each estimated quantile's true rank is from the requested one"""
+    estimates = sketch.quantile(QUANTILES)
+    ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+    return np.abs(ranks - QUANTILES)
+
+
+def test_from_values_is_exact_on_count_and_extremes(values):
+    sketch = QuantileSketch.from_values(values)
+
+    assert sketch.count == len(values)
+    assert np.isclose(sketch.total, values.sum())
+    assert sketch.quantile(0) == values.min()
+    assert sketch.quantile(1) == values.max()
+    assert len(sketch.weights) < 1000
+
+
+def test_merged_sketch_is_as_accurate_as_one_sketch(values):
+    chunks = np.array_split(values, 40)
+
+    merged = merge_sketches(QuantileSketch.from_values(chunk) for chunk in chunks)
+
+    assert merged.count == len(values)
+    assert np.isclose(merged.total, values.sum())
+    assert merged.minimum == values.min() and merged.maximum == values.max()
+    assert rank_errors(values, merged).max() < 0.01
+
+
+def test_update_folds_in_batches(values):
+    sketch = QuantileSketch()
+    for chunk in np.array_split(values, 10):
+        sketch.update(chunk)
+
+    assert sketch.count == len(values)
+    assert rank_errors(values, sketch).max() < 0.01
+
+
+def test_below_estimates_count_and_sum(values):
+    sketch = QuantileSketch.from_values(values)
+
+    for cutoff in np.percentile(values, [5, 50, 95]):
+        count, total = sketch.below(cutoff)
+        kept = values[values <= cutoff]
+        assert abs(count - len(kept)) < 0.01 * len(values)
+        assert np.isclose(total, kept.sum(), rtol=0.02)
+
+    assert sketch.below(values.min() - 1) == (0.0, 0.0)
+    count, total = sketch.below(values.max())
+    assert count == len(values) and np.isclose(total, values.sum())
+
+
+def test_empty_sketch():
+    sketch = merge_sketches([QuantileSketch(), QuantileSketch()])
+
+    assert sketch.count == 0
+    assert np.isnan(sketch.quantile(0.5))
+    assert sketch.below(10) == (0.0, 0.0)
@@ -0,0 +1,120 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from spend_tracker.src.data_mgr.resample import (
+    create_periods,
+    get_period_spec,
+    period_codes,
+    period_start_dates,
+)
+from spend_tracker.src.data_mgr.restructure_data_for_graphing import period_indices
+
+# Covers leap days, year ends and dates before the 1970 epoch
+DATES = np.arange(
+    np.datetime64("1968-11-20"), np.datetime64("1972-03-10"), dtype="datetime64[D]"
+)
+
+
+def period_starts(granularity: str, **settings) -> list:
+    spec = get_period_spec(granularity, **settings)
+    return period_start_dates(period_codes(DATES, spec), spec).tolist()
+
+
+def test_unknown_granularity():
+    with pytest.raises(ValueError):
+        get_period_spec("fortnight")
+
+
+@pytest.mark.parametrize("week_start", range(7))
+def test_weeks_begin_on_week_start(week_start):
+    starts = period_starts("week", week_start=week_start)
+
+    for date, start in zip(DATES.tolist(), starts):
+        assert start.weekday() == week_start
+        assert 0 <= (date - start).days < 7
+
+
+@pytest.mark.parametrize(
+    "granularity, months", [("month", 1), ("quarter", 3), ("year", 12)]
+)
+def test_calendar_periods(granularity, months):
+    starts = period_starts(granularity)
+
+    for date, start in zip(DATES.tolist(), starts):
+        assert start.day == 1
+        assert (start.month - 1) % months == 0
+        elapsed = (date.year - start.year) * 12 + date.month - start.month
+        assert 0 <= elapsed < months
+
+
+@pytest.mark.parametrize("first_month", range(1, 13))
+def test_fiscal_periods_begin_on_fiscal_start(first_month):
+    years = period_starts("fiscal_year", fiscal_year_start_month=first_month)
+    quarters = period_starts("fiscal_quarter", fiscal_year_start_month=first_month)
+
+    for date, year, quarter in zip(DATES.tolist(), years, quarters):
+        assert year.day == quarter.day == 1
+        assert year.month == first_month
+        assert (quarter.month - first_month) % 3 == 0
+        assert 0 <= (date.year - year.year) * 12 + date.month - year.month < 12
+        assert 0 <= (date.year - quarter.year) * 12 + date.month - quarter.month < 3
+
+
+def test_fiscal_year_edges():
+    spec = get_period_spec("fiscal_year", fiscal_year_start_month=7)
+    dates = np.array(["2023-06-30", "2023-07-01", "2024-06-30"], dtype="datetime64[D]")
+
+    starts = period_start_dates(period_codes(dates, spec), spec).tolist()
+
+    assert [str(start) for start in starts] == [
+        "2022-07-01",
+        "2023-07-01",
+        "2023-07-01",
+    ]
+
+
+def test_january_fiscal_year_is_the_calendar_year():
+    assert period_starts("fiscal_year", fiscal_year_start_month=1) == period_starts(
+        "year"
+    )
+
+
+def test_period_indices_count_from_the_first_period():
+    spec = get_period_spec("month")
+    dates = np.array(
+        ["2023-11-15", "2023-12-31", "2024-01-01", "2024-03-02"],
+        dtype="datetime64[D]",
+    )
+
+    indices = period_indices(dates, datetime(2023, 11, 1), spec)
+
+    assert indices.tolist() == [0, 1, 2, 4]
+
+
+def test_period_indices_match_created_periods():
+    spec = get_period_spec("week", week_start=6)
+    periods = create_periods(datetime(2023, 12, 20), datetime(2024, 2, 5), spec)
+    dates = np.arange(
+        np.datetime64("2023-12-20"), np.datetime64("2024-02-06"), dtype="datetime64[D]"
+    )
+
+    indices = period_indices(dates, periods[0].start_date, spec)
+
+    for date, index in zip(dates.astype("datetime64[s]").tolist(), indices.tolist()):
+        assert periods[index].start_date <= date <= periods[index].end_date
+
+
+def test_week_period_indices_start_on_the_week_start():
+    # 2024-01-03 is a Wednesday, so weeks run Wednesday to Tuesday
+    dates = np.array(
+        ["2024-01-03", "2024-01-09", "2024-01-10", "2024-01-24"],
+        dtype="datetime64[D]",
+    )
+
+    spec = get_period_spec("week", week_start=2)
+
+    indices = period_indices(dates, datetime(2024, 1, 3), spec)
+
+    assert indices.tolist() == [0, 0, 1, 3]
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+
+from spend_tracker.src.data_mgr.result_cache import ResultCache, dataset_fingerprint
+
+PARAMS = {"view": "plot", "granularity": "month", "threshold": 90}
+
+
+def result(seed: int) -> dict[str, np.ndarray]:
+    return {"totals": np.full((10, 10), float(seed)), "counts": np.arange(10)}
+
+
+def test_put_then_get(tmp_path):
+    cache = ResultCache(str(tmp_path))
+
+    assert cache.get("data", PARAMS) is None
+    cache.put("data", PARAMS, result(1))
+
+    stored = cache.get("data", PARAMS)
+    assert set(stored) == {"totals", "counts"}
+    assert (stored["totals"] == result(1)["totals"]).all()
+    assert (stored["counts"] == result(1)["counts"]).all()
+
+
+def test_entries_are_keyed_by_dataset_and_params(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("data", PARAMS, result(1))
+
+    assert cache.get("other data", PARAMS) is None
+    assert cache.get("data", {**PARAMS, "threshold": 80}) is None
+    # Key order doesn't matter
+    assert cache.get("data", dict(reversed(PARAMS.items()))) is not None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    probe = ResultCache(str(tmp_path / "probe"))
+    probe.put("data", PARAMS, result(0))
+    entry_size = os.path.getsize(probe._path("data", PARAMS))
+
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=int(entry_size * 3.5))
+    keys = [{**PARAMS, "threshold": threshold} for threshold in range(4)]
+    for seed, params in enumerate(keys[:3]):
+        cache.put("data", params, result(seed))
+        # Distinct, increasing last-used times
+        os.utime(cache._path("data", params), ns=(seed + 1, seed + 1))
+
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get("data", keys[0]) is not None
+    cache.put("data", keys[3], result(3))
+
+    # Eviction frees down to 3/4 of the limit: the two least recently used go
+    assert cache.get("data", keys[1]) is None
+    assert cache.get("data", keys[2]) is None
+    assert cache.get("data", keys[0]) is not None
+    assert cache.get("data", keys[3]) is not None
+
+
+def test_clear(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("data", PARAMS, result(1))
+
+    cache.clear()
+
+    assert cache.get("data", PARAMS) is None
+
+
+def test_dataset_fingerprint_tracks_content(make_frame):
+    frame = make_frame(100)
+    copy = frame.take(np.arange(100))
+    shorter = frame.take(np.arange(99))
+
+    assert dataset_fingerprint(frame) == dataset_fingerprint(copy)
+    assert dataset_fingerprint(frame) != dataset_fingerprint(shorter)
+    assert dataset_fingerprint(frame) != dataset_fingerprint(make_frame(100))
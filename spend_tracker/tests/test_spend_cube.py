@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from spend_tracker.src.util.classes import GraphableData, TransactionStore
+
+
+@pytest.fixture
+def graphable_data(make_frame):
+    return GraphableData(TransactionStore.from_frame(make_frame(5000)))
+
+
+@pytest.mark.parametrize("threshold", [0, 10, 50, 80, 99, 100])
+def test_percentile_filter_matches_numpy(graphable_data, threshold):
+    cube = graphable_data.cube("month")
+
+    filtered = cube.without_outliers("percentile", threshold)
+
+    for row, period in enumerate(graphable_data.periods("month")):
+        for category, cat_data in period.categories.items():
+            amounts = cat_data.amounts
+            kept = amounts[amounts <= np.percentile(amounts, threshold)]
+            column = cube.category_index[category]
+            assert filtered.counts[row, column] == len(kept)
+            assert np.isclose(filtered.totals[row, column], kept.sum())
+
+
+def test_totals_match_periods(graphable_data):
+    cube = graphable_data.cube("quarter")
+
+    for row, period in enumerate(graphable_data.periods("quarter")):
+        for category, cat_data in period.categories.items():
+            column = cube.category_index[category]
+            assert cube.counts[row, column] == cat_data.count
+            assert np.isclose(cube.totals[row, column], cat_data.amounts.sum())
+
+
+def test_range_queries_match_direct_sums(graphable_data):
+    cube = graphable_data.cube("month")
+    periods = cube.date_range(datetime(2023, 3, 1), datetime(2023, 11, 30))
+
+    totals = cube.totals[periods]
+    active = (cube.counts[periods] > 0).sum(axis=0)
+    assert np.allclose(cube.range_totals(periods), totals.sum(axis=0))
+    assert np.allclose(
+        cube.range_averages(periods), totals.sum(axis=0) / np.maximum(active, 1)
+    )
+    assert cube.period_starts[periods][0] == np.datetime64("2023-03-01")
+    assert cube.period_starts[periods][-1] == np.datetime64("2023-11-01")
+
+def test_sketch_cube_approximates_exact_cube(make_frame):
+    store = TransactionStore.from_frame(make_frame(20000, categories=["A", "B"]))
+    exact = GraphableData(store).cube("year").without_outliers("percentile", 90)
+    sketched = (
+        GraphableData(store, sketch_compression=200)
+        .cube("year")
+        .without_outliers("percentile", 90)
+    )
+
+    assert np.allclose(sketched.counts, exact.counts, rtol=0.02, atol=2)
+    assert np.allclose(sketched.totals, exact.totals, rtol=0.02)
+
+
+def test_sketch_cube_rejects_mad(make_frame):
+    store = TransactionStore.from_frame(make_frame(500))
+    cube = GraphableData(store, sketch_compression=100).cube("month")
+
+    with pytest.raises(ValueError, match="needs exact amounts"):
+        cube.without_outliers("mad", 3.5)